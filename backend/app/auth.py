@@ -0,0 +1,174 @@
+"""
+app/auth.py
+---------------
+
+JWT issuing and the authentication dependency shared by every router.
+
+``get_current_user`` is ``async`` so it can be used from async and sync
+routes alike without blocking the event loop: token decoding happens
+inline, the principal cache is consulted without I/O, and only a cache miss
+dispatches the ``users`` lookup to the threadpool. Routes served on the
+async engine (``DATABASE_ASYNC``) use ``get_current_user_async`` and
+``get_current_principal_async`` instead, which await that lookup on the
+request's ``AsyncSession``, so auth holds neither a threadpool thread nor a
+sync pool connection.
+
+With ``JWT_STATELESS_CLAIMS`` enabled, issued tokens also carry the user id
+(``uid``) and a token version (``ver``). ``get_current_principal`` trusts
+those claims and never touches the ``users`` table; revocation bumps the
+user's entry in ``token_versions`` so older tokens are rejected. The version
+map lives in process memory, so a revocation only applies to the worker
+that handled it and is forgotten on restart.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Union
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import models
+from app.crud import aio, load_principal, principal_cache
+from app.database import get_async_db, get_db
+from app.settings import get_settings
+
+_settings = get_settings()
+
+SECRET_KEY: str = _settings.SECRET_KEY
+ALGORITHM: str = _settings.ALGORITHM
+ACCESS_TOKEN_EXPIRE_MINUTES: int = _settings.ACCESS_TOKEN_EXPIRE_MINUTES
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller rebuilt from token claims alone."""
+    id: int
+    username: str
+
+
+class TokenVersionMap:
+    """Current token version per user; users never revoked are not stored."""
+
+    def __init__(self) -> None:
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def current(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def revoke(self, user_id: int) -> int:
+        """Invalidate every token issued so far for ``user_id``."""
+        with self._lock:
+            version = self._versions.get(user_id, 0) + 1
+            self._versions[user_id] = version
+            return version
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+
+token_versions = TokenVersionMap()
+
+
+def create_access_token(
+    data: dict,
+    expires_delta: timedelta | None = None,
+    user_id: int | None = None,
+) -> str:
+    to_encode = data.copy()
+    if user_id is not None and _settings.JWT_STATELESS_CLAIMS:
+        to_encode.update({"uid": user_id, "ver": token_versions.current(user_id)})
+    expire = datetime.now(timezone.utc) + (
+        expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    to_encode.update({"exp": expire})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def decode_access_token(token: str) -> dict:
+    """Return the JWT payload or raise ``401``."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    uid = payload.get("uid")
+    if uid is not None and payload.get("ver", 0) < token_versions.current(uid):
+        raise _credentials_exception()
+    return payload
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> models.User:
+    username: str = decode_access_token(token)["sub"]
+
+    user = principal_cache.get(username)
+    if user is None:
+        user = await run_in_threadpool(load_principal, db, username)
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Union[Principal, models.User]:
+    """Lightweight auth for routes that only need ``current_user.id``.
+
+    Tokens with stateless claims are answered without I/O; older tokens fall
+    back to the regular ``users`` lookup.
+    """
+    payload = decode_access_token(token)
+    uid = payload.get("uid")
+    if uid is not None:
+        return Principal(id=uid, username=payload["sub"])
+    return await get_current_user(token, db)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> models.User:
+    """``get_current_user`` for async-engine routes: a cache miss awaits the lookup."""
+    username: str = decode_access_token(token)["sub"]
+
+    user = principal_cache.get(username)
+    if user is None:
+        user = await aio.load_principal(db, username)
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+async def get_current_principal_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Union[Principal, models.User]:
+    """``get_current_principal`` for async-engine routes."""
+    payload = decode_access_token(token)
+    uid = payload.get("uid")
+    if uid is not None:
+        return Principal(id=uid, username=payload["sub"])
+    return await get_current_user_async(token, db)
@@ -0,0 +1,211 @@
+"""
+app/catalog.py
+---------------
+
+Versioned in-memory snapshot of the verb catalog.
+
+The ``verbs`` table is small and changes rarely, so ``/verbs``,
+``/verbs/{id}`` and ``/verbs/search`` are served from an immutable
+``CatalogSnapshot`` instead of querying the database on every call. Each
+row is pre-encoded to JSON once per build, so a page is a byte join. Search
+goes through a trigram ``NgramIndex`` (see ``app.textsearch``) over the
+folded infinitive, past, participle and translation, ranked exact, then
+prefix, then substring. Answer grading uses the snapshot's ``FormIndex``
+(see ``app.grading``), so it is rebuilt together with the catalog.
+
+``create_verb``, ``update_verb``, ``delete_verb`` and ``bulk_create_verbs``
+rebuild the snapshot after committing. That only refreshes the worker that
+handled the write: the others pick the change up once their snapshot is
+older than ``VERB_CATALOG_TTL_SECONDS``, or as soon as ``/verbs`` reads a
+newer ``verbs`` table version for its ETag. Build time and approximate memory
+footprint are kept in ``stats()`` for ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import sys
+from bisect import bisect_right
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.schemas.verb import VerbOut
+from app.etag import read_table_versions
+from app.grading import FormIndex, Grade
+from app.serialization import dumps, fetch_rows, schema_columns
+from app.settings import get_settings
+from app.textsearch import NgramIndex, split_terms
+
+# Fields matched by /verbs/search (same as crud.search_verb_rows).
+SEARCH_FIELDS = ("infinitive", "past", "participle", "translation")
+
+# Keyset sort key of a verb: (infinitive, id)
+VerbKey = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """One immutable build of the catalog, ordered by infinitive."""
+
+    version: int
+    source_version: int
+    built_at: float
+    build_seconds: float
+    ids: Tuple[int, ...]
+    keys: Tuple[VerbKey, ...]
+    encoded: Tuple[bytes, ...]
+    index: NgramIndex
+    forms: FormIndex
+    positions: Dict[int, int]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def approx_bytes(self) -> int:
+        return (
+            _approx_size(self.encoded)
+            + _approx_size(self.positions)
+            + _approx_size(self.keys)
+            + _approx_size(self.index.documents)
+            + _approx_size(self.index.postings)
+            + _approx_size(self.forms.reverse)
+        )
+
+
+def _approx_size(container: Any) -> int:
+    size = sys.getsizeof(container)
+    items: Iterable[Any] = container.items() if isinstance(container, dict) else container
+    for item in items:
+        if isinstance(item, tuple):
+            size += sum(sys.getsizeof(part) for part in item)
+        else:
+            size += sys.getsizeof(item)
+    return size
+
+
+def _json_array(chunks: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(chunks) + b"]"
+
+
+class VerbCatalog:
+    """Holds the current snapshot; thread-safe, rebuilds are serialized."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self.rebuilds = 0
+
+    def _expired(self, snapshot: CatalogSnapshot) -> bool:
+        return self.ttl > 0 and time.monotonic() - snapshot.built_at > self.ttl
+
+    def snapshot(self, db: Session, source_version: Optional[int] = None) -> CatalogSnapshot:
+        """Current snapshot, building it on first use, when it has expired, or
+        when it was built from an older ``verbs`` table version than ``source_version``."""
+        snapshot = self._snapshot
+        if (
+            snapshot is None
+            or self._expired(snapshot)
+            or (source_version is not None and snapshot.source_version < source_version)
+        ):
+            snapshot = self.rebuild(db, stale=snapshot)
+        return snapshot
+
+    def rebuild(self, db: Session, stale: Optional[CatalogSnapshot] = None) -> CatalogSnapshot:
+        """Load the table and swap in a new snapshot.
+
+        With ``stale`` set, concurrent callers that were all waiting on the
+        same expired snapshot share a single rebuild.
+        """
+        with self._build_lock:
+            current = self._snapshot
+            if stale is not None and current is not stale and current is not None:
+                return current
+
+            started = time.perf_counter()
+            # Read before the rows: a concurrent write then leaves the snapshot looking stale, never fresh
+            source_version = read_table_versions(db, ("verbs",))["verbs"]
+            rows = fetch_rows(db, select(*schema_columns(VerbOut, models.Verb)))
+            # Sorted in Python, not by the database collation, so cursors can bisect ``keys``
+            rows.sort(key=lambda row: (row["infinitive"], row["id"]))
+            ids = tuple(row["id"] for row in rows)
+            encoded = tuple(dumps(row) for row in rows)
+            index = NgramIndex(
+                tuple(term for field in SEARCH_FIELDS for term in split_terms(row[field]))
+                for row in rows
+            )
+            forms = FormIndex(rows)
+            snapshot = CatalogSnapshot(
+                version=self._version + 1,
+                source_version=source_version,
+                built_at=time.monotonic(),
+                build_seconds=time.perf_counter() - started,
+                ids=ids,
+                keys=tuple((row["infinitive"], row["id"]) for row in rows),
+                encoded=encoded,
+                index=index,
+                forms=forms,
+                positions={verb_id: i for i, verb_id in enumerate(ids)},
+            )
+            with self._lock:
+                self._version = snapshot.version
+                self._snapshot = snapshot
+                self.rebuilds += 1
+            return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+    # Read paths: each returns ready-to-send JSON bytes.
+
+    def page(
+        self, db: Session, skip: int = 0, limit: int = 100, after: Optional[VerbKey] = None,
+        source_version: Optional[int] = None,
+    ) -> Tuple[bytes, Optional[VerbKey]]:
+        """One page plus the key of its last row (``None`` on the last page).
+
+        ``after`` (a keyset cursor) takes precedence over ``skip``.
+        """
+        snapshot = self.snapshot(db, source_version)
+        start = bisect_right(snapshot.keys, tuple(after)) if after is not None else max(skip, 0)
+        end = start + max(limit, 0)
+        next_key = snapshot.keys[end - 1] if 0 < end <= len(snapshot) - 1 else None
+        return _json_array(snapshot.encoded[start:end]), next_key
+
+    def get(self, db: Session, verb_id: int) -> Optional[bytes]:
+        snapshot = self.snapshot(db)
+        position = snapshot.positions.get(verb_id)
+        return None if position is None else snapshot.encoded[position]
+
+    def search(self, db: Session, query: str, limit: int = 20) -> bytes:
+        snapshot = self.snapshot(db)
+        return _json_array(snapshot.encoded[i] for i in snapshot.index.search(query, limit))
+
+    def grade(self, db: Session, verb_id: int, form: str, answer: str) -> Optional[Grade]:
+        return self.snapshot(db).forms.grade(verb_id, form, answer)
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"version": self._version, "rows": 0, "rebuilds": self.rebuilds}
+        return {
+            "version": snapshot.version,
+            "source_version": snapshot.source_version,
+            "rows": len(snapshot),
+            "rebuilds": self.rebuilds,
+            "build_seconds": round(snapshot.build_seconds, 6),
+            "approx_bytes": snapshot.approx_bytes,
+            "age_seconds": round(time.monotonic() - snapshot.built_at, 3),
+        }
+
+
+verb_catalog = VerbCatalog(ttl=get_settings().VERB_CATALOG_TTL_SECONDS)
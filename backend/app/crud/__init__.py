@@ -1,55 +1,74 @@
 # Re-exportar todas las funciones principales
-from .base import verify_password, get_password_hash
+from .. import etag  # noqa: F401  (registers the table_versions flush listener)
+from .base import (
+    verify_password, get_password_hash,
+    verify_password_async, get_password_hash_async
+)
 from .user import (
     get_user, get_user_by_username, authenticate_user,
+    authenticate_user_async, register_user_async,
     register_user, update_user_xp, get_user_stats,
-    list_verbs_for_user
+    list_verbs_for_user, load_principal,
+    invalidate_principal, principal_cache
 )
 from .verb import (
-    get_verbs, get_verb, get_verb_by_infinitive,
+    get_verbs, get_verb_rows, get_verb, get_verb_by_infinitive,
     create_verb, update_verb, delete_verb,
-    search_verbs, get_verb_stats, bulk_create_verbs
+    search_verb_rows, get_verb_stats, bulk_create_verbs,
+    VerbImport, verb_stats_cache
 )
 from .tense import (
     list_tenses, create_tense, add_tense_example,
     list_examples_by_tense
 )
 from .activity import (
-    list_activities, create_activity, add_activity_question,
+    list_activities, list_activity_rows, create_activity, add_activity_question,
     get_activity, list_questions_by_activity,
     start_attempt, submit_answer
 )
 from .progress import (
     select_verbs_for_practice, update_user_progress,
     get_user_progress, initialize_user_progress,
-    list_user_progress
+    list_user_progress, list_user_progress_rows, start_user_progress,
+    apply_progress_batch, add_to_user_stats, refresh_user_stats,
+    get_progress_forecast, progress_forecast_cache, FORECAST_MAX_DAYS,
+    reschedule_progress
 )
 from .content import (
     get_published_content_by_slug, list_published_content, count_published_content,
-    get_content_by_slug, create_content, update_content, delete_content
+    list_content_rows, get_content_by_slug, create_content, update_content, delete_content
 )
 
 __all__ = [
     # Base
     "verify_password", "get_password_hash",
+    "verify_password_async", "get_password_hash_async",
     # User
     "get_user", "get_user_by_username", "authenticate_user",
+    "authenticate_user_async", "register_user_async",
     "register_user", "update_user_xp", "get_user_stats",
-    "list_verbs_for_user",
+    "list_verbs_for_user", "load_principal",
+    "invalidate_principal", "principal_cache",
     # Verb
-    "get_verbs", "get_verb", "get_verb_by_infinitive",
+    "get_verbs", "get_verb_rows", "get_verb", "get_verb_by_infinitive",
     "create_verb", "update_verb", "delete_verb",
-    "search_verbs", "get_verb_stats", "bulk_create_verbs",
+    "search_verb_rows", "get_verb_stats", "bulk_create_verbs",
+    "VerbImport", "verb_stats_cache",
     # Tense
     "list_tenses", "create_tense", "add_tense_example",
     "list_examples_by_tense",
     # Activity
-    "list_activities", "create_activity", "add_activity_question",
+    "list_activities", "list_activity_rows", "create_activity", "add_activity_question",
     "get_activity", "list_questions_by_activity",
     "start_attempt", "submit_answer",
     # Progress
     "select_verbs_for_practice", "update_user_progress",
     "get_user_progress", "initialize_user_progress", "list_user_progress",
+    "list_user_progress_rows", "start_user_progress", "apply_progress_batch",
+    "add_to_user_stats", "refresh_user_stats",
+    "get_progress_forecast", "progress_forecast_cache", "FORECAST_MAX_DAYS",
+    "reschedule_progress",
     # Content
     "get_published_content_by_slug", "list_published_content", "count_published_content",
+    "list_content_rows",
 ]
\ No newline at end of file
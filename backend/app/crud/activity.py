@@ -1,10 +1,12 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 from datetime import datetime
 from fastapi import HTTPException
 
 from .. import models
-from ..schemas.activity import ActivityCreate, QuestionCreate
+from ..schemas.activity import ActivityCreate, ActivityOut, QuestionCreate
+from ..serialization import fetch_rows, schema_columns
 from .user import update_user_xp
 
 
@@ -24,6 +26,14 @@ def list_activities(db: Session, tense_id: int) -> List[models.Activity]:
     )
 
 
+def list_activity_rows(db: Session, tense_id: int | None = None) -> List[Dict[str, Any]]:
+    """Activities as plain dicts shaped like ``ActivityOut`` (fast response path)."""
+    stmt = select(*schema_columns(ActivityOut, models.Activity))
+    if tense_id is not None:
+        stmt = stmt.where(models.Activity.tense_id == tense_id).order_by(models.Activity.id.desc())
+    return fetch_rows(db, stmt)
+
+
 def create_activity(db: Session, data: Any) -> models.Activity:
     """
     Acepta:
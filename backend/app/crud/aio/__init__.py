@@ -0,0 +1,42 @@
+"""
+app/crud/aio
+Versiones async (AsyncSession) de los módulos CRUD más usados.
+
+Lookups and the hot reads (auth's user lookup, the practice session
+SELECT, the due-review forecast) are written natively against
+``AsyncSession``, sharing the statement builders of the sync modules.
+
+Multi-statement writes (progress updates and batches, starting progress,
+attempts, XP) reuse the sync implementation through ``AsyncSession.run_sync``
+so the business rules live in one place. That is still async I/O: run_sync
+executes the function in a greenlet on the event loop and every statement
+awaits the async driver, so no threadpool thread or sync pool connection is
+held. Its limit is CPU: the function's Python work (ORM flushes, ``srs``
+folding) runs on the loop thread itself, between its awaits.
+"""
+from .user import (
+    get_user, get_user_by_username, load_principal, update_user_xp, get_user_stats
+)
+from .activity import (
+    list_activities, get_activity, list_questions_by_activity,
+    start_attempt, submit_answer
+)
+from .progress import (
+    select_verbs_for_practice, update_user_progress,
+    get_user_progress, initialize_user_progress,
+    list_user_progress, list_user_progress_rows, apply_progress_batch,
+    get_progress_forecast
+)
+
+__all__ = [
+    # User
+    "get_user", "get_user_by_username", "load_principal", "update_user_xp", "get_user_stats",
+    # Activity
+    "list_activities", "get_activity", "list_questions_by_activity",
+    "start_attempt", "submit_answer",
+    # Progress
+    "select_verbs_for_practice", "update_user_progress", "apply_progress_batch",
+    "get_progress_forecast",
+    "get_user_progress", "initialize_user_progress", "list_user_progress",
+    "list_user_progress_rows",
+]
@@ -0,0 +1,40 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any
+
+from ... import models
+from .. import activity as sync_activity
+
+async def list_activities(db: AsyncSession, tense_id: int) -> List[models.Activity]:
+    result = await db.scalars(
+        select(models.Activity)
+        .where(models.Activity.tense_id == tense_id)
+        .order_by(models.Activity.id.desc())
+    )
+    return list(result)
+
+async def get_activity(db: AsyncSession, activity_id: int) -> models.Activity | None:
+    return await db.get(models.Activity, activity_id)
+
+async def list_questions_by_activity(db: AsyncSession, activity_id: int) -> List[models.ActivityQuestion]:
+    result = await db.scalars(
+        select(models.ActivityQuestion)
+        .where(models.ActivityQuestion.activity_id == activity_id)
+        .order_by(models.ActivityQuestion.sort_order.asc(), models.ActivityQuestion.id.asc())
+    )
+    return list(result)
+
+async def start_attempt(db: AsyncSession, user_id: int, activity_id: int) -> models.ActivityAttempt:
+    return await db.run_sync(sync_activity.start_attempt, user_id, activity_id)
+
+async def submit_answer(
+    db: AsyncSession,
+    user_id: int,
+    attempt_id: int,
+    question_id: int,
+    user_answer: str | None,
+    time_ms: int | None = None,
+) -> Dict[str, Any]:
+    return await db.run_sync(
+        sync_activity.submit_answer, user_id, attempt_id, question_id, user_answer, time_ms
+    )
@@ -0,0 +1,67 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Sequence
+from datetime import datetime
+
+from ... import models
+from ...schemas.progress import ProgressUpdateIn, UserProgressOut
+from ...serialization import schema_columns
+from .. import progress as sync_progress
+
+async def select_verbs_for_practice(
+    db: AsyncSession, user_id: int, limit: int = 10, now: datetime | None = None
+) -> List[models.Verb]:
+    now = now or datetime.utcnow()
+    rows = (await db.execute(sync_progress._practice_session(user_id, limit, now))).all()
+
+    new_ids = [verb.id for verb, bucket in rows if bucket == sync_progress.PRACTICE_NEW]
+    if new_ids:
+        await db.run_sync(sync_progress.start_user_progress, user_id, new_ids, now)
+        await db.commit()
+        sync_progress.progress_forecast_cache.invalidate(user_id)
+    return [verb for verb, _ in rows]
+
+async def update_user_progress(
+    db: AsyncSession, user_id: int, verb_id: int, correct: bool
+) -> models.UserProgress:
+    return await db.run_sync(sync_progress.update_user_progress, user_id, verb_id, correct)
+
+async def apply_progress_batch(
+    db: AsyncSession, user_id: int, answers: Sequence[ProgressUpdateIn], create_missing: bool = False
+) -> Dict[str, Any]:
+    return await db.run_sync(sync_progress.apply_progress_batch, user_id, answers, create_missing)
+
+async def get_progress_forecast(db: AsyncSession, user_id: int, days: int = 7) -> Dict[str, Any]:
+    today = datetime.utcnow().date()
+    cached = sync_progress.progress_forecast_cache.get(user_id)
+    if cached is None or cached[0] != today:
+        stmt = sync_progress._forecast_query(db.get_bind().dialect.name, user_id, today)
+        cached = (today, *sync_progress._fold_forecast((await db.execute(stmt)).all(), today))
+        sync_progress.progress_forecast_cache.set(user_id, cached)
+    return sync_progress._forecast_window(cached, days)
+
+async def get_user_progress(db: AsyncSession, user_id: int, verb_id: int) -> models.UserProgress | None:
+    return await db.scalar(
+        select(models.UserProgress)
+        .where(
+            models.UserProgress.user_id == user_id,
+            models.UserProgress.verb_id == verb_id
+        )
+        .limit(1)
+    )
+
+async def initialize_user_progress(db: AsyncSession, user_id: int) -> int:
+    return await db.run_sync(sync_progress.initialize_user_progress, user_id)
+
+async def list_user_progress(db: AsyncSession, user_id: int) -> List[models.UserProgress]:
+    result = await db.scalars(
+        select(models.UserProgress).where(models.UserProgress.user_id == user_id)
+    )
+    return list(result)
+
+async def list_user_progress_rows(db: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
+    result = await db.execute(
+        select(*schema_columns(UserProgressOut, models.UserProgress))
+        .where(models.UserProgress.user_id == user_id)
+    )
+    return [dict(row) for row in result.mappings()]
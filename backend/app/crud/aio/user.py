@@ -0,0 +1,25 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any
+
+from ... import models
+from .. import user as sync_user
+
+async def get_user(db: AsyncSession, user_id: int) -> models.User | None:
+    return await db.get(models.User, user_id)
+
+async def get_user_by_username(db: AsyncSession, username: str) -> models.User | None:
+    return await db.scalar(select(models.User).where(models.User.username == username))
+
+async def load_principal(db: AsyncSession, username: str) -> models.User | None:
+    """Query the user behind a token subject and store it in ``principal_cache``."""
+    user = await get_user_by_username(db, username)
+    if user is not None:
+        sync_user.principal_cache.set(username, sync_user._snapshot_user(user))
+    return user
+
+async def update_user_xp(db: AsyncSession, user_id: int, xp_gain: int) -> models.User | None:
+    return await db.run_sync(sync_user.update_user_xp, user_id, xp_gain)
+
+async def get_user_stats(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+    return await db.run_sync(sync_user.get_user_stats, user_id)
@@ -1,8 +1,13 @@
-from passlib.context import CryptContext
-from fastapi import HTTPException
+from fastapi import HTTPException, status
+from sqlalchemy import Table
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Insert
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from ..password_pool import build_crypt_context, password_pool
+from ..settings import get_settings
+
+pwd_context = build_crypt_context(get_settings().BCRYPT_ROUNDS)
 
 # Password utilities
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -11,6 +16,25 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+# Async variants: the bcrypt work runs on the dedicated password pool
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.hash(password)
+
 # Error handling utilities
 def handle_integrity_error(error: IntegrityError, detail: str = "Resource already exists"):
     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+# Set-based insert utilities
+def insert_ignoring_conflicts(db: Session, table: Table) -> Insert:
+    """``INSERT ... ON CONFLICT DO NOTHING`` for the session's dialect (Postgres or SQLite)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT DO NOTHING is not supported on {dialect}")
+    return insert(table).on_conflict_do_nothing()
@@ -3,9 +3,12 @@ app/crud/content.py
 Operaciones CRUD para contenido.
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 from app.models import ContentItem
+from app.schemas.content import ContentItemPublic
+from app.serialization import fetch_rows, schema_columns
 
 def get_published_content_by_slug(db: Session, slug: str) -> Optional[ContentItem]:
     """Retrieve a single content item by slug, ONLY if published."""
@@ -26,6 +29,22 @@ def count_published_content(db: Session) -> int:
         ContentItem.status == 'published'
     ).count()
 
+def list_content_rows(db: Session, skip: int = 0, limit: int = 20, published_only: bool = True,
+                      after: Optional[Tuple[datetime, int]] = None) -> List[Dict[str, Any]]:
+    """Content items as plain dicts shaped like ``ContentItemPublic`` (fast response path).
+
+    Newest first. ``after`` is a ``(sort key, id)`` keyset cursor and replaces ``skip``.
+    """
+    sort = ContentItem.published_at if published_only else ContentItem.updated_at
+    stmt = select(*schema_columns(ContentItemPublic, ContentItem)).order_by(sort.desc(), ContentItem.id.desc())
+    if published_only:
+        stmt = stmt.where(ContentItem.status == 'published')
+    if after is not None:
+        stmt = stmt.where(tuple_(sort, ContentItem.id) < tuple(after))
+    else:
+        stmt = stmt.offset(skip)
+    return fetch_rows(db, stmt.limit(limit))
+
 
 # Admin Write Operations
 
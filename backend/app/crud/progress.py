@@ -1,147 +1,311 @@
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from datetime import datetime, timedelta
-from typing import List
+from sqlalchemy import (
+    DateTime, Integer, Select, case, cast, delete, exists, func, insert, literal, select, text, union_all, update,
+)
+from sqlalchemy.engine import Connection
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Sequence
+import random
+from collections import Counter
 
 from .. import models
-from .user import update_user_xp
+from ..schemas.progress import ProgressUpdateIn, UserProgressOut
+from ..serialization import fetch_rows, schema_columns
+from ..cache import TTLCache
+from ..settings import get_settings
+from ..srs import DEFAULT_EASE, MASTERED_STREAK, ReviewState, Scheduler, reschedule, review
+from .base import insert_ignoring_conflicts
+from .user import invalidate_principal
 
-def select_verbs_for_practice(db: Session, user_id: int, limit: int = 10) -> List[models.Verb]:
-    now = datetime.utcnow()
-    session_verbs = []
+# Per-user running totals (models.UserStats) read by get_user_stats
 
-    due_stmt = (
-        select(models.Verb)
-        .join(models.UserProgress, models.UserProgress.verb_id == models.Verb.id)
-        .where(models.UserProgress.user_id == user_id)
-        .where(models.UserProgress.srs_date <= now)
-        .order_by(models.UserProgress.srs_date.asc())
-        .limit(limit)
+STATS_COLUMNS = ["user_id", "verbs_learned", "verbs_mastered", "total_streak", "total_mistakes", "created_at"]
+
+def _stats_source(user_ids: Sequence[int] | None = None) -> Select:
+    """``user_progress`` aggregated into ``STATS_COLUMNS``, one row per user."""
+    P = models.UserProgress
+    stmt = (
+        select(
+            P.user_id,
+            func.count(),
+            func.sum(case((P.streak >= MASTERED_STREAK, 1), else_=0)),
+            func.sum(P.streak),
+            func.sum(P.mistakes),
+            literal(datetime.utcnow(), DateTime),
+        )
+        .group_by(P.user_id)
     )
-    due_verbs = db.scalars(due_stmt).all()
-    
-    if len(due_verbs) >= limit:
-        return due_verbs
-    
-    session_verbs.extend(due_verbs)
-    remaining_slots = limit - len(due_verbs)
+    if user_ids is not None:
+        stmt = stmt.where(P.user_id.in_(user_ids))
+    return stmt
 
-    if remaining_slots > 0:
-        subquery = (
-            select(models.UserProgress.verb_id)
-            .where(models.UserProgress.user_id == user_id)
+def refresh_user_stats(db: Session | Connection, user_ids: Sequence[int] | None = None) -> None:
+    """Recompute the totals of ``user_ids`` (default: everyone) from their progress rows.
+
+    For writes that bypass ``add_to_user_stats``, such as the cascade of a
+    verb deletion, and for the backfill migration. The caller commits.
+    """
+    S = models.UserStats
+    clear = delete(S)
+    if user_ids is not None:
+        clear = clear.where(S.user_id.in_(user_ids))
+    db.execute(clear)
+    db.execute(insert(S).from_select(STATS_COLUMNS, _stats_source(user_ids)))
+
+def add_to_user_stats(
+    db: Session, user_id: int, learned: int = 0, mastered: int = 0, streak: int = 0, mistakes: int = 0
+) -> None:
+    """Add deltas to the user's totals, after the progress rows were written. The caller commits."""
+    if not (learned or mastered or streak or mistakes):
+        return
+    S = models.UserStats
+    bump = (
+        update(S)
+        .where(S.user_id == user_id)
+        .values(
+            verbs_learned=S.verbs_learned + learned,
+            verbs_mastered=S.verbs_mastered + mastered,
+            total_streak=S.total_streak + streak,
+            total_mistakes=S.total_mistakes + mistakes,
         )
-        new_stmt = (
-            select(models.Verb)
-            .where(models.Verb.id.not_in(subquery))
-            .order_by(func.random())
-            .limit(remaining_slots)
+    )
+    if db.execute(bump).rowcount:
+        return
+    # First write for this user: seed the totals from user_progress, which
+    # already includes this transaction's rows
+    seeded = db.execute(
+        insert_ignoring_conflicts(db, S.__table__).from_select(STATS_COLUMNS, _stats_source([user_id]))
+    )
+    if not seeded.rowcount:
+        # A concurrent first write seeded it without our (uncommitted) rows
+        db.execute(bump)
+
+def _stats_delta(before: ReviewState, after: ReviewState) -> Dict[str, int]:
+    return {
+        "mastered": (after.streak >= MASTERED_STREAK) - (before.streak >= MASTERED_STREAK),
+        "streak": after.streak - before.streak,
+        "mistakes": after.mistakes - before.mistakes,
+    }
+
+def start_user_progress(
+    db: Session, user_id: int, verb_ids: Iterable[int] | None = None, now: datetime | None = None
+) -> List[int]:
+    """Create fresh progress rows for ``verb_ids`` (default: the whole catalog).
+
+    A single ``INSERT ... SELECT FROM verbs ... ON CONFLICT DO NOTHING
+    RETURNING``: verbs the user already has are skipped, and so are ids that
+    are not verbs. The ``(user_id, verb_id)`` unique index stops concurrent
+    callers from creating duplicates. Returns the verb ids whose rows were
+    created; the caller commits.
+    """
+    P, V = models.UserProgress, models.Verb
+    now = now or datetime.utcnow()
+    source = (
+        select(
+            literal(user_id), V.id, literal(now, DateTime), literal(0), literal(0), literal(DEFAULT_EASE),
+            literal(now, DateTime),
         )
-        new_verbs = db.scalars(new_stmt).all()
-        
-        for verb in new_verbs:
-            prog = models.UserProgress(
-                user_id=user_id,
-                verb_id=verb.id,
-                srs_date=now,
-                mistakes=0,
-                streak=0,
+        # Also keeps ON CONFLICT from burning a sequence value per existing row
+        .where(~exists().where(P.user_id == user_id, P.verb_id == V.id))
+    )
+    if verb_ids is not None:
+        verb_ids = list(verb_ids)
+        if not verb_ids:
+            return []
+        source = source.where(V.id.in_(verb_ids))
+    stmt = (
+        insert_ignoring_conflicts(db, P.__table__)
+        .from_select(["user_id", "verb_id", "srs_date", "mistakes", "streak", "ease", "created_at"], source)
+        .returning(P.verb_id)
+    )
+    created = list(db.scalars(stmt))
+    add_to_user_stats(db, user_id, learned=len(created))
+    return created
+
+# Practice buckets, in the order they fill a session
+PRACTICE_DUE, PRACTICE_NEW, PRACTICE_REVIEW = 0, 1, 2
+
+def _first(stmt: Select, limit: int) -> Select:
+    """``stmt`` limited and wrapped, so it can be a member of a UNION on every dialect."""
+    return select(stmt.limit(limit).subquery())
+
+def _practice_candidates(user_id: int, limit: int, now: datetime, pivot_fraction: float) -> Select:
+    """Up to ``limit`` verbs from each bucket, ordered within the bucket:
+
+    * due: the user's verbs with ``srs_date <= now``, oldest first,
+    * new: verbs without a progress row, read as an id range starting at a
+      random pivot and wrapping round to the lowest ids. Two index range
+      scans instead of sorting the whole table by ``random()``,
+    * review: the user's remaining verbs, lowest streak first.
+    """
+    P, V = models.UserProgress, models.Verb
+    pivot = (
+        select(cast(func.min(V.id) + (func.max(V.id) - func.min(V.id)) * pivot_fraction, Integer))
+        .correlate(None)
+        .scalar_subquery()
+    )
+    unseen = ~exists().where(P.user_id == user_id, P.verb_id == V.id)
+    at_now = literal(now, DateTime)
+
+    def new_verbs(wrap: int, in_range) -> Select:
+        return (
+            select(
+                V.id.label("verb_id"), literal(PRACTICE_NEW).label("bucket"),
+                literal(0).label("streak"), at_now.label("srs_date"), literal(wrap).label("wrap"),
             )
-            db.add(prog)
-        
-        if new_verbs:
-            db.commit()
-            session_verbs.extend(new_verbs)
-            remaining_slots -= len(new_verbs)
-
-    if not session_verbs or remaining_slots > 0:
-        fallback_limit = remaining_slots if session_verbs else limit
-        
-        low_streak_stmt = (
-            select(models.Verb)
-            .join(models.UserProgress, models.UserProgress.verb_id == models.Verb.id)
-            .where(models.UserProgress.user_id == user_id)
-            .order_by(models.UserProgress.streak.asc(), models.UserProgress.srs_date.asc())
-            .limit(fallback_limit)
+            .where(unseen, in_range)
+            .order_by(V.id)
         )
-        fallback_verbs = db.scalars(low_streak_stmt).all()
-        
-        if len(fallback_verbs) < fallback_limit:
-            random_stmt = (
-                select(models.Verb)
-                .order_by(func.random())
-                .limit(fallback_limit - len(fallback_verbs))
+
+    def own_verbs(bucket: int, due: bool, *order) -> Select:
+        return (
+            select(
+                P.verb_id, literal(bucket).label("bucket"),
+                (literal(0) if due else P.streak).label("streak"), P.srs_date, literal(0).label("wrap"),
             )
-            random_verbs = db.scalars(random_stmt).all()
-            fallback_verbs.extend(random_verbs)
-            
-            for verb in random_verbs:
-                existing = db.query(models.UserProgress).filter(
-                    models.UserProgress.user_id == user_id,
-                    models.UserProgress.verb_id == verb.id
-                ).first()
-                if not existing:
-                    prog = models.UserProgress(
-                        user_id=user_id,
-                        verb_id=verb.id,
-                        srs_date=now,
-                        mistakes=0,
-                        streak=0,
-                    )
-                    db.add(prog)
-        
-        if fallback_verbs:
-            db.commit()
-            if not session_verbs:
-                session_verbs = fallback_verbs
-            else:
-                session_verbs.extend(fallback_verbs)
-
-    return session_verbs[:limit]
+            .where(P.user_id == user_id, (P.srs_date <= now) if due else (P.srs_date > now))
+            .order_by(*order)
+        )
 
-def update_user_progress(
-    db: Session, user_id: int, verb_id: int, correct: bool
-) -> models.UserProgress:
-    now = datetime.utcnow()
-    
-    prog = (
-        db.query(models.UserProgress)
-        .filter(
-            models.UserProgress.user_id == user_id,
-            models.UserProgress.verb_id == verb_id
+    return union_all(
+        _first(own_verbs(PRACTICE_DUE, True, P.srs_date), limit),
+        _first(new_verbs(0, V.id >= pivot), limit),
+        _first(new_verbs(1, V.id < pivot), limit),
+        _first(own_verbs(PRACTICE_REVIEW, False, P.streak, P.srs_date), limit),
+    ).subquery("candidates")
+
+def _practice_session(user_id: int, limit: int, now: datetime) -> Select:
+    """``(Verb, bucket)`` rows of one practice session, in serving order."""
+    candidates = _practice_candidates(user_id, limit, now, random.random())
+    return (
+        select(models.Verb, candidates.c.bucket)
+        .join(candidates, candidates.c.verb_id == models.Verb.id)
+        .order_by(
+            candidates.c.bucket, candidates.c.streak, candidates.c.srs_date,
+            candidates.c.wrap, candidates.c.verb_id,
         )
-        .first()
+        .limit(limit)
     )
-    
-    if prog is None:
-        prog = models.UserProgress(
-            user_id=user_id,
-            verb_id=verb_id,
-            srs_date=now,
-            mistakes=0,
-            streak=0,
-        )
-        db.add(prog)
+
+def select_verbs_for_practice(
+    db: Session, user_id: int, limit: int = 10, now: datetime | None = None
+) -> List[models.Verb]:
+    """Due verbs first, then verbs the user has not seen, then the weakest of the rest.
+
+    One SELECT picks the session and one INSERT starts progress for the new
+    verbs in it. ``now`` defaults to the current time (the SRS simulation
+    in ``scripts.bench_srs_simulation`` passes a simulated clock).
+    """
+    now = now or datetime.utcnow()
+    rows = db.execute(_practice_session(user_id, limit, now)).all()
+
+    new_ids = [verb.id for verb, bucket in rows if bucket == PRACTICE_NEW]
+    if new_ids:
+        start_user_progress(db, user_id, new_ids, now)
         db.commit()
-        db.refresh(prog)
+        progress_forecast_cache.invalidate(user_id)
+    return [verb for verb, _ in rows]
+
+def _add_user_xp(db: Session, user_id: int, xp: int) -> str | None:
+    """Add ``xp`` to the user's total in one UPDATE; returns the username for
+    ``invalidate_principal`` once the caller has committed."""
+    return db.scalar(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(total_xp=models.User.total_xp + xp)
+        .returning(models.User.username)
+    )
+
+def update_user_progress(
+    db: Session, user_id: int, verb_id: int, correct: bool, now: datetime | None = None
+) -> models.UserProgress:
+    now = now or datetime.utcnow()
     
-    if correct:
-        prog.streak += 1
-        interval_days = min(2 ** prog.streak, 32)
-        prog.srs_date = now + timedelta(days=interval_days)
-        xp_gain = 10 * (1 + min(prog.streak, 5))
-        update_user_xp(db, user_id, xp_gain)
-    else:
-        prog.mistakes += 1
-        prog.streak = 0
-        prog.srs_date = now + timedelta(days=1)
-        update_user_xp(db, user_id, 2)
+    prog = get_user_progress(db, user_id, verb_id)
+    if prog is None:
+        start_user_progress(db, user_id, [verb_id], now)
+        prog = get_user_progress(db, user_id, verb_id)
+        if prog is None:
+            raise HTTPException(status_code=404, detail="Verb not found")
     
-    db.add(prog)
+    before = ReviewState(prog.streak, prog.mistakes, prog.srs_date, prog.ease, prog.last_reviewed_at)
+    state, xp_gain = review(before, correct, now)
+    prog.streak, prog.mistakes, prog.srs_date = state.streak, state.mistakes, state.srs_date
+    prog.ease, prog.last_reviewed_at = state.ease, state.last_reviewed_at
+    db.flush()
+    add_to_user_stats(db, user_id, **_stats_delta(before, state))
+    username = _add_user_xp(db, user_id, xp_gain)
     db.commit()
-    db.refresh(prog)
+    invalidate_principal(username)
+    progress_forecast_cache.invalidate(user_id)
     return prog
 
+def apply_progress_batch(
+    db: Session, user_id: int, answers: Sequence[ProgressUpdateIn], create_missing: bool = False,
+    now: datetime | None = None,
+) -> Dict[str, Any]:
+    """Apply every answer of a practice session in one transaction.
+
+    The user's rows are read once (locked on Postgres), each answer is
+    folded through ``srs.review`` in order (a verb answered twice moves
+    twice), then one executemany UPDATE writes the rows and one UPDATE adds
+    the summed XP. Missing rows are created with ``create_missing``
+    (``PROGRESS_INIT_MODE=lazy``), otherwise they are a ``404``.
+    """
+    P = models.UserProgress
+    now = now or datetime.utcnow()
+    verb_ids = list(dict.fromkeys(answer.verb_id for answer in answers))
+    if create_missing:
+        start_user_progress(db, user_id, verb_ids, now)
+    rows = {
+        row.verb_id: row
+        for row in db.execute(
+            select(P.id, P.verb_id, P.streak, P.mistakes, P.srs_date, P.ease, P.last_reviewed_at)
+            .where(P.user_id == user_id, P.verb_id.in_(verb_ids))
+            .with_for_update()
+        )
+    }
+    missing = [verb_id for verb_id in verb_ids if verb_id not in rows]
+    if missing:
+        db.rollback()
+        detail = "Verb not found" if create_missing else "Progress not initialized; call POST /progress/init first"
+        raise HTTPException(status_code=404, detail=f"{detail}: {missing}")
+
+    initial = {
+        verb_id: ReviewState(row.streak, row.mistakes, row.srs_date, row.ease, row.last_reviewed_at)
+        for verb_id, row in rows.items()
+    }
+    states = dict(initial)
+    xp_gained = 0
+    for answer in answers:
+        states[answer.verb_id], xp = review(states[answer.verb_id], answer.is_correct, now)
+        xp_gained += xp
+
+    progress = [
+        {
+            "id": rows[verb_id].id, "user_id": user_id, "verb_id": verb_id,
+            "srs_date": state.srs_date, "mistakes": state.mistakes, "streak": state.streak,
+        }
+        for verb_id, state in states.items()
+    ]
+    db.execute(update(P), [
+        {
+            "id": rows[verb_id].id, "srs_date": state.srs_date, "mistakes": state.mistakes,
+            "streak": state.streak, "ease": state.ease, "last_reviewed_at": state.last_reviewed_at,
+        }
+        for verb_id, state in states.items()
+    ])
+    totals = Counter()
+    for verb_id, state in states.items():
+        totals.update(_stats_delta(initial[verb_id], state))
+    add_to_user_stats(db, user_id, **totals)
+    username = _add_user_xp(db, user_id, xp_gained)
+    db.commit()
+    invalidate_principal(username)
+    progress_forecast_cache.invalidate(user_id)
+    return {"xp_gained": xp_gained, "progress": progress}
+
 def get_user_progress(db: Session, user_id: int, verb_id: int) -> models.UserProgress | None:
     return (
         db.query(models.UserProgress)
@@ -153,31 +317,160 @@ def get_user_progress(db: Session, user_id: int, verb_id: int) -> models.UserPro
     )
 
 def initialize_user_progress(db: Session, user_id: int) -> int:
-    now = datetime.utcnow()
-    verbs = db.query(models.Verb).all()
-    created = 0
-    
-    for verb in verbs:
-        existing = get_user_progress(db, user_id, verb.id)
-        if not existing:
-            prog = models.UserProgress(
-                user_id=user_id,
-                verb_id=verb.id,
-                srs_date=now,
-                mistakes=0,
-                streak=0,
-            )
-            db.add(prog)
-            created += 1
-    
-    if created > 0:
+    """Start progress for every verb the user does not have yet; returns how many.
+
+    With ``PROGRESS_INIT_MODE=lazy`` nothing is created up front: rows appear
+    when a verb is first practiced or updated.
+    """
+    if get_settings().PROGRESS_INIT_MODE == "lazy":
+        return 0
+    created = start_user_progress(db, user_id)
+    if created:
         db.commit()
-    
-    return created
+        progress_forecast_cache.invalidate(user_id)
+    return len(created)
 
 def list_user_progress(db: Session, user_id: int) -> List[models.UserProgress]:
     return (
         db.query(models.UserProgress)
         .filter(models.UserProgress.user_id == user_id)
         .all()
-    )
\ No newline at end of file
+    )
+
+def list_user_progress_rows(db: Session, user_id: int) -> List[Dict[str, Any]]:
+    """``list_user_progress`` as plain dicts shaped like ``UserProgressOut``."""
+    stmt = (
+        select(*schema_columns(UserProgressOut, models.UserProgress))
+        .where(models.UserProgress.user_id == user_id)
+    )
+    return fetch_rows(db, stmt)
+
+# Batch rescheduling
+
+def _write_srs_dates(db: Session, ids: List[int], dates: List[datetime]) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        # One statement per chunk instead of one UPDATE per row
+        db.execute(
+            text(
+                "UPDATE user_progress AS p SET srs_date = v.srs_date "
+                "FROM unnest(CAST(:ids AS integer[]), CAST(:dates AS timestamp[])) AS v(id, srs_date) "
+                "WHERE p.id = v.id"
+            ),
+            {"ids": ids, "dates": dates},
+        )
+    else:
+        db.execute(update(models.UserProgress), [{"id": i, "srs_date": d} for i, d in zip(ids, dates)])
+
+def reschedule_progress(
+    db: Session, user_id: int | None = None, scheduler: Scheduler | None = None, chunk_size: int = 20_000
+) -> int:
+    """Recompute ``srs_date`` from ``last_reviewed_at`` for a user's cards (default: everyone's).
+
+    Run after changing ``SRS_SCHEDULER`` or its parameters. Cards are read
+    in id order, ``chunk_size`` at a time; each chunk is rescheduled in one
+    vectorized pass (``srs.reschedule``), written with one bulk UPDATE and
+    committed. Never-reviewed cards keep their date. Returns the number of
+    cards rescheduled.
+    """
+    P = models.UserProgress
+    total, after = 0, 0
+    while True:
+        stmt = (
+            select(P.id, P.streak, P.mistakes, P.ease, P.last_reviewed_at)
+            .where(P.last_reviewed_at.is_not(None), P.id > after)
+            .order_by(P.id)
+            .limit(chunk_size)
+        )
+        if user_id is not None:
+            stmt = stmt.where(P.user_id == user_id)
+        rows = db.execute(stmt).all()
+        if not rows:
+            break
+        ids, streak, mistakes, ease, reviewed = (list(column) for column in zip(*rows))
+        _write_srs_dates(db, ids, reschedule(streak, mistakes, ease, reviewed, scheduler))
+        db.commit()
+        total += len(ids)
+        after = ids[-1]
+    if user_id is None:
+        progress_forecast_cache.clear()
+    else:
+        progress_forecast_cache.invalidate(user_id)
+    return total
+
+# Due-review forecast
+
+FORECAST_MAX_DAYS = 30
+
+# user_id -> (UTC day it was computed on, overdue count, due per day for FORECAST_MAX_DAYS)
+progress_forecast_cache = TTLCache(
+    maxsize=10_000,
+    ttl=get_settings().PROGRESS_FORECAST_CACHE_TTL_SECONDS,
+    name="progress_forecast",
+)
+
+def _due_day(dialect: str):
+    """``srs_date`` truncated to its (UTC) day."""
+    if dialect == "postgresql":
+        return func.date_trunc("day", models.UserProgress.srs_date)
+    return func.date(models.UserProgress.srs_date)
+
+def _as_date(value: date | str) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+def _forecast_query(dialect: str, user_id: int, today: date) -> Select:
+    """Due reviews per day up to ``FORECAST_MAX_DAYS`` ahead, overdue days included."""
+    P = models.UserProgress
+    horizon = datetime.combine(today + timedelta(days=FORECAST_MAX_DAYS), datetime.min.time())
+    day = _due_day(dialect).label("day")
+    # Range scan on ix_user_progress_user_srs_date
+    return (
+        select(day, func.count())
+        .where(P.user_id == user_id, P.srs_date < horizon)
+        .group_by(day)
+    )
+
+def _fold_forecast(rows: Iterable[Any], today: date) -> tuple[int, List[int]]:
+    """``_forecast_query`` rows as (overdue count, due per day from today)."""
+    overdue, due = 0, [0] * FORECAST_MAX_DAYS
+    for value, count in rows:
+        offset = (_as_date(value) - today).days
+        if offset < 0:
+            overdue += count
+        else:
+            due[offset] += count
+    return overdue, due
+
+def _forecast_window(cached: tuple[date, int, List[int]], days: int) -> Dict[str, Any]:
+    """The response for the first ``days`` days of a cached forecast."""
+    days = max(1, min(days, FORECAST_MAX_DAYS))
+    today, overdue, due = cached
+    forecast = [
+        {"date": today + timedelta(days=offset), "due": due[offset] + (overdue if offset == 0 else 0)}
+        for offset in range(days)
+    ]
+    return {
+        "days": days,
+        "overdue": overdue,
+        "total": sum(day["due"] for day in forecast),
+        "forecast": forecast,
+    }
+
+def get_progress_forecast(db: Session, user_id: int, days: int = 7) -> Dict[str, Any]:
+    """Reviews falling due on each of the next ``days`` UTC days (today first).
+
+    Today's count includes the overdue reviews, also reported on their own.
+    One indexed GROUP BY over the user's due dates computes the whole
+    ``FORECAST_MAX_DAYS`` window, cached per user until the next progress
+    write or the end of the day.
+    """
+    today = datetime.utcnow().date()
+    cached = progress_forecast_cache.get(user_id)
+    if cached is None or cached[0] != today:
+        rows = db.execute(_forecast_query(db.get_bind().dialect.name, user_id, today)).all()
+        cached = (today, *_fold_forecast(rows, today))
+        progress_forecast_cache.set(user_id, cached)
+    return _forecast_window(cached, days)
@@ -1,13 +1,44 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from typing import Dict, Any
 from datetime import datetime
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 
 from .. import models
+from ..cache import TTLCache
 from ..schemas.user import UserCreate
-from .base import get_password_hash, verify_password, handle_integrity_error
+from ..settings import get_settings
+from .base import (
+    get_password_hash, verify_password, handle_integrity_error,
+    get_password_hash_async, verify_password_async,
+)
+
+_settings = get_settings()
+
+# Authenticated principals keyed by token subject (username). Entries are
+# detached snapshots so they can be shared safely between requests.
+principal_cache = TTLCache(
+    maxsize=_settings.PRINCIPAL_CACHE_SIZE,
+    ttl=_settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    name="principal",
+)
+
+def _snapshot_user(user: models.User) -> models.User:
+    """Transient copy of ``user`` that is not bound to any session."""
+    return models.User(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        hashed_password=user.hashed_password,
+        total_xp=user.total_xp,
+        created_at=user.created_at,
+    )
+
+def invalidate_principal(username: str | None) -> None:
+    if username:
+        principal_cache.invalidate(username)
 
 def get_user(db: Session, user_id: int) -> models.User | None:
     return db.get(models.User, user_id)
@@ -15,6 +46,13 @@ def get_user(db: Session, user_id: int) -> models.User | None:
 def get_user_by_username(db: Session, username: str) -> models.User | None:
     return db.query(models.User).filter(models.User.username == username).first()
 
+def load_principal(db: Session, username: str) -> models.User | None:
+    """Query the user behind a token subject and store it in ``principal_cache``."""
+    user = get_user_by_username(db, username)
+    if user is not None:
+        principal_cache.set(username, _snapshot_user(user))
+    return user
+
 def authenticate_user(db: Session, username: str, password: str) -> models.User | None:
     user = get_user_by_username(db, username)
     if not user:
@@ -23,9 +61,17 @@ def authenticate_user(db: Session, username: str, password: str) -> models.User
         return None
     return user
 
-def register_user(db: Session, username: str, email: str, password: str) -> models.User:
+async def authenticate_user_async(db: Session, username: str, password: str) -> models.User | None:
+    """Like ``authenticate_user`` but verifies the hash on the password pool."""
+    user = await run_in_threadpool(get_user_by_username, db, username)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
+
+def _insert_user(db: Session, username: str, email: str, hashed_password: str) -> models.User:
     try:
-        hashed_password = get_password_hash(password)
         user = models.User(
             username=username,
             email=email,
@@ -35,42 +81,50 @@ def register_user(db: Session, username: str, email: str, password: str) -> mode
         db.add(user)
         db.commit()
         db.refresh(user)
+        invalidate_principal(username)
         return user
     except IntegrityError as e:
         db.rollback()
         handle_integrity_error(e, "Username or email already exists")
 
+def register_user(db: Session, username: str, email: str, password: str) -> models.User:
+    return _insert_user(db, username, email, get_password_hash(password))
+
+async def register_user_async(db: Session, username: str, email: str, password: str) -> models.User:
+    """Like ``register_user`` but hashes the password on the password pool."""
+    hashed_password = await get_password_hash_async(password)
+    return await run_in_threadpool(_insert_user, db, username, email, hashed_password)
+
 def update_user_xp(db: Session, user_id: int, xp_gain: int) -> models.User | None:
     user = get_user(db, user_id)
     if user:
         user.total_xp += xp_gain
         db.commit()
         db.refresh(user)
+        invalidate_principal(user.username)
     return user
 
 def get_user_stats(db: Session, user_id: int) -> Dict[str, Any]:
-    total_verbs = db.query(func.count(models.Verb.id)).scalar() or 0
-    
-    user_progress = db.query(models.UserProgress).filter(
-        models.UserProgress.user_id == user_id
-    ).all()
-    
-    verbs_learned = len(user_progress)
-    now = datetime.utcnow()
-    due_count = sum(1 for p in user_progress if p.srs_date <= now)
-    
-    total_streak = sum(p.streak for p in user_progress)
-    total_mistakes = sum(p.mistakes for p in user_progress)
+    """Dashboard figures from the ``user_stats`` totals, kept current by the
+    progress writes, plus an indexed count of due verbs."""
+    P, S = models.UserProgress, models.UserStats
+    totals = db.execute(
+        select(
+            models.User.total_xp, S.verbs_learned, S.verbs_mastered, S.total_streak, S.total_mistakes,
+        )
+        .outerjoin(S, S.user_id == models.User.id)
+        .where(models.User.id == user_id)
+    ).first()
+    user_xp, verbs_learned, mastered, total_streak, total_mistakes = (
+        (value or 0 for value in totals) if totals else (0, 0, 0, 0, 0)
+    )
+    due_count = db.scalar(
+        select(func.count()).select_from(P).where(P.user_id == user_id, P.srs_date <= datetime.utcnow())
+    )
+    total_verbs = db.scalar(select(func.count()).select_from(models.Verb))
+
     avg_streak = total_streak / max(verbs_learned, 1)
-    
-    if verbs_learned > 0:
-        mastered = sum(1 for p in user_progress if p.streak >= 5)
-        mastery_percentage = (mastered / verbs_learned) * 100
-    else:
-        mastery_percentage = 0
-    
-    user = get_user(db, user_id)
-    user_xp = user.total_xp if user else 0
+    mastery_percentage = (mastered / verbs_learned) * 100 if verbs_learned > 0 else 0
     
     level = (user_xp // 100) + 1
     xp_to_next_level = 100 - (user_xp % 100)
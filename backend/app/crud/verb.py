@@ -1,17 +1,33 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import String, case, func, literal, or_, select
 from typing import List, Dict, Any
 from datetime import datetime
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
 
 from .. import models
-from ..schemas.verb import VerbCreate, VerbUpdate
-from .base import handle_integrity_error
+from ..schemas.verb import VerbCreate, VerbOut, VerbUpdate
+from ..catalog import verb_catalog
+from ..serialization import fetch_rows, schema_columns
+from ..textsearch import RANK_EXACT, RANK_PREFIX, RANK_SUBSTRING, fold
+from ..cache import TTLCache
+from ..etag import bump_table_versions, read_table_versions
+from .base import handle_integrity_error, insert_ignoring_conflicts
+from .progress import refresh_user_stats
 
 def get_verbs(db: Session, skip: int = 0, limit: int = 100) -> List[models.Verb]:
     return db.query(models.Verb).order_by(models.Verb.infinitive.asc()).offset(skip).limit(limit).all()
 
+def get_verb_rows(db: Session, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    """``get_verbs`` as plain dicts shaped like ``VerbOut`` (fast response path)."""
+    stmt = (
+        select(*schema_columns(VerbOut, models.Verb))
+        .order_by(models.Verb.infinitive.asc(), models.Verb.id.asc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return fetch_rows(db, stmt)
+
 def get_verb(db: Session, verb_id: int) -> models.Verb | None:
     return db.get(models.Verb, verb_id)
 
@@ -30,6 +46,7 @@ def create_verb(db: Session, data: VerbCreate) -> models.Verb:
         db.add(verb)
         db.commit()
         db.refresh(verb)
+        verb_catalog.rebuild(db)
         return verb
     except IntegrityError as e:
         db.rollback()
@@ -50,6 +67,7 @@ def update_verb(db: Session, verb_id: int, data: VerbUpdate) -> models.Verb | No
         db.add(verb)
         db.commit()
         db.refresh(verb)
+        verb_catalog.rebuild(db)
     
     return verb
 
@@ -57,61 +75,175 @@ def delete_verb(db: Session, verb_id: int) -> bool:
     verb = db.get(models.Verb, verb_id)
     if not verb:
         return False
+    learners = db.scalars(
+        select(models.UserProgress.user_id).where(models.UserProgress.verb_id == verb_id)
+    ).all()
     db.delete(verb)
+    db.flush()
+    # The cascade removed progress rows behind add_to_user_stats' back
+    if learners:
+        refresh_user_stats(db, learners)
     db.commit()
+    verb_catalog.rebuild(db)
     return True
 
-def search_verbs(db: Session, query: str, limit: int = 20) -> List[models.Verb]:
-    search_term = f"%{query}%"
-    return (
-        db.query(models.Verb)
-        .filter(
-            models.Verb.infinitive.ilike(search_term) |
-            models.Verb.past.ilike(search_term) |
-            models.Verb.participle.ilike(search_term) |
-            models.Verb.translation.ilike(search_term)
-        )
-        .order_by(models.Verb.infinitive.asc())
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _search_clauses(db: Session, query: str):
+    """(where, rank) for a ranked, accent-insensitive search; ``None`` for a blank query.
+
+    On Postgres the LIKE filters match the trigram GIN indexes created by
+    migration 2 (``lower(form)`` and ``f_unaccent(lower(translation))``).
+    The rank mirrors ``app.textsearch``: exact term, prefix, substring,
+    where "/" separates alternatives inside a field.
+    """
+    needle = _like_escape(fold(query).strip())
+    if not needle:
+        return None
+    translation = func.lower(models.Verb.translation)
+    if db.get_bind().dialect.name == "postgresql":
+        translation = func.f_unaccent(translation, type_=String)
+    fields = [
+        func.lower(models.Verb.infinitive),
+        func.lower(models.Verb.past),
+        func.lower(models.Verb.participle),
+        translation,
+    ]
+    where = or_(*(f.like(f"%{needle}%", escape="\\") for f in fields))
+    exact = or_(*((literal("/") + f + "/").like(f"%/{needle}/%", escape="\\") for f in fields))
+    prefix = or_(*((literal("/") + f).like(f"%/{needle}%", escape="\\") for f in fields))
+    rank = case((exact, RANK_EXACT), (prefix, RANK_PREFIX), else_=RANK_SUBSTRING)
+    return where, rank
+
+def search_verb_rows(db: Session, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Ranked, accent-insensitive search as plain dicts shaped like ``VerbOut``."""
+    clauses = _search_clauses(db, query)
+    if clauses is None:
+        return []
+    where, rank = clauses
+    stmt = (
+        select(*schema_columns(VerbOut, models.Verb))
+        .where(where)
+        .order_by(rank, models.Verb.infinitive.asc())
         .limit(limit)
-        .all()
     )
+    return fetch_rows(db, stmt)
 
-def get_verb_stats(db: Session) -> Dict[str, Any]:
-    total_verbs = db.query(func.count(models.Verb.id)).scalar() or 0
-    
-    letter_counts = {}
-    verbs = db.query(models.Verb).all()
-    for verb in verbs:
-        first_letter = verb.infinitive[0].upper() if verb.infinitive else "?"
-        letter_counts[first_letter] = letter_counts.get(first_letter, 0) + 1
-    
-    avg_length = db.query(func.avg(func.length(models.Verb.infinitive))).scalar() or 0
-    
+# Keyed by the verbs table version, so an entry never goes stale; the TTL only bounds memory
+verb_stats_cache = TTLCache(maxsize=4, ttl=86_400, name="verb_stats")
+
+def _aggregate_verb_stats(db: Session) -> Dict[str, Any]:
+    letter = func.upper(func.substr(models.Verb.infinitive, 1, 1))
+    rows = db.execute(
+        select(letter, func.count(), func.sum(func.length(models.Verb.infinitive)))
+        .group_by(letter)
+    ).all()
+
+    total_verbs = sum(count for _, count, _ in rows)
+    total_length = sum(length or 0 for _, _, length in rows)
     return {
         "total_verbs": total_verbs,
-        "average_infinitive_length": round(avg_length, 1),
-        "verbs_by_letter": dict(sorted(letter_counts.items())),
+        "average_infinitive_length": round(total_length / total_verbs, 1) if total_verbs else 0,
+        "verbs_by_letter": dict(sorted((first or "?", count) for first, count, _ in rows)),
         "last_updated": datetime.utcnow().isoformat(),
     }
 
+def get_verb_stats(db: Session, version: int | None = None) -> Dict[str, Any]:
+    """Verb counts by first letter, from one GROUP BY query cached per verbs table version.
+
+    Pass ``version`` when the caller already read it (e.g. for an ETag);
+    otherwise it costs one ``table_versions`` lookup.
+    """
+    if version is None:
+        version = read_table_versions(db, ("verbs",))["verbs"]
+    stats = verb_stats_cache.get(version)
+    if stats is None:
+        stats = _aggregate_verb_stats(db)
+        verb_stats_cache.set(version, stats)
+    return stats
+
+VERB_FIELDS = ("infinitive", "past", "participle", "translation", "example_b2")
+
+class VerbImport:
+    """Set-based bulk import of verbs.
+
+    Existing infinitives are loaded in one query; rows are validated and
+    de-duplicated in Python and inserted ``batch_size`` at a time with a
+    multi-row ``INSERT ... ON CONFLICT DO NOTHING`` (a row that a concurrent
+    writer inserted first is counted as skipped). Feed rows with ``add`` as
+    they are parsed, then call ``finish`` to commit. Everything is one
+    transaction: ``abort`` discards the whole import.
+    """
+
+    def __init__(self, db: Session, batch_size: int = 1000) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.seen = set(db.scalars(select(models.Verb.infinitive)))
+        self.pending: List[Dict[str, str]] = []
+        self.inserted = 0
+        self.skipped = 0
+        self.invalid = 0
+
+    def add(self, row: Any) -> None:
+        if not isinstance(row, dict):
+            self.invalid += 1
+            return
+        values = {}
+        for field in VERB_FIELDS:
+            value = row.get(field)
+            if not isinstance(value, str) or not value.strip():
+                self.invalid += 1
+                return
+            values[field] = value.strip()
+        if values["infinitive"] in self.seen:
+            self.skipped += 1
+            return
+        self.seen.add(values["infinitive"])
+        self.pending.append(values)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        now = datetime.utcnow()
+        rows = [dict(values, created_at=now) for values in self.pending]
+        # executemany + RETURNING: SQLAlchemy batches it into multi-row VALUES
+        # ("insertmanyvalues") with a cached statement; the ids count the rows
+        # that did not hit the conflict
+        stmt = insert_ignoring_conflicts(self.db, models.Verb.__table__).returning(models.Verb.id)
+        inserted = len(self.db.execute(stmt, rows).all())
+        self.inserted += inserted
+        self.skipped += len(rows) - inserted
+        self.pending = []
+
+    def finish(self) -> Dict[str, int]:
+        try:
+            self.flush()
+            if self.inserted:
+                # Core inserts bypass the ORM flush listener
+                bump_table_versions(self.db.connection(), ["verbs"])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        if self.inserted:
+            verb_catalog.rebuild(self.db)
+        return self.report()
+
+    def abort(self) -> None:
+        self.db.rollback()
+
+    def report(self) -> Dict[str, int]:
+        return {"inserted": self.inserted, "skipped": self.skipped, "invalid": self.invalid}
+
 def bulk_create_verbs(db: Session, verbs_data: List[Dict[str, str]]) -> int:
-    created = 0
+    importer = VerbImport(db)
     try:
         for verb_data in verbs_data:
-            existing = get_verb_by_infinitive(db, verb_data["infinitive"])
-            if not existing:
-                verb = models.Verb(
-                    infinitive=verb_data["infinitive"].strip(),
-                    past=verb_data["past"].strip(),
-                    participle=verb_data["participle"].strip(),
-                    translation=verb_data["translation"].strip(),
-                    example_b2=verb_data["example_b2"].strip(),
-                )
-                db.add(verb)
-                created += 1
-        
-        db.commit()
-        return created
-    except Exception as e:
-        db.rollback()
-        raise
\ No newline at end of file
+            importer.add(verb_data)
+    except Exception:
+        importer.abort()
+        raise
+    return importer.finish()["inserted"]
\ No newline at end of file
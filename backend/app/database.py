@@ -12,15 +12,34 @@ run the application【395836646368524†L320-L333】.
 
 from __future__ import annotations
 
+import logging
+
+import anyio.to_thread
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from app.metrics import (
+    InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine, instrument_threadpool,
+)
 from app.settings import get_settings
 
 
+logger = logging.getLogger(__name__)
+
 # Retrieve configuration from settings
 _settings = get_settings()
 
+# AnyIO's own default when nothing is configured
+ANYIO_DEFAULT_THREADS = 40
+
+_pool_kwargs = {
+    "pool_size": _settings.DB_POOL_SIZE,
+    "max_overflow": _settings.DB_MAX_OVERFLOW,
+    "pool_timeout": _settings.DB_POOL_TIMEOUT,
+    "pool_recycle": _settings.DB_POOL_RECYCLE,
+}
+
 if not _settings.DATABASE_URL:
     raise RuntimeError(
         "DATABASE_URL environment variable must be set (e.g. postgresql+psycopg2://user:pass@db:5432/dbname)"
@@ -29,11 +48,12 @@ if not _settings.DATABASE_URL:
 # Create SQLAlchemy engine
 engine = create_engine(
     _settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,
-    pool_size=20,
-    max_overflow=30,
     echo=False,  # Set to True for SQL debugging
+    **_pool_kwargs,
 )
+instrument_engine(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(
@@ -60,6 +80,98 @@ def get_db():
         db.close()
 
 
+# Async drivers used when DATABASE_ASYNC is on and no ASYNC_DATABASE_URL is given
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url() -> str:
+    """``ASYNC_DATABASE_URL`` or ``DATABASE_URL`` with its driver swapped for an async one."""
+    if _settings.ASYNC_DATABASE_URL:
+        return _settings.ASYNC_DATABASE_URL
+    url = make_url(_settings.DATABASE_URL)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver known for {url.get_backend_name()!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Optional async engine (asyncpg). Only built when DATABASE_ASYNC is on so the
+# async driver stays an optional dependency.
+async_engine = None
+AsyncSessionLocal = None
+
+if _settings.DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _async_url = async_database_url()
+    # aiosqlite (local runs) does not take a sized pool
+    _async_pool_kwargs = (
+        {} if make_url(_async_url).get_backend_name() == "sqlite"
+        else {"poolclass": InstrumentedAsyncQueuePool, **_pool_kwargs}
+    )
+    async_engine = create_async_engine(
+        _async_url,
+        pool_pre_ping=True,
+        echo=False,
+        **_async_pool_kwargs,
+    )
+    instrument_engine(async_engine.sync_engine, name="async")
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def get_async_db():
+    """Async counterpart of ``get_db`` yielding an ``AsyncSession``."""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("DATABASE_ASYNC is disabled; use get_db instead")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_capacity() -> int:
+    """Most connections the sync engine can hold at once."""
+    return _settings.DB_POOL_SIZE + _settings.DB_MAX_OVERFLOW
+
+
+def threadpool_size() -> int:
+    """Worker threads to give the AnyIO threadpool, per the settings."""
+    if _settings.THREADPOOL_SIZE:
+        return _settings.THREADPOOL_SIZE
+    if _settings.DB_POOL_AUTO_ALIGN:
+        return pool_capacity()
+    return ANYIO_DEFAULT_THREADS
+
+
+def configure_threadpool() -> int:
+    """Size the AnyIO threadpool and warn when it disagrees with the pool.
+
+    Must run inside the event loop (a startup handler). Each sync route
+    holds at most one connection, so more threads than connections means
+    threads queue on the pool, and fewer means connections sit idle.
+    """
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = threadpool_size()
+    instrument_threadpool(limiter)
+
+    capacity = pool_capacity()
+    if limiter.total_tokens > capacity:
+        logger.warning(
+            "db.pool_alignment: threadpool=%d > pool capacity=%d (pool_size=%d + max_overflow=%d); "
+            "threads will wait for connections",
+            limiter.total_tokens, capacity, _settings.DB_POOL_SIZE, _settings.DB_MAX_OVERFLOW,
+        )
+    elif limiter.total_tokens < capacity:
+        logger.warning(
+            "db.pool_alignment: threadpool=%d < pool capacity=%d (pool_size=%d + max_overflow=%d); "
+            "connections beyond the thread count will stay idle",
+            limiter.total_tokens, capacity, _settings.DB_POOL_SIZE, _settings.DB_MAX_OVERFLOW,
+        )
+    return limiter.total_tokens
+
+
 def create_tables():
     """Create all tables based on the models metadata.
 
@@ -0,0 +1,131 @@
+"""
+app/etag.py
+---------------
+
+Strong ETags and ``304 Not Modified`` for the catalog endpoints.
+
+Every catalog table has a row in ``table_versions``. A ``before_flush``
+listener on ``Session`` bumps the counter of each tracked table that the
+flush inserts into, updates or deletes from, inside the same transaction.
+Every ORM write is covered, including the CRUD create/update/delete
+functions, the admin routes and the seed script. Core bulk statements that
+bypass the ORM have to call ``bump_table_versions`` themselves.
+
+A response's ETag hashes the request path, the query string and the
+versions of the tables it reads. Checking ``If-None-Match`` therefore costs
+one primary-key read of ``table_versions``, and a match returns ``304``
+without loading or serializing the payload. Routes list every table their
+rows depend on, including parents whose ORM delete cascades to them (those
+cascades run inside the flush, after the listener)::
+
+    @app.get("/tenses")
+    def list_tenses_route(response: Response, cache: Conditional = Depends(conditional("tenses")), ...):
+        if cache.not_modified:
+            return cache.not_modified_response()
+        cache.apply(response)
+        ...
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from itertools import chain
+from typing import Callable, Dict, Iterable, Optional
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import TableVersion
+
+# Tables whose writes change what the catalog endpoints return.
+TRACKED_TABLES = frozenset({"verbs", "tenses", "tense_examples", "activities", "activity_questions"})
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def bump_table_versions(conn: Connection, names: Iterable[str]) -> None:
+    names = sorted(set(names))
+    if not names:
+        return
+    result = conn.execute(
+        update(TableVersion)
+        .where(TableVersion.name.in_(names))
+        .values(version=TableVersion.version + 1)
+    )
+    if result.rowcount < len(names):
+        existing = set(conn.execute(select(TableVersion.name).where(TableVersion.name.in_(names))).scalars())
+        missing = [name for name in names if name not in existing]
+        conn.execute(insert(TableVersion), [{"name": name, "version": 1} for name in missing])
+
+
+def read_table_versions(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """Current version of each table (0 when it has never been stamped)."""
+    names = tuple(names)
+    found = dict(db.execute(
+        select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names))
+    ).all())
+    return {name: found.get(name, 0) for name in names}
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_on_flush(session: Session, flush_context, instances) -> None:
+    touched = set()
+    for obj in chain(session.new, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in TRACKED_TABLES:
+            touched.add(table)
+    for obj in session.dirty:
+        table = getattr(obj, "__tablename__", None)
+        if table in TRACKED_TABLES and table not in touched and session.is_modified(obj, include_collections=False):
+            touched.add(table)
+    if touched:
+        bump_table_versions(session.connection(), touched)
+
+
+def make_etag(request: Request, versions: Dict[str, int]) -> str:
+    stamp = ",".join(f"{name}:{version}" for name, version in sorted(versions.items()))
+    digest = hashlib.sha1(f"{request.url.path}?{request.url.query}|{stamp}".encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # Weak comparison, as If-None-Match requires (RFC 9110 13.1.2)
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+@dataclass(frozen=True)
+class Conditional:
+    etag: str
+    versions: Dict[str, int]
+    not_modified: bool
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers)
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+
+def conditional(*tables: str) -> Callable[..., Conditional]:
+    """Dependency: ETag for the current request over ``tables``, and whether the client has it."""
+    unknown = set(tables) - TRACKED_TABLES
+    if unknown:
+        raise ValueError(f"Tables without version stamps: {sorted(unknown)}")
+
+    def dependency(request: Request, db: Session = Depends(get_db)) -> Conditional:
+        versions = read_table_versions(db, tables)
+        etag = make_etag(request, versions)
+        return Conditional(etag, versions, etag_matches(request.headers.get("if-none-match"), etag))
+
+    return dependency
@@ -0,0 +1,186 @@
+"""
+app/grading.py
+---------------
+
+Typo-tolerant grading of free-text verb answers.
+
+``FormIndex`` is built with every verb catalog snapshot. It holds:
+
+* the accepted answers of every verb and form (``"learnt/learned"`` accepts
+  both; the first one is the canonical answer),
+* a reverse index from every folded form back to the ``(verb_id, form)``
+  pairs that use it, so "went" given for the participle of *go* is
+  recognised as its past form,
+* the alphabet of all forms. An answer is looked up through its one-edit
+  neighbours in the reverse index. Unlike a BK-tree this needs no build
+  step beyond the reverse index itself, and a lookup costs a few hundred
+  hash probes whatever the lexicon size.
+
+``grade`` classifies an answer as one of:
+
+* ``correct``: the canonical form.
+* ``alternative``: another accepted form, such as "learned" for "learnt".
+* ``near_miss``: within a small edit distance of an accepted form, and
+  not itself a real form. The closest accepted form is the suggestion.
+* ``incorrect``: none of the above. ``recognized_as`` says which verb form
+  the answer is, if any, allowing for one typo.
+
+Answers are folded (lower case, accents stripped, whitespace collapsed)
+before comparison.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.textsearch import fold, split_terms
+
+GRADED_FORMS = ("infinitive", "past", "participle")
+
+CORRECT, ALTERNATIVE, NEAR_MISS, INCORRECT = "correct", "alternative", "near_miss", "incorrect"
+
+FormRef = Tuple[int, str]  # (verb_id, form)
+
+
+def normalize_answer(answer: str) -> str:
+    return " ".join(fold(answer).split())
+
+
+def max_typos(word: str) -> int:
+    """Edit distance still counted as a typo: 1 up to 4 letters, then 2."""
+    return 1 if len(word) <= 4 else 2
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """Levenshtein distance counting an adjacent transposition as one edit
+    ("brougth" -> "brought"); stops early once it exceeds ``limit``."""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    before: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def edits1(word: str, alphabet: str) -> Iterable[str]:
+    """Every string one deletion, transposition, substitution or insertion away from ``word``."""
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    for left, right in splits:
+        if right:
+            yield left + right[1:]
+            if len(right) > 1:
+                yield left + right[1] + right[0] + right[2:]
+            for ch in alphabet:
+                yield left + ch + right[1:]
+        for ch in alphabet:
+            yield left + ch + right
+
+
+@dataclass(frozen=True)
+class Grade:
+    verb_id: int
+    form: str
+    answer: str
+    result: str
+    expected: str
+    suggestion: Optional[str] = None
+    recognized_as: Optional[Dict[str, object]] = None
+
+    @property
+    def is_correct(self) -> bool:
+        return self.result in (CORRECT, ALTERNATIVE)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "verb_id": self.verb_id,
+            "form": self.form,
+            "answer": self.answer,
+            "result": self.result,
+            "is_correct": self.is_correct,
+            "expected": self.expected,
+            "suggestion": self.suggestion,
+            "recognized_as": self.recognized_as,
+        }
+
+
+class FormIndex:
+    """Accepted answers, reverse form index and alphabet for one catalog snapshot."""
+
+    def __init__(self, rows: Iterable[Mapping[str, object]]) -> None:
+        self.accepted: Dict[int, Dict[str, Tuple[str, ...]]] = {}
+        self.canonical: Dict[int, Dict[str, str]] = {}
+        reverse: Dict[str, List[FormRef]] = {}
+        for row in rows:
+            verb_id = row["id"]
+            self.accepted[verb_id] = {}
+            self.canonical[verb_id] = {}
+            for form in GRADED_FORMS:
+                raw = str(row[form] or "")
+                terms = split_terms(raw)
+                self.accepted[verb_id][form] = terms
+                self.canonical[verb_id][form] = raw.split("/")[0].strip()
+                for term in terms:
+                    reverse.setdefault(term, []).append((verb_id, form))
+        self.reverse: Dict[str, Tuple[FormRef, ...]] = {term: tuple(refs) for term, refs in reverse.items()}
+        self.alphabet = "".join(sorted({ch for term in self.reverse for ch in term}))
+
+    def recognize(self, answer: str) -> Optional[Tuple[str, FormRef]]:
+        """The form ``answer`` spells, exactly or one edit away: ``(form text, ref)``."""
+        refs = self.reverse.get(answer)
+        if refs is not None:
+            return answer, refs[0]
+        if answer:
+            for candidate in edits1(answer, self.alphabet):
+                refs = self.reverse.get(candidate)
+                if refs is not None:
+                    return candidate, refs[0]
+        return None
+
+    def grade(self, verb_id: int, form: str, answer: str) -> Optional[Grade]:
+        """Classify ``answer`` for ``form`` of ``verb_id``; ``None`` for an unknown verb."""
+        accepted = self.accepted.get(verb_id, {}).get(form)
+        if accepted is None:
+            return None
+        expected = self.canonical[verb_id][form]
+        given = normalize_answer(answer)
+
+        def build(result: str, suggestion: Optional[str] = None, recognized=None) -> Grade:
+            return Grade(verb_id, form, answer, result, expected, suggestion, recognized)
+
+        if accepted and given == accepted[0]:
+            return build(CORRECT)
+        if given in accepted:
+            return build(ALTERNATIVE)
+
+        exact_refs = self.reverse.get(given)
+        if exact_refs is None:
+            best = min(
+                ((edit_distance(given, term, max_typos(term)), term) for term in accepted),
+                default=None,
+            )
+            if best is not None and best[0] <= max_typos(best[1]):
+                return build(NEAR_MISS, suggestion=best[1])
+
+        recognized = self.recognize(given)
+        if recognized is None:
+            return build(INCORRECT)
+        text, (other_id, other_form) = recognized
+        return build(
+            INCORRECT,
+            suggestion=expected,
+            recognized={"verb_id": other_id, "form": other_form, "text": text},
+        )
@@ -0,0 +1,125 @@
+"""
+app/importers.py
+---------------
+
+Incremental parsers for bulk uploads (``POST /verbs/import``).
+
+The request body is parsed as it arrives, and each chunk of complete
+records is handed to the importer, so a large CSV or NDJSON upload is
+never held in memory as a whole. The formats, picked by ``Content-Type``:
+
+* ``text/csv``: a header row naming the columns, then one record per row.
+  Quoted fields may contain commas and newlines.
+* ``application/x-ndjson`` (or ``application/jsonl``): one JSON object per
+  line.
+* ``application/json``: a single JSON array of objects. A JSON array cannot
+  be split safely without a streaming JSON parser, so this format is read
+  whole.
+
+A record that cannot be parsed comes out as ``None`` so the importer can
+count it as invalid. A body that cannot be parsed at all raises ``400``.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+CSV_TYPES = ("text/csv", "application/csv")
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+JSON_TYPES = ("application/json",)
+
+
+class _CsvRecords:
+    def __init__(self) -> None:
+        self.header: Optional[List[str]] = None
+        # Characters at the head of the buffer already scanned, and the quote state after them
+        self._scanned = 0
+        self._in_quotes = False
+
+    def split_complete(self, text: str) -> Tuple[str, str]:
+        """Split ``text`` after the last newline that is not inside a quoted field.
+
+        ``text`` is the previous remainder plus new data; only the new data
+        is scanned.
+        """
+        in_quotes = self._in_quotes
+        end = 0
+        for i in range(self._scanned, len(text)):
+            ch = text[i]
+            if ch == '"':
+                in_quotes = not in_quotes
+            elif ch == "\n" and not in_quotes:
+                end = i + 1
+        self._scanned = len(text) - end
+        self._in_quotes = in_quotes
+        return text[:end], text[end:]
+
+    def parse(self, text: str) -> List[Optional[dict]]:
+        records: List[Optional[dict]] = []
+        for row in csv.reader(io.StringIO(text)):
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            if self.header is None:
+                self.header = [cell.strip() for cell in row]
+                continue
+            records.append(dict(zip(self.header, row)) if len(row) == len(self.header) else None)
+        return records
+
+
+def _parse_json_line(line: str) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def media_type(content_type: Optional[str]) -> str:
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+async def iter_record_batches(chunks: AsyncIterator[bytes], content_type: Optional[str]) -> AsyncIterator[List[Any]]:
+    """Yield lists of parsed records as complete records arrive in ``chunks``."""
+    kind = media_type(content_type)
+    if kind not in CSV_TYPES + NDJSON_TYPES + JSON_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use text/csv, application/x-ndjson or application/json",
+        )
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    if kind in JSON_TYPES:
+        body = "".join([decoder.decode(chunk) async for chunk in chunks]) + decoder.decode(b"", final=True)
+        try:
+            records = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body is not valid JSON")
+        if not isinstance(records, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array")
+        yield records
+        return
+
+    csv_records = _CsvRecords()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        if kind in CSV_TYPES:
+            complete, buffer = csv_records.split_complete(buffer)
+            batch = csv_records.parse(complete)
+        else:
+            *lines, buffer = buffer.split("\n")
+            batch = [_parse_json_line(line) for line in lines if line.strip()]
+        if batch:
+            yield batch
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer.strip():
+        if kind in CSV_TYPES:
+            yield csv_records.parse(buffer)
+        else:
+            yield [_parse_json_line(buffer)]
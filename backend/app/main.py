@@ -6,28 +6,48 @@ Entry point for the FastAPI application.
 """
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+# Imported first: the timer's creation starts the "imports" phase
+from app.startup import startup_timer
+
+from datetime import datetime, timezone
+from importlib import import_module
 from typing import List, Optional, Any, Dict
 import os
 import json
 
-from fastapi import Depends, FastAPI, HTTPException, status, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.exceptions import RequestValidationError
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy import text
 
 from app import models
-from app.database import get_db
+from app.database import async_engine, configure_threadpool, get_db
 from app.settings import get_settings
+from app.auth import (
+    Principal, create_access_token, get_current_principal, get_current_user,
+    token_versions,
+)
 from app.errors import http_exception_handler, validation_exception_handler
+from app.etag import Conditional, conditional
+from app.metrics import (
+    MetricsMiddleware, collector_from_latency_stats, collector_from_stats, registry,
+)
+from app.catalog import verb_catalog
+from app.importers import iter_record_batches
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.password_pool import password_pool
+from app.serialization import FastJSONResponse
 from app.schemas import (
     # Auth
     Token, UserCreate, UserOut,
     # Verb
-    VerbOut, VerbCreate, VerbUpdate,
+    VerbOut, VerbCreate, VerbUpdate, VerbImportReport, VerbStatsOut,
+    VerbGradeIn, VerbGradeOut,
     # Tense
     TenseOut, TenseCreate, ExampleOut, ExampleCreate,
     # Activity
@@ -36,72 +56,34 @@ from app.schemas import (
     # Focus
     FocusResultsIn, FocusResultsOut,
     # Progress
-    ProgressUpdateIn, UserProgressUpdate, UserProgressOut
+    ProgressUpdateIn, UserProgressOut, ProgressBatchIn, ProgressBatchOut,
+    ProgressForecastOut
 )
-# Lazy import for router to avoid circular deps if needed, but standard is top level.
-# However, we only need it if flagged. 
-
 from app.crud import (
     # Auth
-    authenticate_user, register_user, get_user_by_username,
+    authenticate_user_async, register_user_async, principal_cache,
     # User
     get_user, update_user_xp, get_user_stats,
     # Verb
-    get_verbs, get_verb, create_verb, update_verb, delete_verb, search_verbs,
+    create_verb, update_verb, delete_verb, search_verb_rows, VerbImport,
+    get_verb_stats, verb_stats_cache,
     # Tense
     list_tenses, create_tense, add_tense_example, list_examples_by_tense,
     # Activity / Attempts
-    list_activities, create_activity, add_activity_question,
+    list_activity_rows, create_activity, add_activity_question,
     get_activity, list_questions_by_activity, start_attempt, submit_answer,
     # Progress / Practice
     select_verbs_for_practice, update_user_progress,
-    get_user_progress, initialize_user_progress, list_user_progress
+    get_user_progress, initialize_user_progress,
+    list_user_progress_rows, apply_progress_batch,
+    get_progress_forecast, progress_forecast_cache, FORECAST_MAX_DAYS
 )
 
 # -------------------------------------------------------------------
-# Settings / JWT
+# Settings
 # -------------------------------------------------------------------
 _settings = get_settings()
 
-SECRET_KEY: str = _settings.SECRET_KEY
-ALGORITHM: str = _settings.ALGORITHM
-ACCESS_TOKEN_EXPIRE_MINUTES: int = _settings.ACCESS_TOKEN_EXPIRE_MINUTES
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
-
-def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-
-
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> models.User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str | None = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    user = get_user_by_username(db, username=username)
-    if user is None:
-        raise credentials_exception
-    return user
-
-
 # -------------------------------------------------------------------
 # App
 # -------------------------------------------------------------------
@@ -114,12 +96,48 @@ app = FastAPI(
 # -------------------------------------------------------------------
 # Startup: Crear tablas automáticamente
 # -------------------------------------------------------------------
+@app.on_event("startup")
+async def on_startup_threadpool():
+    """Size the worker threadpool against the DB connection pool."""
+    configure_threadpool()
+
+
 @app.on_event("startup")
 def on_startup():
-    """Ensure database tables exist before handling requests."""
-    from app.database import create_tables
-    create_tables()
-    print("✅ Database tables verified/created")
+    """Dev: create missing tables. Production: only verify the schema version."""
+    from app.migrations import check_schema, upgrade
+
+    # Module imports, engine creation and route registration all ran before this handler
+    startup_timer.mark("imports")
+    if _settings.STARTUP_MODE == "production":
+        with startup_timer.phase("first_query"):
+            version = check_schema()
+        print(f"✅ Database schema version {version} verified")
+    else:
+        from app.database import SessionLocal, create_tables
+        with startup_timer.phase("first_query"), SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+        with startup_timer.phase("create_all"):
+            create_tables()
+            upgrade()
+        print("✅ Database tables verified/created")
+
+    from app.database import SessionLocal
+    with startup_timer.phase("verb_catalog"), SessionLocal() as db:
+        catalog = verb_catalog.rebuild(db)
+    print(
+        f"✅ Verb catalog v{catalog.version}: {len(catalog)} verbs, "
+        f"~{catalog.approx_bytes / 1024:.0f} KiB, built in {catalog.build_seconds * 1000:.1f} ms"
+    )
+    print(startup_timer.report())
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Stop the bcrypt worker processes and close async DB connections."""
+    password_pool.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # Structured error responses
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -140,12 +158,18 @@ except Exception:
 if not cors_origins:
     cors_origins = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
+app.add_middleware(
+    MetricsMiddleware,
+    query_debug=_settings.QUERY_DEBUG,
+    repeat_threshold=_settings.QUERY_REPEAT_WARN_THRESHOLD,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 _started_at = datetime.now(timezone.utc)
@@ -172,31 +196,68 @@ def ready(db: Session = Depends(get_db)):
         raise HTTPException(status_code=503, detail="Database not ready")
 
 
-@app.get("/metrics", tags=["Health"])
+registry.gauge(
+    "uptime_seconds", "Seconds since the API process started.",
+    callback=lambda: int((datetime.now(timezone.utc) - _started_at).total_seconds()),
+)
+registry.add_collector(collector_from_stats(
+    "principal_cache", "Principal cache", principal_cache.stats,
+))
+registry.add_collector(collector_from_stats(
+    "password_pool", "bcrypt worker pool", password_pool.stats,
+))
+registry.add_collector(collector_from_stats(
+    "verb_stats_cache", "Verb stats cache", verb_stats_cache.stats,
+))
+registry.add_collector(collector_from_stats(
+    "progress_forecast_cache", "Progress forecast cache", progress_forecast_cache.stats,
+))
+registry.add_collector(collector_from_stats(
+    "verb_catalog", "In-memory verb catalog", verb_catalog.stats,
+))
+registry.add_collector(startup_timer.collect)
+registry.add_collector(collector_from_latency_stats(
+    "password_pool_latency_seconds", "bcrypt job latency including queue wait.",
+    password_pool.stats, ("hash", "verify"), "op",
+))
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
 def metrics():
-    uptime_seconds = int((datetime.now(timezone.utc) - _started_at).total_seconds())
-    return {"uptime_seconds": uptime_seconds}
+    """Prometheus text exposition of request, database and cache metrics."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 
 # -------------------------------------------------------------------
 # AUTH
 # -------------------------------------------------------------------
 @app.post("/token", response_model=Token, tags=["Authentication"])
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Incorrect username or password")
 
-    access_token = create_access_token(data={"sub": user.username})
+    access_token = create_access_token(data={"sub": user.username}, user_id=user.id)
     return {"access_token": access_token, "token_type": "bearer", "user": user}
 
 
+@app.post("/token/revoke", tags=["Authentication"])
+def revoke_tokens(current_user: Principal = Depends(get_current_principal)):
+    """Reject every stateless-claims token issued so far for the caller.
+
+    The token version is kept in process memory: the revocation applies to
+    the worker that handled this request and is forgotten on restart.
+    """
+    version = token_versions.revoke(current_user.id)
+    return {"token_version": version, "scope": "worker"}
+
+
 @app.post("/register", response_model=UserOut, tags=["Authentication"])
-def register(payload: UserCreate, db: Session = Depends(get_db)):
-    return register_user(db, payload.username, payload.email, payload.password)
+async def register(payload: UserCreate, db: Session = Depends(get_db)):
+    return await register_user_async(db, payload.username, payload.email, payload.password)
 
 
 @app.get("/me", response_model=UserOut, tags=["Authentication"])
@@ -207,16 +268,19 @@ def me(current_user: models.User = Depends(get_current_user)):
 # -------------------------------------------------------------------
 # USERS
 # -------------------------------------------------------------------
-# Feature Flagged Routers
-if _settings.FEATURE_CONTENT_API_V1:
-    from app.routers import content
-    app.include_router(content.router)
-    print("✅ Content API mounted (Feature Flag ON)")
+# Feature Flagged Routers: (flag, module, message). The same flag-gated
+# imports as one if-block per router, driven from a table.
+_OPTIONAL_ROUTERS = (
+    ("FEATURE_CONTENT_API_V1", "app.routers.content",
+     "✅ Content API mounted (Feature Flag ON)"),
+    ("FEATURE_CONTENT_ADMIN_WRITE_V1", "app.routers.admin_content",
+     "✅ Admin Content Write API mounted (Feature Flag ON)"),
+)
 
-if _settings.FEATURE_CONTENT_ADMIN_WRITE_V1:
-    from app.routers import admin_content
-    app.include_router(admin_content.router)
-    print("✅ Admin Content Write API mounted (Feature Flag ON)")
+for _flag, _module, _message in _OPTIONAL_ROUTERS:
+    if getattr(_settings, _flag):
+        app.include_router(import_module(_module).router)
+        print(_message)
 
 
 @app.get("/users/{user_id}", response_model=UserOut, tags=["Users"])
@@ -260,10 +324,21 @@ def stats(
 def list_all_verbs(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} of the previous page (replaces skip)"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    cache: Conditional = Depends(conditional("verbs")),
 ):
-    return get_verbs(db, skip=skip, limit=limit)
+    if cache.not_modified:
+        return cache.not_modified_response()
+    after = decode_cursor("verbs", cursor, 2) if cursor else None
+    body, last_key = verb_catalog.page(
+        db, skip=skip, limit=limit, after=after, source_version=cache.versions["verbs"]
+    )
+    headers = dict(cache.headers)
+    if last_key:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor("verbs", *last_key)
+    return FastJSONResponse(body, headers=headers)
 
 
 @app.get("/verbs/search", response_model=List[VerbOut], tags=["Verbs"])
@@ -273,7 +348,20 @@ def search_verbs_route(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    return search_verbs(db, q, limit)
+    if _settings.VERB_SEARCH_MODE == "trigram":
+        return FastJSONResponse(search_verb_rows(db, q, limit))
+    return FastJSONResponse(verb_catalog.search(db, q, limit))
+
+
+@app.get("/verbs/stats", response_model=VerbStatsOut, tags=["Verbs"])
+def verb_stats_route(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+    cache: Conditional = Depends(conditional("verbs")),
+):
+    if cache.not_modified:
+        return cache.not_modified_response()
+    return FastJSONResponse(get_verb_stats(db, cache.versions["verbs"]), headers=cache.headers)
 
 
 @app.get("/verbs/{verb_id}", response_model=VerbOut, tags=["Verbs"])
@@ -282,10 +370,23 @@ def read_verb(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    verb = get_verb(db, verb_id)
-    if not verb:
+    verb = verb_catalog.get(db, verb_id)
+    if verb is None:
         raise HTTPException(status_code=404, detail="Verb not found")
-    return verb
+    return FastJSONResponse(verb)
+
+
+@app.post("/verbs/{verb_id}/grade", response_model=VerbGradeOut, tags=["Verbs"])
+def grade_verb_answer(
+    verb_id: int,
+    payload: VerbGradeIn,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    grade = verb_catalog.grade(db, verb_id, payload.form, payload.answer)
+    if grade is None:
+        raise HTTPException(status_code=404, detail="Verb not found")
+    return FastJSONResponse(grade.as_dict())
 
 
 @app.post("/verbs", response_model=VerbOut, tags=["Verbs"])
@@ -297,6 +398,29 @@ def create_verb_route(
     return create_verb(db, payload)
 
 
+def _import_batch(importer: VerbImport, records: List[Any]) -> None:
+    for record in records:
+        importer.add(record)
+
+
+@app.post("/verbs/import", response_model=VerbImportReport, tags=["Verbs"])
+async def import_verbs_route(
+    request: Request,
+    batch_size: int = Query(1000, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Bulk-load verbs from a streamed CSV, NDJSON or JSON body (see ``app.importers``)."""
+    importer = await run_in_threadpool(VerbImport, db, batch_size)
+    try:
+        async for records in iter_record_batches(request.stream(), request.headers.get("content-type")):
+            await run_in_threadpool(_import_batch, importer, records)
+    except BaseException:
+        await run_in_threadpool(importer.abort)
+        raise
+    return await run_in_threadpool(importer.finish)
+
+
 @app.patch("/verbs/{verb_id}", response_model=VerbOut, tags=["Verbs"])
 def update_verb_route(
     verb_id: int,
@@ -327,9 +451,14 @@ def delete_verb_route(
 # -------------------------------------------------------------------
 @app.get("/tenses", response_model=List[TenseOut], tags=["Tenses"])
 def list_tenses_route(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    cache: Conditional = Depends(conditional("tenses")),
 ):
+    if cache.not_modified:
+        return cache.not_modified_response()
+    cache.apply(response)
     return list_tenses(db)
 
 
@@ -345,9 +474,14 @@ def create_tense_route(
 @app.get("/tenses/{tense_id}/examples", response_model=List[ExampleOut], tags=["Tenses"])
 def list_examples_route(
     tense_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    cache: Conditional = Depends(conditional("tense_examples", "verbs")),
 ):
+    if cache.not_modified:
+        return cache.not_modified_response()
+    cache.apply(response)
     return list_examples_by_tense(db, tense_id)
 
 
@@ -371,10 +505,11 @@ def list_activities_route(
     tense_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    cache: Conditional = Depends(conditional("activities")),
 ):
-    if tense_id is None:
-        return db.query(models.Activity).all()
-    return list_activities(db, tense_id)
+    if cache.not_modified:
+        return cache.not_modified_response()
+    return FastJSONResponse(list_activity_rows(db, tense_id), headers=cache.headers)
 
 
 @app.post("/activities", response_model=ActivityOut, tags=["Activities"])
@@ -401,9 +536,14 @@ def get_activity_route(
 @app.get("/activities/{activity_id}/questions", response_model=List[QuestionOut], tags=["Activities"])
 def list_questions_route(
     activity_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
+    cache: Conditional = Depends(conditional("activity_questions", "activities")),
 ):
+    if cache.not_modified:
+        return cache.not_modified_response()
+    cache.apply(response)
     return list_questions_by_activity(db, activity_id)
 
 
@@ -423,7 +563,7 @@ def add_question_route(
 def start_attempt_route(
     payload: AttemptStartIn,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     attempt = start_attempt(db, current_user.id, payload.activity_id)
     return {"attempt_id": attempt.id, "activity_id": attempt.activity_id}
@@ -433,7 +573,7 @@ def start_attempt_route(
 def submit_answer_route(
     payload: SubmitAnswerIn,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     return submit_answer(
         db,
@@ -452,7 +592,7 @@ def submit_answer_route(
 def select_practice_route(
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     return select_verbs_for_practice(db, current_user.id, limit)
 
@@ -461,11 +601,10 @@ def select_practice_route(
 def update_progress_route(
     payload: ProgressUpdateIn,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    # Check if progress record exists (requires /progress/init first)
-    existing = get_user_progress(db, current_user.id, payload.verb_id)
-    if existing is None:
+    # Eager mode requires /progress/init first; lazy mode creates the row on first update
+    if _settings.PROGRESS_INIT_MODE == "eager" and get_user_progress(db, current_user.id, payload.verb_id) is None:
         raise HTTPException(
             status_code=404,
             detail="Progress not initialized; call POST /progress/init first"
@@ -479,18 +618,39 @@ def update_progress_route(
     )
 
 
+@app.post("/progress/batch", response_model=ProgressBatchOut, tags=["Progress"])
+def batch_progress_route(
+    payload: ProgressBatchIn,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    result = apply_progress_batch(
+        db, current_user.id, payload.answers, create_missing=_settings.PROGRESS_INIT_MODE == "lazy"
+    )
+    return FastJSONResponse(result)
+
+
+@app.get("/progress/forecast", response_model=ProgressForecastOut, tags=["Progress"])
+def progress_forecast_route(
+    days: int = Query(7, ge=1, le=FORECAST_MAX_DAYS),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    return FastJSONResponse(get_progress_forecast(db, current_user.id, days))
+
+
 @app.get("/progress", response_model=List[UserProgressOut], tags=["Progress"])
 def get_progress_route(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    return list_user_progress(db, current_user.id)
+    return FastJSONResponse(list_user_progress_rows(db, current_user.id))
 
 
 @app.post("/progress/init", tags=["Progress"])
 def init_progress_route(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     count = initialize_user_progress(db, current_user.id)
     return {"initialized": count}
@@ -503,7 +663,7 @@ def init_progress_route(
 def record_focus_results(
     payload: FocusResultsIn,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Record Focus Practice session results as events.
@@ -581,3 +741,24 @@ def record_focus_results(
         correct=correct_count,
         total=len(payload.results)
     )
+
+
+# -------------------------------------------------------------------
+# ASYNC DATABASE MODE
+# -------------------------------------------------------------------
+def _use_async_routes(router) -> None:
+    """Replace the sync routes above with the async ones sharing path + method."""
+    replaced = {(route.path, method) for route in router.routes for method in route.methods}
+    app.router.routes = [
+        route for route in app.router.routes
+        if not (
+            isinstance(route, APIRoute)
+            and any((route.path, method) in replaced for method in route.methods)
+        )
+    ]
+    app.include_router(router)
+
+
+if _settings.DATABASE_ASYNC:
+    _use_async_routes(import_module("app.routers.gameplay_async").router)
+    print("✅ Async database routes mounted (DATABASE_ASYNC ON)")
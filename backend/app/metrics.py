@@ -0,0 +1,505 @@
+"""
+app/metrics.py
+---------------
+
+Request and database instrumentation exported in the Prometheus text
+exposition format by ``/metrics``.
+
+The registry is intentionally tiny (counters, gauges and histograms with
+labels) so no client library is needed. ``MetricsMiddleware`` records
+per-route request counts, latency, status codes and in-flight requests;
+``instrument_engine`` hooks SQLAlchemy engine and pool events to count
+statements and DB time per request, pool checkouts, checkout wait and
+connection age. Route labels use the route template (``/verbs/{verb_id}``),
+never the raw path, to keep cardinality bounded.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+# Request latency buckets in seconds
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Statements-per-request buckets
+QUERY_COUNT_BUCKETS: Tuple[float, ...] = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, callback: Optional[Callable[[], float]] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def samples(self) -> List[str]:
+        if self._callback is not None:
+            self.set(float(self._callback()))
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._values[labels] = entry
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        lines = []
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Register a callable returning ready-made exposition lines."""
+        self._collectors.append(collector)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+              callback: Optional[Callable[[], float]] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback=callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by route, method and status code.",
+    ("route", "method", "status"),
+)
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route and method.",
+    ("route", "method"),
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Requests currently being processed, by route.",
+    ("route",),
+)
+DB_QUERIES = registry.counter(
+    "db_queries_total", "SQL statements executed, by route.", ("route",),
+)
+DB_TIME = registry.counter(
+    "db_query_seconds_total", "Time spent executing SQL statements, by route.", ("route",),
+)
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request", "SQL statements executed per request.",
+    ("route",), buckets=QUERY_COUNT_BUCKETS,
+)
+DB_POOL_CHECKOUTS = registry.counter(
+    "db_pool_checkouts_total", "Connections checked out of the SQLAlchemy pool.", ("engine",),
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.",
+    ("engine",), buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CONNECTION_AGE = registry.histogram(
+    "db_pool_connection_age_seconds", "Age of pooled connections when checked out.",
+    ("engine",), buckets=(1, 10, 60, 300, 900, 1800, 3600, 14400, 86400),
+)
+
+
+class _CheckoutWaitMixin:
+    """Records how long callers wait for a connection, labelled by engine.
+
+    The measured time covers waiting for a free slot and, when the pool
+    grows, opening the new connection. Pools that never queue (the
+    ``NullPool`` used with aiosqlite) are not measured.
+    """
+
+    engine_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, self.engine_label)
+
+
+class InstrumentedQueuePool(_CheckoutWaitMixin, QueuePool):
+    """``QueuePool`` of the sync engine with checkout wait recorded."""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutWaitMixin, AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` of the async engine with checkout wait recorded."""
+
+    engine_label = "async"
+
+
+class RequestDbStats:
+    """Mutable per-request counters shared with threadpool workers via contextvars.
+
+    ``statements`` counts each distinct SQL string and is only filled when
+    ``QUERY_DEBUG`` is on; it is what the N+1 detector inspects.
+    """
+
+    __slots__ = ("queries", "db_seconds", "statements")
+
+    def __init__(self, track_statements: bool = False) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: Optional[Dict[str, int]] = {} if track_statements else None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        if self.statements is not None:
+            self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least ``threshold`` times, most frequent first."""
+        if not self.statements or threshold <= 0:
+            return []
+        found = [(sql, n) for sql, n in self.statements.items() if n >= threshold]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+
+_request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+
+def current_request_db_stats() -> Optional[RequestDbStats]:
+    return _request_db_stats.get()
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route request metrics.
+
+    With ``query_debug`` on, responses carry ``X-DB-Queries`` and
+    ``X-DB-Time-Ms`` headers and requests that repeat one statement
+    ``repeat_threshold`` times or more are logged as likely N+1 patterns.
+    """
+
+    def __init__(self, app, query_debug: bool = False, repeat_threshold: int = 0) -> None:
+        self.app = app
+        self.query_debug = query_debug
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDbStats(track_statements=self.query_debug and self.repeat_threshold > 0)
+        token = _request_db_stats.set(stats)
+        status_holder = {"code": 500}
+        started = time.perf_counter()
+        # The route is only known after routing; count in-flight under
+        # "pending" first and re-label once the response starts.
+        in_flight_label = "pending"
+        HTTP_IN_FLIGHT.inc(in_flight_label)
+
+        async def send_wrapper(message):
+            nonlocal in_flight_label
+            if message["type"] == "http.response.start":
+                status_holder["code"] = message["status"]
+                route = _route_label(scope)
+                if in_flight_label != route:
+                    HTTP_IN_FLIGHT.dec(in_flight_label)
+                    HTTP_IN_FLIGHT.inc(route)
+                    in_flight_label = route
+                if self.query_debug:
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"x-db-queries", str(stats.queries).encode()),
+                        (b"x-db-time-ms", f"{stats.db_seconds * 1000:.2f}".encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = _route_label(scope)
+            method = scope.get("method", "")
+            HTTP_IN_FLIGHT.dec(in_flight_label)
+            HTTP_REQUESTS.inc(route, method, str(status_holder["code"]))
+            HTTP_LATENCY.observe(elapsed, route, method)
+            DB_QUERIES_PER_REQUEST.observe(stats.queries, route)
+            if stats.queries:
+                DB_QUERIES.inc(route, amount=stats.queries)
+                DB_TIME.inc(route, amount=stats.db_seconds)
+            for statement, count in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    "db.n_plus_one: route=%s method=%s repeats=%d statement=%s",
+                    route, method, count, " ".join(statement.split())[:200],
+                )
+            _request_db_stats.reset(token)
+
+
+def instrument_engine(engine, name: str = "sync") -> None:
+    """Count statements per request plus pool checkouts and connection age for ``engine``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_failed(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+    @event.listens_for(engine.pool, "connect")
+    def _stamp_connection(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+
+    @event.listens_for(engine.pool, "checkout")
+    def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc(name)
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            DB_POOL_CONNECTION_AGE.observe(time.monotonic() - connected_at, name)
+
+    _instrumented_pools[name] = engine.pool
+
+
+# Pools reported by the db_pool_* gauges, keyed by engine name
+_instrumented_pools: Dict[str, object] = {}
+
+_POOL_GAUGES = (
+    ("db_pool_size", "Configured number of persistent connections.", "size"),
+    ("db_pool_max_overflow", "Configured number of extra connections allowed above the pool size.", "_max_overflow"),
+    ("db_pool_checked_out", "Connections currently checked out.", "checkedout"),
+    ("db_pool_checked_in", "Idle connections held by the pool.", "checkedin"),
+    ("db_pool_overflow", "Overflow connections currently open (negative while the pool is still filling).", "overflow"),
+)
+
+
+def _collect_pools() -> List[str]:
+    lines: List[str] = []
+    for metric, doc, attr in _POOL_GAUGES:
+        samples = []
+        for engine_name, pool in sorted(_instrumented_pools.items()):
+            value = getattr(pool, attr, None)
+            value = value() if callable(value) else value
+            if isinstance(value, (int, float)):
+                samples.append(f'{metric}{{engine="{engine_name}"}} {_format_value(value)}')
+        if samples:
+            lines += [f"# HELP {metric} {doc}", f"# TYPE {metric} gauge"] + samples
+    return lines
+
+
+registry.add_collector(_collect_pools)
+
+
+_threadpool_limiter = None
+
+
+def instrument_threadpool(limiter) -> None:
+    """Export usage of the AnyIO ``CapacityLimiter`` that runs sync routes."""
+    global _threadpool_limiter
+    _threadpool_limiter = limiter
+
+
+def _collect_threadpool() -> List[str]:
+    limiter = _threadpool_limiter
+    if limiter is None:
+        return []
+    stats = limiter.statistics()
+    return [
+        "# HELP threadpool_threads Worker threads available to sync routes.",
+        "# TYPE threadpool_threads gauge",
+        f"threadpool_threads {_format_value(limiter.total_tokens)}",
+        "# HELP threadpool_threads_busy Worker threads currently running a job.",
+        "# TYPE threadpool_threads_busy gauge",
+        f"threadpool_threads_busy {stats.borrowed_tokens}",
+        "# HELP threadpool_tasks_waiting Jobs waiting for a free worker thread.",
+        "# TYPE threadpool_tasks_waiting gauge",
+        f"threadpool_tasks_waiting {stats.tasks_waiting}",
+    ]
+
+
+registry.add_collector(_collect_threadpool)
+
+
+# ``stats()`` keys that only ever grow, exported as ``<prefix>_<key>_total`` counters
+STATS_COUNTER_KEYS = frozenset({"hits", "misses", "evictions", "invalidations", "rejected", "rebuilds"})
+# Configuration echoed by ``stats()``, exported as labels of one ``<prefix>_info`` sample
+STATS_INFO_KEYS = frozenset({"maxsize", "ttl_seconds", "workers", "bcrypt_rounds", "max_pending"})
+
+
+def collector_from_stats(prefix: str, documentation: str, stats: Callable[[], Dict],
+                         counters: Iterable[str] = STATS_COUNTER_KEYS,
+                         info: Iterable[str] = STATS_INFO_KEYS) -> Callable[[], List[str]]:
+    """Expose the numeric top-level entries of a ``stats()`` dict.
+
+    Keys in ``counters`` become ``<prefix>_<key>_total`` counters, keys in
+    ``info`` become labels of a constant ``<prefix>_info`` gauge, and every
+    other numeric entry is a gauge.
+    """
+    counters, info = frozenset(counters), frozenset(info)
+
+    def collect() -> List[str]:
+        lines, labels = [], []
+        for key, value in stats().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key in info:
+                labels.append(f'{key}="{_format_value(value)}"')
+                continue
+            kind = "counter" if key in counters else "gauge"
+            name = f"{prefix}_{key}_total" if kind == "counter" else f"{prefix}_{key}"
+            lines.append(f"# HELP {name} {documentation} ({key}).")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_format_value(value)}")
+        if labels:
+            lines.append(f"# HELP {prefix}_info {documentation} (configuration).")
+            lines.append(f"# TYPE {prefix}_info gauge")
+            lines.append(f"{prefix}_info{{{','.join(labels)}}} 1")
+        return lines
+
+    return collect
+
+
+def collector_from_latency_stats(name: str, documentation: str, stats: Callable[[], Dict],
+                                 keys: Iterable[str], label: str) -> Callable[[], List[str]]:
+    """Expose pre-aggregated latency entries (``buckets``/``sum_seconds``/``count``) as a histogram."""
+    keys = tuple(keys)
+
+    def collect() -> List[str]:
+        snapshot = stats()
+        lines = [f"# HELP {name} {documentation}", f"# TYPE {name} histogram"]
+        for key in keys:
+            entry = snapshot.get(key) or {}
+            for bound, cumulative in entry.get("buckets", {}).items():
+                lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label}="{key}"}} {_format_value(entry.get("sum_seconds", 0))}')
+            lines.append(f'{name}_count{{{label}="{key}"}} {entry.get("count", 0)}')
+        return lines
+
+    return collect
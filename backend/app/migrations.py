@@ -0,0 +1,233 @@
+"""
+app/migrations.py
+---------------
+
+Schema versioning for production start-up.
+
+Development boots keep calling ``Base.metadata.create_all``. Production
+boots (``STARTUP_MODE=production``) skip that reflection and only read the
+version stamped in ``schema_version``, refusing to start when the database
+is behind the code. Pending steps are applied explicitly as a deploy step::
+
+    # From backend/
+    python -m app.migrations            # upgrade to SCHEMA_VERSION
+    python -m app.migrations --check    # exit 1 when an upgrade is pending
+
+Each entry in ``MIGRATIONS`` moves the database from ``version - 1`` to
+``version``. Steps are SQL strings or callables receiving the connection,
+and must be idempotent because development boots run them right after
+``create_all``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Callable, Dict, List, Optional, Union
+
+from sqlalchemy import func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.database import create_tables, engine as default_engine
+from app.etag import TRACKED_TABLES
+from app.models import ContentItem, SchemaVersion, TableVersion, UserProgress, UserStats
+
+Step = Union[str, Callable[[Connection], None]]
+
+
+def _postgres_only(*statements: str) -> Callable[[Connection], None]:
+    def step(conn: Connection) -> None:
+        if conn.dialect.name != "postgresql":
+            return
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+    return step
+
+
+def _create_indexes(table, *names: str) -> Callable[[Connection], None]:
+    """Create the named ``Index`` objects declared on a model, if missing."""
+    def step(conn: Connection) -> None:
+        for index in table.indexes:
+            if index.name in names:
+                index.create(conn, checkfirst=True)
+    return step
+
+
+def _add_columns(table, *names: str) -> Callable[[Connection], None]:
+    """Add the named columns declared on a model, if missing."""
+    def step(conn: Connection) -> None:
+        existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+        for name in names:
+            if name in existing:
+                continue
+            column = table.c[name]
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(conn.dialect)}"
+            if column.default is not None and column.default.is_scalar:
+                ddl += f" DEFAULT {column.default.arg!r}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            conn.exec_driver_sql(ddl)
+    return step
+
+
+def _stamp_table_versions(conn: Connection) -> None:
+    TableVersion.__table__.create(conn, checkfirst=True)
+    existing = set(conn.execute(select(TableVersion.name)).scalars())
+    missing = sorted(TRACKED_TABLES - existing)
+    if missing:
+        conn.execute(TableVersion.__table__.insert(), [{"name": name, "version": 1} for name in missing])
+
+
+def _backfill_user_stats(conn: Connection) -> None:
+    from app.crud.progress import refresh_user_stats
+
+    UserStats.__table__.create(conn, checkfirst=True)
+    refresh_user_stats(conn)
+
+
+def _per_dialect(**statements: str) -> Callable[[Connection], None]:
+    def step(conn: Connection) -> None:
+        statement = statements.get(conn.dialect.name)
+        if statement is not None:
+            conn.exec_driver_sql(statement)
+    return step
+
+
+# Interval the doubling rule gave a row with this streak: min(2 ** streak, 32), 1 after a mistake
+_DOUBLING_DAYS = (
+    "(CASE WHEN streak <= 0 THEN 1 WHEN streak >= 5 THEN 32 "
+    "WHEN streak = 1 THEN 2 WHEN streak = 2 THEN 4 WHEN streak = 3 THEN 8 ELSE 16 END)"
+)
+
+
+# version -> steps that bring the database from version - 1 to version
+MIGRATIONS: Dict[int, List[Step]] = {
+    1: [],  # baseline: tables as created by Base.metadata.create_all
+    # Trigram indexes for VERB_SEARCH_MODE=trigram (see crud.verb._search_clauses)
+    2: [_postgres_only(
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE EXTENSION IF NOT EXISTS unaccent",
+        # unaccent() is only STABLE; an IMMUTABLE wrapper can be indexed
+        "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+        "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$",
+        "CREATE INDEX IF NOT EXISTS ix_verbs_infinitive_trgm ON verbs USING gin (lower(infinitive) gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_verbs_past_trgm ON verbs USING gin (lower(past) gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_verbs_participle_trgm ON verbs USING gin (lower(participle) gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_verbs_translation_trgm "
+        "ON verbs USING gin (f_unaccent(lower(translation)) gin_trgm_ops)",
+    )],
+    # Keyset pagination indexes for /content
+    3: [_create_indexes(
+        ContentItem.__table__,
+        "ix_content_items_status_published_id",
+        "ix_content_items_updated_id",
+    )],
+    # Per-table version stamps behind the catalog ETags
+    4: [_stamp_table_versions],
+    # One progress row per (user, verb): keep the oldest duplicate, which is
+    # the one lookups have been updating, before adding the unique index
+    5: [
+        "DELETE FROM user_progress WHERE EXISTS ("
+        "SELECT 1 FROM user_progress AS older "
+        "WHERE older.user_id = user_progress.user_id "
+        "AND older.verb_id = user_progress.verb_id "
+        "AND older.id < user_progress.id)",
+        _create_indexes(
+            UserProgress.__table__,
+            "uq_user_progress_user_verb",
+            "ix_user_progress_user_srs_date",
+        ),
+    ],
+    # Per-user totals behind /users/{id}/stats, computed once from user_progress
+    6: [_backfill_user_stats],
+    # Scheduler state for SRS_SCHEDULER. Every row so far was scheduled by the
+    # doubling rule, so its last review is srs_date minus that interval
+    7: [
+        _add_columns(UserProgress.__table__, "ease", "last_reviewed_at"),
+        _per_dialect(
+            postgresql="UPDATE user_progress "
+            f"SET last_reviewed_at = srs_date - make_interval(days => {_DOUBLING_DAYS}) "
+            "WHERE last_reviewed_at IS NULL AND (streak > 0 OR mistakes > 0)",
+            sqlite="UPDATE user_progress "
+            f"SET last_reviewed_at = datetime(srs_date, '-' || {_DOUBLING_DAYS} || ' days') "
+            "WHERE last_reviewed_at IS NULL AND (streak > 0 OR mistakes > 0)",
+        ),
+    ],
+}
+
+SCHEMA_VERSION = max(MIGRATIONS)
+
+
+def current_version(conn: Connection) -> Optional[int]:
+    """Version stamped in the database, or ``None`` when never stamped."""
+    try:
+        with conn.begin_nested():
+            return conn.execute(select(func.max(SchemaVersion.version))).scalar()
+    except DBAPIError:
+        # schema_version does not exist yet
+        return None
+
+
+def _stamp(conn: Connection, version: int) -> None:
+    conn.execute(SchemaVersion.__table__.insert().values(version=version))
+
+
+def upgrade(engine: Engine = default_engine) -> int:
+    """Apply every pending migration and return the resulting version."""
+    with engine.begin() as conn:
+        found = current_version(conn)
+    if found is None:
+        # Fresh or never-stamped database: create_all builds the baseline.
+        create_tables()
+        found = 1
+        with engine.begin() as conn:
+            _stamp(conn, found)
+    for version in range(found + 1, SCHEMA_VERSION + 1):
+        with engine.begin() as conn:
+            for step in MIGRATIONS[version]:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.exec_driver_sql(step)
+            _stamp(conn, version)
+        print(f"  ✅ Migrated schema to version {version}")
+    return SCHEMA_VERSION
+
+
+def check_schema(engine: Engine = default_engine) -> int:
+    """Fail unless the database is at ``SCHEMA_VERSION`` (one query)."""
+    with engine.connect() as conn:
+        found = current_version(conn)
+    if found is None or found < SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {found} is behind the code ({SCHEMA_VERSION}); "
+            "run `python -m app.migrations` before starting in production mode"
+        )
+    if found > SCHEMA_VERSION:
+        print(f"⚠️  Database schema version {found} is newer than the code ({SCHEMA_VERSION})")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    parser.add_argument("--check", action="store_true", help="Only report whether an upgrade is pending")
+    args = parser.parse_args()
+
+    if args.check:
+        try:
+            version = check_schema()
+        except RuntimeError as exc:
+            print(f"❌ {exc}")
+            sys.exit(1)
+        print(f"✅ Schema at version {version}")
+        return
+
+    print(f"🛠️  Upgrading schema to version {SCHEMA_VERSION}...")
+    upgrade()
+    print(f"✅ Schema at version {SCHEMA_VERSION}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,18 @@ Exporta todos los modelos para facilitar importaciones
 
 from .user import User
 from .verb import Verb
-from .progress import UserProgress
+from .progress import UserProgress, UserStats
 from .tense import Tense, TenseExample
 from .tense import Tense, TenseExample
 from .activity import Activity, ActivityQuestion, ActivityAttempt, QuestionAttempt
 from .content import ContentItem
+from .schema import SchemaVersion, TableVersion
 
 __all__ = [
     "User",
     "Verb", 
     "UserProgress",
+    "UserStats",
     "Tense",
     "TenseExample",
     "Activity",
@@ -23,4 +25,6 @@ __all__ = [
     "ActivityAttempt",
     "QuestionAttempt",
     "ContentItem",
+    "SchemaVersion",
+    "TableVersion",
 ]
\ No newline at end of file
@@ -3,11 +3,16 @@ app/models/content.py
 Modelo para el sistema de contenido (CMS/Blog).
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index
 from .base import BaseModel
 
 class ContentItem(BaseModel):
     __tablename__ = "content_items"
+    __table_args__ = (
+        # Keyset pagination: (published_at, id) within a status, (updated_at, id) overall
+        Index("ix_content_items_status_published_id", "status", "published_at", "id"),
+        Index("ix_content_items_updated_id", "updated_at", "id"),
+    )
 
     slug = Column(String, unique=True, index=True, nullable=False)
     title = Column(String, nullable=False)
@@ -2,19 +2,28 @@
 app/models/progress.py
 Modelos de progreso del usuario (SRS)
 """
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .base import BaseModel
 
 class UserProgress(BaseModel):
     __tablename__ = "user_progress"
+    __table_args__ = (
+        # One row per (user, verb); progress is created with ON CONFLICT DO NOTHING
+        Index("uq_user_progress_user_verb", "user_id", "verb_id", unique=True),
+        # Due and review buckets of /practice/select
+        Index("ix_user_progress_user_srs_date", "user_id", "srs_date"),
+    )
 
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     verb_id = Column(Integer, ForeignKey("verbs.id", ondelete="CASCADE"), nullable=False)
     srs_date = Column(DateTime, default=datetime.utcnow, nullable=False)
     mistakes = Column(Integer, default=0, nullable=False)
     streak = Column(Integer, default=0, nullable=False)
+    # Scheduler state (see app.srs): SM-2 scale ease, and when srs_date was last set by an answer
+    ease = Column(Float, default=2.5, nullable=False)
+    last_reviewed_at = Column(DateTime, nullable=True)
 
     # Relaciones
     user = relationship("User", back_populates="progress")
@@ -24,4 +33,23 @@ class UserProgress(BaseModel):
         return (
             f"<UserProgress user_id={self.user_id} verb_id={self.verb_id} "
             f"srs_date={self.srs_date} mistakes={self.mistakes} streak={self.streak}>"
-        )
\ No newline at end of file
+        )
+
+
+class UserStats(BaseModel):
+    """Running totals over a user's ``user_progress`` rows, kept current by crud.progress."""
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
+    verbs_learned = Column(Integer, default=0, nullable=False)
+    verbs_mastered = Column(Integer, default=0, nullable=False)
+    total_streak = Column(Integer, default=0, nullable=False)
+    total_mistakes = Column(Integer, default=0, nullable=False)
+
+    user = relationship("User", back_populates="stats")
+
+    def __repr__(self) -> str:
+        return (
+            f"<UserStats user_id={self.user_id} learned={self.verbs_learned} "
+            f"mastered={self.verbs_mastered} mistakes={self.total_mistakes}>"
+        )
@@ -0,0 +1,25 @@
+"""
+app/models/schema.py
+Versión del esquema aplicada a la base de datos
+"""
+from sqlalchemy import Column, Integer, String
+from .base import BaseModel
+
+class SchemaVersion(BaseModel):
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SchemaVersion {self.version}>"
+
+
+class TableVersion(BaseModel):
+    """Write counter per catalog table, bumped on every ORM flush that touches it (see app.etag)."""
+    __tablename__ = "table_versions"
+
+    name = Column(String, unique=True, nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+
+    def __repr__(self) -> str:
+        return f"<TableVersion {self.name}={self.version}>"
@@ -16,6 +16,7 @@ class User(BaseModel):
 
     # Relaciones
     progress = relationship("UserProgress", back_populates="user", cascade="all, delete-orphan")
+    stats = relationship("UserStats", back_populates="user", uselist=False, cascade="all, delete-orphan")
     activity_attempts = relationship("ActivityAttempt", back_populates="user", cascade="all, delete-orphan")
     question_attempts = relationship("QuestionAttempt", back_populates="user", cascade="all, delete-orphan")
 
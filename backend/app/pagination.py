@@ -0,0 +1,58 @@
+"""
+app/pagination.py
+---------------
+
+Opaque cursor tokens for keyset pagination.
+
+A cursor holds the sort key and id of the last row of a page, so the next
+page is fetched with ``WHERE (key, id) > (:key, :id)`` (``<`` for
+descending lists). That is a single index range scan however deep the page,
+unlike ``OFFSET`` which reads and discards every skipped row. Tokens are
+URL-safe base64 JSON tagged with the listing they belong to; a token from
+another listing, or a tampered one, is rejected with ``400``.
+
+Offset parameters stay accepted for backward compatibility; ``cursor``
+takes precedence when both are given.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+from fastapi import HTTPException, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {"dt"}:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(scope: str, *key: Any) -> str:
+    """Token for the row whose sort key is ``key`` (e.g. ``(infinitive, id)``)."""
+    payload = json.dumps([scope, [_encode_value(v) for v in key]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(scope: str, token: str, size: int) -> Tuple[Any, ...]:
+    """Sort key stored in ``token``; ``400`` if it is malformed or belongs to another listing."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        found_scope, values = json.loads(raw)
+        key = tuple(_decode_value(v) for v in values)
+    except (ValueError, TypeError):
+        key, found_scope = (), None
+    if found_scope != scope or len(key) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return key
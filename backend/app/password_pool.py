@@ -0,0 +1,179 @@
+"""
+app/password_pool.py
+---------------
+
+Dedicated worker pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (tens to hundreds of milliseconds per call).
+Running it on the request thread lets a burst of logins exhaust the AnyIO
+threadpool and stall every other endpoint, so ``/token`` and ``/register``
+hand the work to a bounded process pool instead. The number of outstanding
+jobs is capped: once ``PASSWORD_POOL_MAX_PENDING`` jobs are queued new
+requests are rejected with ``503`` and a ``Retry-After`` header rather than
+piling up. Queue wait and run time are recorded for ``/metrics``.
+
+This module is imported by the pool's child processes, so it must stay
+light: no database, router or schema imports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from app.settings import get_settings
+
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@lru_cache(maxsize=None)
+def build_crypt_context(rounds: int) -> CryptContext:
+    """The passlib context used everywhere passwords are hashed."""
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+def _hash_job(password: str, rounds: int) -> Tuple[str, float]:
+    started = time.perf_counter()
+    hashed = build_crypt_context(rounds).hash(password)
+    return hashed, time.perf_counter() - started
+
+
+def _verify_job(password: str, hashed: str, rounds: int) -> Tuple[bool, float]:
+    started = time.perf_counter()
+    ok = build_crypt_context(rounds).verify(password, hashed)
+    return ok, time.perf_counter() - started
+
+
+class _LatencyStats:
+    """Count / sum / max plus a cumulative bucket histogram."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, total: float, run: float) -> None:
+        self.count += 1
+        self.total_seconds += total
+        self.wait_seconds += max(total - run, 0.0)
+        self.max_seconds = max(self.max_seconds, total)
+        self.buckets[bisect_left(LATENCY_BUCKETS, total)] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, n in zip(LATENCY_BUCKETS + (float("inf"),), self.buckets):
+            running += n
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.total_seconds, 6),
+            "queue_wait_seconds": round(self.wait_seconds, 6),
+            "max_seconds": round(self.max_seconds, 6),
+            "buckets": cumulative,
+        }
+
+
+class PasswordPool:
+    """Bounded executor for bcrypt work with a queue-depth limit.
+
+    ``workers=0`` keeps the work in-process (on the AnyIO threadpool); this is
+    the fallback for environments where spawning processes is not allowed.
+    """
+
+    def __init__(self, workers: int, max_pending: int, rounds: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self._latency = {"hash": _LatencyStats(), "verify": _LatencyStats()}
+
+    def _get_executor(self) -> Executor | None:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def _run(self, kind: str, job: Callable[..., Tuple[Any, float]], *args: Any) -> Any:
+        self._acquire()
+        started = time.perf_counter()
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                result, run_seconds = await run_in_threadpool(job, *args)
+            else:
+                loop = asyncio.get_running_loop()
+                result, run_seconds = await loop.run_in_executor(executor, job, *args)
+        finally:
+            self._release()
+        with self._lock:
+            self._latency[kind].observe(time.perf_counter() - started, run_seconds)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", _hash_job, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run("verify", _verify_job, password, hashed, self.rounds)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "bcrypt_rounds": self.rounds,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "rejected": self.rejected,
+                "hash": self._latency["hash"].as_dict(),
+                "verify": self._latency["verify"].as_dict(),
+            }
+
+
+_settings = get_settings()
+
+password_pool = PasswordPool(
+    workers=_settings.PASSWORD_POOL_WORKERS,
+    max_pending=_settings.PASSWORD_POOL_MAX_PENDING,
+    rounds=_settings.BCRYPT_ROUNDS,
+)
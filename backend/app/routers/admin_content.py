@@ -4,25 +4,22 @@ Router protegido para operaciones admin de contenido.
 """
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from jose import jwt, JWTError
 
+from app.auth import get_current_user
 from app.database import get_db
 from app.settings import get_settings
 from app.schemas.content import ContentCreate, ContentUpdate, ContentItemAdmin
 from app.crud.content import (
     get_content_by_slug, create_content, update_content, delete_content
 )
-from app.crud import get_user_by_username
 from app import models
 
 # Logger for admin content operations
 logger = logging.getLogger(__name__)
 
 _settings = get_settings()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 router = APIRouter(
     prefix="/admin/content",
@@ -30,28 +27,8 @@ router = APIRouter(
 )
 
 
-async def get_current_user_for_admin(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> models.User:
-    """Validate JWT and return current user."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, _settings.SECRET_KEY, algorithms=[_settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = get_user_by_username(db, username)
-    if user is None:
-        raise credentials_exception
-    return user
+# Kept for imports of the old name; the dependency is shared with main.py.
+get_current_user_for_admin = get_current_user
 
 
 @router.post("", response_model=ContentItemAdmin, status_code=status.HTTP_201_CREATED)
@@ -2,7 +2,7 @@
 app/routers/content.py
 Router público para contenido (artículos/guías).
 """
-from typing import List
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
@@ -11,11 +11,13 @@ from app.settings import get_settings
 from app.schemas import ContentItemPublic, ContentList
 from app.crud import (
     get_published_content_by_slug,
-    list_published_content,
     count_published_content,
-    get_content_by_slug
+    get_content_by_slug,
+    list_content_rows
 )
 from app.models import ContentItem
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.serialization import FastJSONResponse
 
 _settings = get_settings()
 
@@ -28,24 +30,30 @@ router = APIRouter(
 def get_content_list(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (replaces skip)"),
     db: Session = Depends(get_db)
 ):
     """
     List content. When FEATURE_CONTENT_PUBLIC_PUBLISHED_ONLY_V1 is ON,
     only published content is returned. When OFF, all content is returned.
+    Newest first; follow ``next_cursor`` for keyset paging.
     """
-    if _settings.FEATURE_CONTENT_PUBLIC_PUBLISHED_ONLY_V1:
-        # Published only
-        items = list_published_content(db, skip=skip, limit=limit)
+    published_only = _settings.FEATURE_CONTENT_PUBLIC_PUBLISHED_ONLY_V1
+    sort_key, scope = ("published_at", "content:published") if published_only else ("updated_at", "content:all")
+    after = decode_cursor(scope, cursor, 2) if cursor else None
+    items = list_content_rows(db, skip=skip, limit=limit, published_only=published_only, after=after)
+    next_cursor = None
+    if len(items) == limit:
+        next_cursor = encode_cursor(scope, items[-1][sort_key], items[-1]["id"])
+    if published_only:
         total = count_published_content(db)
     else:
         # All content (backward compat / dev mode)
-        items = db.query(ContentItem).order_by(
-            ContentItem.updated_at.desc()
-        ).offset(skip).limit(limit).all()
         total = db.query(ContentItem).count()
-    
-    return {"items": items, "total": total}
+
+    # Rows are already shaped like ContentItemPublic; skip response_model validation
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse({"items": items, "total": total, "next_cursor": next_cursor}, headers=headers)
 
 @router.get("/{slug}", response_model=ContentItemPublic)
 def get_content_detail(
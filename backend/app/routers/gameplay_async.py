@@ -0,0 +1,145 @@
+"""
+app/routers/gameplay_async.py
+Rutas de juego servidas con AsyncSession (DATABASE_ASYNC).
+
+Same paths, payloads and responses as the sync routes in ``main.py``; when
+the flag is on, ``main.py`` swaps those routes for these so one worker can
+keep many requests waiting on the database without holding a threadpool
+thread each.
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.auth import Principal, get_current_principal_async, get_current_user_async
+from app.crud import FORECAST_MAX_DAYS, aio
+from app.database import get_async_db
+from app.serialization import FastJSONResponse
+from app.settings import get_settings
+from app.schemas import (
+    UserOut, VerbOut,
+    AttemptStartIn, AttemptStartOut, SubmitAnswerIn, SubmitAnswerOut,
+    ProgressUpdateIn, UserProgressOut, ProgressBatchIn, ProgressBatchOut, ProgressForecastOut,
+)
+
+router = APIRouter()
+
+
+@router.post("/users/{user_id}/xp", response_model=UserOut, tags=["Users"])
+async def add_xp(
+    user_id: int,
+    xp_gain: int = Query(..., ge=0, le=100000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+):
+    user = await aio.update_user_xp(db, user_id, xp_gain)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+@router.get("/users/{user_id}/stats", response_model=dict, tags=["Users"])
+async def stats(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+):
+    return await aio.get_user_stats(db, user_id)
+
+
+@router.post("/attempts/start", response_model=AttemptStartOut, tags=["Attempts"])
+async def start_attempt_route(
+    payload: AttemptStartIn,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    attempt = await aio.start_attempt(db, current_user.id, payload.activity_id)
+    return {"attempt_id": attempt.id, "activity_id": attempt.activity_id}
+
+
+@router.post("/attempts/submit", response_model=SubmitAnswerOut, tags=["Attempts"])
+async def submit_answer_route(
+    payload: SubmitAnswerIn,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    return await aio.submit_answer(
+        db,
+        current_user.id,
+        payload.attempt_id,
+        payload.question_id,
+        payload.user_answer,
+        payload.time_ms,
+    )
+
+
+@router.get("/practice/select", response_model=List[VerbOut], tags=["Practice"])
+async def select_practice_route(
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    return await aio.select_verbs_for_practice(db, current_user.id, limit)
+
+
+@router.post("/progress/update", response_model=UserProgressOut, tags=["Progress"])
+async def update_progress_route(
+    payload: ProgressUpdateIn,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    if (
+        get_settings().PROGRESS_INIT_MODE == "eager"
+        and await aio.get_user_progress(db, current_user.id, payload.verb_id) is None
+    ):
+        raise HTTPException(
+            status_code=404,
+            detail="Progress not initialized; call POST /progress/init first"
+        )
+
+    return await aio.update_user_progress(
+        db,
+        current_user.id,
+        payload.verb_id,
+        payload.is_correct,
+    )
+
+
+@router.post("/progress/batch", response_model=ProgressBatchOut, tags=["Progress"])
+async def batch_progress_route(
+    payload: ProgressBatchIn,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    result = await aio.apply_progress_batch(
+        db, current_user.id, payload.answers, create_missing=get_settings().PROGRESS_INIT_MODE == "lazy"
+    )
+    return FastJSONResponse(result)
+
+
+@router.get("/progress/forecast", response_model=ProgressForecastOut, tags=["Progress"])
+async def progress_forecast_route(
+    days: int = Query(7, ge=1, le=FORECAST_MAX_DAYS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    return FastJSONResponse(await aio.get_progress_forecast(db, current_user.id, days))
+
+
+@router.get("/progress", response_model=List[UserProgressOut], tags=["Progress"])
+async def get_progress_route(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    return FastJSONResponse(await aio.list_user_progress_rows(db, current_user.id))
+
+
+@router.post("/progress/init", tags=["Progress"])
+async def init_progress_route(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async),
+):
+    count = await aio.initialize_user_progress(db, current_user.id)
+    return {"initialized": count}
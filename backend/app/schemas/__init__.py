@@ -1,7 +1,10 @@
 # Exportar todos los esquemas
 from .auth import Token, UserLogin
 from .user import UserCreate, UserOut
-from .verb import VerbOut, VerbCreate, VerbUpdate
+from .verb import (
+    VerbOut, VerbCreate, VerbUpdate, VerbImportReport, VerbStatsOut,
+    VerbGradeIn, VerbGradeOut
+)
 from .tense import (
     TenseOut, TenseCreate,
     ExampleOut, ExampleCreate
@@ -14,7 +17,10 @@ from .activity import (
     FocusResultItem, FocusResultsIn, FocusResultsOut
 )
 
-from .progress import ProgressUpdateIn, UserProgressUpdate, UserProgressOut, StatsOverview
+from .progress import (
+    ProgressUpdateIn, UserProgressUpdate, UserProgressOut, ProgressBatchIn, ProgressBatchOut,
+    ForecastDay, ProgressForecastOut, StatsOverview
+)
 from .content import ContentItemPublic, ContentList, ContentCreate, ContentUpdate, ContentItemAdmin
 
 __all__ = [
@@ -23,7 +29,8 @@ __all__ = [
     # User
     "UserCreate", "UserOut",
     # Verb
-    "VerbOut", "VerbCreate", "VerbUpdate",
+    "VerbOut", "VerbCreate", "VerbUpdate", "VerbImportReport", "VerbStatsOut",
+    "VerbGradeIn", "VerbGradeOut",
     # Tense
     "TenseOut", "TenseCreate",
     "ExampleOut", "ExampleCreate",
@@ -35,7 +42,8 @@ __all__ = [
     # Focus
     "FocusResultItem", "FocusResultsIn", "FocusResultsOut",
     # Progress
-    "ProgressUpdateIn", "UserProgressUpdate", "UserProgressOut", "StatsOverview",
+    "ProgressUpdateIn", "UserProgressUpdate", "UserProgressOut", "ProgressBatchIn", "ProgressBatchOut",
+    "ForecastDay", "ProgressForecastOut", "StatsOverview",
     # Content
     "ContentItemPublic", "ContentList",
 ]
\ No newline at end of file
@@ -21,6 +21,8 @@ class ContentItemPublic(BaseModel):
 class ContentList(BaseModel):
     items: List[ContentItemPublic]
     total: int
+    # Pass as ?cursor= to fetch the next page; null on the last page
+    next_cursor: Optional[str] = None
 
 
 # Admin Write Schemas
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
+from datetime import date, datetime
+from typing import List
 
 class ProgressUpdateIn(BaseModel):
     """Minimal payload for updating progress on a verb."""
@@ -22,6 +23,24 @@ class UserProgressOut(BaseModel):
     streak: int
     model_config = ConfigDict(from_attributes=True)
 
+class ProgressBatchIn(BaseModel):
+    """Every answer of a practice session, in the order they were given."""
+    answers: List[ProgressUpdateIn] = Field(..., min_length=1, max_length=200)
+
+class ProgressBatchOut(BaseModel):
+    xp_gained: int
+    progress: List[UserProgressOut]
+
+class ForecastDay(BaseModel):
+    date: date
+    due: int
+
+class ProgressForecastOut(BaseModel):
+    days: int
+    overdue: int = Field(..., description="Reviews already past due, included in today's count")
+    total: int
+    forecast: List[ForecastDay]
+
 class StatsOverview(BaseModel):
     streak: int
     totalMistakes: int
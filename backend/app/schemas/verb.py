@@ -1,3 +1,5 @@
+from typing import Any, Dict, Literal, Optional
+
 from pydantic import BaseModel, Field, ConfigDict
 
 class VerbOut(BaseModel):
@@ -21,4 +23,29 @@ class VerbUpdate(BaseModel):
     past: str | None = None
     participle: str | None = None
     translation: str | None = None
-    example_b2: str | None = None
\ No newline at end of file
+    example_b2: str | None = None
+
+class VerbImportReport(BaseModel):
+    inserted: int = Field(..., description="New verbs written")
+    skipped: int = Field(..., description="Rows whose infinitive already exists or repeats in the upload")
+    invalid: int = Field(..., description="Rows that could not be parsed or miss a required field")
+
+class VerbStatsOut(BaseModel):
+    total_verbs: int
+    average_infinitive_length: float
+    verbs_by_letter: Dict[str, int]
+    last_updated: str = Field(..., description="When these figures were computed (UTC, ISO 8601)")
+
+class VerbGradeIn(BaseModel):
+    form: Literal["infinitive", "past", "participle"] = Field(..., description="Form being asked for")
+    answer: str = Field(..., max_length=100, description="Free-text answer")
+
+class VerbGradeOut(BaseModel):
+    verb_id: int
+    form: str
+    answer: str
+    result: Literal["correct", "alternative", "near_miss", "incorrect"]
+    is_correct: bool = Field(..., description="True for correct and alternative")
+    expected: str = Field(..., description="Canonical form")
+    suggestion: Optional[str] = Field(None, description="Closest accepted form for a near miss; the expected form otherwise")
+    recognized_as: Optional[Dict[str, Any]] = Field(None, description="Verb form the answer spells, if any (verb_id, form, text)")
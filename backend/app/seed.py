@@ -34,20 +34,12 @@ def load_json_data(filename: str) -> dict:
 def seed_verbs(db: Session, verbs_data: list) -> int:
     print("🌱 Sembrando verbos irregulares...")
 
-    verbs_to_create = []
-    for verb_data in verbs_data:
-        infinitive = (verb_data.get("infinitive") or "").strip()
-        if not infinitive:
-            continue
-        existing = get_verb_by_infinitive(db, infinitive)
-        if not existing:
-            verbs_to_create.append(verb_data)
-
-    if not verbs_to_create:
+    # bulk_create_verbs skips existing infinitives with a single lookup query
+    created = bulk_create_verbs(db, verbs_data)
+    if not created:
         print("  ✅ Todos los verbos ya existen en la base de datos")
         return 0
 
-    created = bulk_create_verbs(db, verbs_to_create)
     print(f"  ✅ {created} verbos creados exitosamente")
     return created
 
@@ -0,0 +1,72 @@
+"""
+app/serialization.py
+---------------
+
+Fast path for large list responses.
+
+Returning ORM objects from a route makes FastAPI validate every row against
+``response_model`` and then run ``jsonable_encoder`` over the result, which
+dominates the cost of payloads with thousands of rows. The list routes
+instead select exactly the schema's columns with SQLAlchemy Core, keep the
+rows as plain dicts and return a ``FastJSONResponse``. A ``Response``
+instance skips FastAPI's validation and encoding entirely, while the
+``response_model`` declared on the route still documents the shape in
+OpenAPI.
+
+``schema_columns`` derives the selected columns from the Pydantic schema, so
+the published schema and the payload cannot drift apart.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy import Column
+from sqlalchemy.orm import Session
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def schema_columns(schema: Type[BaseModel], model: Any) -> List[Column]:
+    """Table columns of ``model`` named like the fields of ``schema``, in schema order."""
+    table = model.__table__
+    return [table.c[name] for name in schema.model_fields]
+
+
+def fetch_rows(db: Session, stmt: Any) -> List[Dict[str, Any]]:
+    """Execute a Core ``select`` and return each row as a plain dict."""
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson (stdlib ``json`` when it is missing).
+
+    ``bytes`` content is taken as already-encoded JSON and sent as is.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import List
+from typing import List, Literal, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,15 +16,60 @@ class Settings(BaseSettings):
     SECRET_KEY: str = Field(..., alias="SECRET_KEY")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(60 * 24, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     ALGORITHM: str = Field("HS256", alias="JWT_ALGORITHM")
+    # Embed user id + token version in issued tokens so hot routes can skip the users lookup
+    JWT_STATELESS_CLAIMS: bool = Field(False, alias="JWT_STATELESS_CLAIMS")
 
     CORS_ORIGINS: List[str] = Field(default_factory=list, alias="CORS_ORIGINS")
     DATABASE_URL: str = Field(..., alias="DATABASE_URL")
+    # Connection pool and the AnyIO threadpool that runs sync routes. With
+    # DB_POOL_AUTO_ALIGN and no THREADPOOL_SIZE, the threadpool gets one thread
+    # per connection the pool can open (DB_POOL_SIZE + DB_MAX_OVERFLOW).
+    DB_POOL_SIZE: int = Field(20, alias="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(30, alias="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(30.0, alias="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(-1, alias="DB_POOL_RECYCLE")
+    DB_POOL_AUTO_ALIGN: bool = Field(True, alias="DB_POOL_AUTO_ALIGN")
+    THREADPOOL_SIZE: Optional[int] = Field(None, alias="THREADPOOL_SIZE")
+    # Serve the hot gameplay routes through an asyncpg AsyncEngine instead of the threadpool
+    DATABASE_ASYNC: bool = Field(False, alias="DATABASE_ASYNC")
+    ASYNC_DATABASE_URL: Optional[str] = Field(None, alias="ASYNC_DATABASE_URL")
     
+    # "dev" runs create_all on boot; "production" only checks the schema version
+    STARTUP_MODE: Literal["dev", "production"] = Field("dev", alias="STARTUP_MODE")
+
     # Feature Flags
     FEATURE_CONTENT_API_V1: bool = Field(False, alias="FEATURE_CONTENT_API_V1")
     FEATURE_CONTENT_ADMIN_WRITE_V1: bool = Field(False, alias="FEATURE_CONTENT_ADMIN_WRITE_V1")
     FEATURE_CONTENT_PUBLIC_PUBLISHED_ONLY_V1: bool = Field(False, alias="FEATURE_CONTENT_PUBLIC_PUBLISHED_ONLY_V1")
 
+    # Per-request SQL debugging: X-DB-Queries / X-DB-Time-Ms headers and N+1 warnings
+    QUERY_DEBUG: bool = Field(False, alias="QUERY_DEBUG")
+    QUERY_REPEAT_WARN_THRESHOLD: int = Field(10, alias="QUERY_REPEAT_WARN_THRESHOLD")
+
+    # Principal cache (get_current_user). Size 0 or TTL 0 disables it.
+    PRINCIPAL_CACHE_SIZE: int = Field(10_000, alias="PRINCIPAL_CACHE_SIZE")
+    PRINCIPAL_CACHE_TTL_SECONDS: float = Field(60.0, alias="PRINCIPAL_CACHE_TTL_SECONDS")
+
+    # Seconds before a worker reloads the in-memory verb catalog (0 = only on local writes)
+    VERB_CATALOG_TTL_SECONDS: float = Field(60.0, alias="VERB_CATALOG_TTL_SECONDS")
+
+    # /verbs/search backend: in-process n-gram index, or pg_trgm indexes (migration 2)
+    VERB_SEARCH_MODE: Literal["memory", "trigram"] = Field("memory", alias="VERB_SEARCH_MODE")
+
+    # /progress/init: "eager" creates every progress row at once, "lazy" on first practice/update
+    PROGRESS_INIT_MODE: Literal["eager", "lazy"] = Field("eager", alias="PROGRESS_INIT_MODE")
+    # Spaced-repetition scheduler (see app.srs); run scripts.reschedule_progress after changing these
+    SRS_SCHEDULER: Literal["doubling", "sm2", "fsrs"] = Field("doubling", alias="SRS_SCHEDULER")
+    SRS_MAX_INTERVAL_DAYS: float = Field(32.0, alias="SRS_MAX_INTERVAL_DAYS")
+    SRS_DESIRED_RETENTION: float = Field(0.9, gt=0, lt=1, alias="SRS_DESIRED_RETENTION")
+    # Per-user /progress/forecast cache, also dropped on that user's progress writes (0 disables)
+    PROGRESS_FORECAST_CACHE_TTL_SECONDS: float = Field(60.0, alias="PROGRESS_FORECAST_CACHE_TTL_SECONDS")
+
+    # bcrypt work factor and the process pool that runs it (0 workers = in-process)
+    BCRYPT_ROUNDS: int = Field(12, alias="BCRYPT_ROUNDS")
+    PASSWORD_POOL_WORKERS: int = Field(2, alias="PASSWORD_POOL_WORKERS")
+    PASSWORD_POOL_MAX_PENDING: int = Field(64, alias="PASSWORD_POOL_MAX_PENDING")
+
     # ✅ Pydantic v2 config
     model_config = SettingsConfigDict(
         case_sensitive=False,
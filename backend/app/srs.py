@@ -0,0 +1,222 @@
+"""
+app/srs.py
+---------------
+
+Spaced-repetition schedulers for verb progress.
+
+A progress row's schedule state is its ``streak`` (consecutive correct
+answers), ``mistakes``, ``ease`` (per-card ease on the SM-2 scale: 2.5 for a
+new card, 1.3 the hardest, higher is easier) and ``last_reviewed_at``. A
+scheduler is a closed-form ``interval_days(streak, mistakes, ease)``: the
+gap between a review that left the card in that state and the next one.
+
+``review`` is a pure function from a row's state and one answer to its next
+state, so a whole practice session can be folded in memory and written back
+with one bulk UPDATE (``crud.apply_progress_batch``). ``reschedule`` gives
+``last_reviewed_at + interval`` for whole arrays of cards in one NumPy pass,
+so switching ``SRS_SCHEDULER`` or its parameters is a vectorized recompute
+plus bulk UPDATEs (``crud.reschedule_progress``), not a per-row replay.
+
+Schedulers (``SRS_SCHEDULER``):
+
+* ``doubling`` (default): ``2 ** streak`` days, 1 day after a mistake. Ease
+  is not used.
+* ``sm2``: SuperMemo 2. 1 day, then 6, then ``6 * ease ** (streak - 2)``. A
+  correct answer is quality 4 (ease unchanged), a mistake quality 2 (ease
+  -0.32, floored at 1.3).
+* ``fsrs``: an FSRS-style memory model. Stability starts at 2 days and grows
+  geometrically with the streak, faster for easy cards, and lapses shrink
+  it. The interval is the time the power forgetting curve
+  ``R(t) = (1 + t / (9 S)) ** -1`` takes to fall to
+  ``SRS_DESIRED_RETENTION``. A mistake costs 0.2 ease, a correct answer
+  earns back 0.05.
+
+Intervals are at least a day and at most ``SRS_MAX_INTERVAL_DAYS``. XP does
+not depend on the scheduler: ``10 * (1 + min(streak, 5))`` for a correct
+answer, 2 for a wrong one.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - reschedule falls back to a Python loop
+    np = None
+
+from app.settings import get_settings
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+MAX_EASE = 3.5
+MIN_INTERVAL_DAYS = 1
+# Streak from which a verb counts as mastered on the dashboard
+MASTERED_STREAK = 5
+WRONG_ANSWER_XP = 2
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# Keeps ``base ** streak`` finite; any such interval is past the cap anyway
+_MAX_EXPONENT = 64
+
+
+class _ScalarOps:
+    """The few NumPy functions the interval formulas use, for plain floats."""
+
+    minimum = staticmethod(min)
+    maximum = staticmethod(max)
+
+    @staticmethod
+    def where(condition: bool, a: float, b: float) -> float:
+        return a if condition else b
+
+
+class Scheduler:
+    """Interval rule shared by single reviews and batch rescheduling.
+
+    ``interval_days`` must only use arithmetic and ``ops`` so that it works
+    on floats (``_ScalarOps``) and NumPy arrays (``numpy``) alike.
+    """
+
+    name = "base"
+
+    def __init__(self, max_interval_days: float = 32, desired_retention: float = 0.9) -> None:
+        self.max_interval_days = max_interval_days
+        self.desired_retention = desired_retention
+
+    def interval_days(self, streak: Any, mistakes: Any, ease: Any, ops: Any = _ScalarOps) -> Any:
+        raise NotImplementedError
+
+    def next_ease(self, ease: float, correct: bool) -> float:
+        return ease
+
+    def capped_interval(self, streak: Any, mistakes: Any, ease: Any, ops: Any = _ScalarOps) -> Any:
+        interval = self.interval_days(streak, mistakes, ease, ops)
+        return ops.minimum(ops.maximum(interval, MIN_INTERVAL_DAYS), self.max_interval_days)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} max_interval_days={self.max_interval_days}>"
+
+
+class DoublingScheduler(Scheduler):
+    name = "doubling"
+
+    def interval_days(self, streak, mistakes, ease, ops=_ScalarOps):
+        return ops.where(streak > 0, 2.0 ** ops.minimum(streak, _MAX_EXPONENT), 1.0)
+
+
+class SM2Scheduler(Scheduler):
+    name = "sm2"
+    WRONG_EASE_PENALTY = 0.32  # SM-2 ease change for quality 2
+
+    def interval_days(self, streak, mistakes, ease, ops=_ScalarOps):
+        return ops.where(streak <= 1, 1.0, 6.0 * ease ** ops.minimum(streak - 2, _MAX_EXPONENT))
+
+    def next_ease(self, ease, correct):
+        return ease if correct else max(MIN_EASE, ease - self.WRONG_EASE_PENALTY)
+
+
+class FSRSScheduler(Scheduler):
+    name = "fsrs"
+    INITIAL_STABILITY = 2.0
+    LAPSE_STABILITY = 0.5
+    GROWTH = 0.2  # stability growth per success, per point of (11 - difficulty)
+    LAPSE_DECAY = 0.1  # stability lost per past mistake
+    WRONG_EASE_PENALTY = 0.2
+    RIGHT_EASE_BONUS = 0.05
+
+    def interval_days(self, streak, mistakes, ease, ops=_ScalarOps):
+        difficulty = ops.minimum(ops.maximum(10.0 - 4.0 * (ease - MIN_EASE), 1.0), 10.0)
+        growth = 1.0 + self.GROWTH * (11.0 - difficulty)
+        stability = ops.where(
+            streak > 0,
+            self.INITIAL_STABILITY * growth ** ops.minimum(ops.maximum(streak - 1, 0), _MAX_EXPONENT),
+            self.LAPSE_STABILITY,
+        ) / (1.0 + self.LAPSE_DECAY * mistakes)
+        # R(t) = (1 + t / (9 S)) ** -1 solved for R(t) = desired_retention
+        return 9.0 * stability * (1.0 / self.desired_retention - 1.0)
+
+    def next_ease(self, ease, correct):
+        if correct:
+            return min(MAX_EASE, ease + self.RIGHT_EASE_BONUS)
+        return max(MIN_EASE, ease - self.WRONG_EASE_PENALTY)
+
+
+SCHEDULERS: Dict[str, Type[Scheduler]] = {
+    cls.name: cls for cls in (DoublingScheduler, SM2Scheduler, FSRSScheduler)
+}
+
+
+def build_scheduler(name: str, max_interval_days: float = 32, desired_retention: float = 0.9) -> Scheduler:
+    try:
+        cls = SCHEDULERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown SRS scheduler {name!r}; choose one of {sorted(SCHEDULERS)}")
+    return cls(max_interval_days=max_interval_days, desired_retention=desired_retention)
+
+
+@lru_cache
+def get_scheduler() -> Scheduler:
+    """The deployment's scheduler, from ``SRS_SCHEDULER`` and its parameters."""
+    settings = get_settings()
+    return build_scheduler(
+        settings.SRS_SCHEDULER,
+        max_interval_days=settings.SRS_MAX_INTERVAL_DAYS,
+        desired_retention=settings.SRS_DESIRED_RETENTION,
+    )
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    streak: int
+    mistakes: int
+    srs_date: datetime
+    ease: float = DEFAULT_EASE
+    last_reviewed_at: Optional[datetime] = None
+
+
+def review(
+    state: ReviewState, correct: bool, now: datetime, scheduler: Optional[Scheduler] = None
+) -> tuple[ReviewState, int]:
+    """Next state after one answer given at ``now``, and the XP it earns."""
+    scheduler = scheduler or get_scheduler()
+    if correct:
+        streak, mistakes = state.streak + 1, state.mistakes
+        xp = 10 * (1 + min(streak, 5))
+    else:
+        streak, mistakes = 0, state.mistakes + 1
+        xp = WRONG_ANSWER_XP
+    ease = scheduler.next_ease(state.ease, correct)
+    interval = scheduler.capped_interval(streak, mistakes, ease)
+    return ReviewState(streak, mistakes, now + timedelta(days=interval), ease, now), xp
+
+
+def reschedule(
+    streak: Sequence[int],
+    mistakes: Sequence[int],
+    ease: Sequence[float],
+    last_reviewed_at: Sequence[datetime],
+    scheduler: Optional[Scheduler] = None,
+) -> List[datetime]:
+    """``last_reviewed_at + interval`` for every card, in one vectorized pass."""
+    scheduler = scheduler or get_scheduler()
+    if np is None:
+        return [
+            reviewed + timedelta(days=scheduler.capped_interval(s, m, e))
+            for s, m, e, reviewed in zip(streak, mistakes, ease, last_reviewed_at)
+        ]
+    days = scheduler.capped_interval(
+        np.asarray(streak, dtype=np.int64),
+        np.asarray(mistakes, dtype=np.int64),
+        np.asarray(ease, dtype=np.float64),
+        np,
+    )
+    offsets = np.rint(np.asarray(days, dtype=np.float64) * 86_400e6).astype(np.int64)
+    # Much faster than letting NumPy parse the datetime objects themselves
+    reviewed = np.fromiter(
+        ((moment - _EPOCH) // _MICROSECOND for moment in last_reviewed_at), dtype=np.int64, count=len(offsets)
+    )
+    return (reviewed + offsets).astype("datetime64[us]").astype(datetime).tolist()
@@ -0,0 +1,99 @@
+"""
+app/textsearch.py
+---------------
+
+Accent-insensitive substring search with a portable trigram index.
+
+Used by the in-memory verb catalog, so deployments without Postgres
+``pg_trgm`` still get indexed ``/verbs/search``. Text is folded (lower case,
+accents stripped) on both sides, so "razon" matches "razón". A query of three
+or more characters only needs to verify the rows that contain all of its
+trigrams. Shorter queries scan every row.
+
+Results are ranked like the Postgres query in ``crud.verb``. 0 means a
+term is exactly the query, 1 means a term starts with it, and 2 means the
+query appears anywhere. A field holding alternatives such as "was/were"
+counts each alternative as its own term.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+RANK_EXACT, RANK_PREFIX, RANK_SUBSTRING = 0, 1, 2
+
+
+def fold(text: str) -> str:
+    """Lower-case ``text`` and strip combining accents."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def split_terms(value: str) -> Tuple[str, ...]:
+    """Folded alternatives of one field value ("was/were" -> ("was", "were"))."""
+    folded = fold(value or "")
+    return tuple(term.strip() for term in folded.split("/") if term.strip())
+
+
+def rank(terms: Sequence[str], needle: str) -> Optional[int]:
+    """Best rank of ``needle`` against ``terms``, or ``None`` when it does not match."""
+    best = None
+    for term in terms:
+        if term == needle:
+            return RANK_EXACT
+        if term.startswith(needle):
+            best = RANK_PREFIX
+        elif best is None and needle in term:
+            best = RANK_SUBSTRING
+    return best
+
+
+class NgramIndex:
+    """Immutable trigram -> row positions index over a list of documents."""
+
+    def __init__(self, documents: Iterable[Sequence[str]]) -> None:
+        self.documents: Tuple[Tuple[str, ...], ...] = tuple(tuple(doc) for doc in documents)
+        postings: Dict[str, List[int]] = {}
+        for position, terms in enumerate(self.documents):
+            grams: Set[str] = set()
+            for term in terms:
+                grams |= trigrams(term)
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self.postings: Dict[str, Tuple[int, ...]] = {g: tuple(p) for g, p in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def candidates(self, needle: str) -> Iterable[int]:
+        """Row positions that may contain ``needle``, in ascending order."""
+        grams = trigrams(needle)
+        if not grams:
+            return range(len(self.documents))
+        lists = sorted((self.postings.get(g, ()) for g in grams), key=len)
+        if not lists[0]:
+            return ()
+        found = set(lists[0])
+        for other in lists[1:]:
+            found.intersection_update(other)
+            if not found:
+                return ()
+        return sorted(found)
+
+    def search(self, query: str, limit: int) -> List[int]:
+        """Positions of matching rows, best rank first, index order within a rank."""
+        needle = fold(query).strip()
+        if not needle:
+            return []
+        ranked: List[Tuple[int, int]] = []
+        for position in self.candidates(needle):
+            found = rank(self.documents[position], needle)
+            if found is not None:
+                ranked.append((found, position))
+        ranked.sort()
+        return [position for _, position in ranked[:limit]]
@@ -0,0 +1,60 @@
+"""
+backend/scripts/bench_bcrypt_cost.py
+
+Calibrates the bcrypt work factor (BCRYPT_ROUNDS) for this hardware.
+Hashes a sample password at each cost in the range and recommends the
+highest cost whose median hash time stays under the target latency.
+
+Usage:
+    # From backend/
+    python -m scripts.bench_bcrypt_cost --target-ms 250
+    python -m scripts.bench_bcrypt_cost --min-rounds 10 --max-rounds 14 --samples 7
+"""
+import argparse
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+
+def time_rounds(rounds: int, samples: int) -> list:
+    ctx = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        ctx.hash("calibration-password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt cost calibration")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target median hash latency")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"🔐 bcrypt calibration (target {args.target_ms:.0f} ms per hash)")
+    print(f"{'rounds':>6} {'median ms':>10} {'p95 ms':>8} {'hashes/s/core':>14}")
+
+    recommended = None
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        timings = sorted(time_rounds(rounds, args.samples))
+        median = statistics.median(timings)
+        p95 = timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))]
+        print(f"{rounds:>6} {median:>10.1f} {p95:>8.1f} {1000 / median:>14.1f}")
+        if median <= args.target_ms:
+            recommended = rounds
+        elif recommended is not None:
+            # Each extra round doubles the cost; nothing above will fit.
+            break
+
+    if recommended is None:
+        print(f"⚠️  Even {args.min_rounds} rounds exceeds the target; lower --min-rounds.")
+    else:
+        print(f"✅ Recommended: BCRYPT_ROUNDS={recommended}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+backend/scripts/bench_serialization.py
+
+Compares the two ways a list route can respond:
+
+  validated  ORM objects -> response_model validation -> jsonable_encoder -> json
+  fast       Core rows (dicts) -> FastJSONResponse (orjson)
+
+Both are served by a throwaway FastAPI app through the TestClient, so the
+numbers include routing and the HTTP round trip. The SQLite database is
+seeded with verbs and user_progress rows (progress rows carry a datetime,
+which is where the encoders differ most). Also checks that both paths
+return the same JSON.
+
+It always runs on a throwaway SQLite file, never on DATABASE_URL.
+
+Usage (requires httpx):
+    # From backend/
+    python -m scripts.bench_serialization
+    python -m scripts.bench_serialization --sizes 1000 10000 50000 --repeat 10
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Overridden, not defaulted: seed() deletes every verb and progress row
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_serialization.db"
+os.environ.setdefault("SECRET_KEY", "bench-serialization")
+
+from typing import List
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.crud import get_verb_rows, get_verbs, list_user_progress, list_user_progress_rows
+from app.database import SessionLocal, create_tables, get_db
+from app.schemas import UserProgressOut, VerbOut
+from app.serialization import FastJSONResponse, orjson
+
+BENCH_USER_ID = 1
+
+
+def build_app() -> FastAPI:
+    bench = FastAPI()
+
+    @bench.get("/validated/verbs", response_model=List[VerbOut])
+    def validated_verbs(limit: int, db: Session = Depends(get_db)):
+        return get_verbs(db, limit=limit)
+
+    @bench.get("/fast/verbs", response_model=List[VerbOut])
+    def fast_verbs(limit: int, db: Session = Depends(get_db)):
+        return FastJSONResponse(get_verb_rows(db, limit=limit))
+
+    @bench.get("/validated/progress", response_model=List[UserProgressOut])
+    def validated_progress(db: Session = Depends(get_db)):
+        return list_user_progress(db, BENCH_USER_ID)
+
+    @bench.get("/fast/progress", response_model=List[UserProgressOut])
+    def fast_progress(db: Session = Depends(get_db)):
+        return FastJSONResponse(list_user_progress_rows(db, BENCH_USER_ID))
+
+    return bench
+
+
+def seed(n: int) -> None:
+    db = SessionLocal()
+    db.execute(delete(models.UserProgress))
+    db.execute(delete(models.Verb))
+    now = datetime.utcnow()
+    db.execute(insert(models.Verb), [
+        {
+            "id": i, "infinitive": f"verb{i:06d}", "past": f"past{i}", "participle": f"part{i}",
+            "translation": f"traducción {i}", "example_b2": f"Example sentence number {i}.",
+        }
+        for i in range(1, n + 1)
+    ])
+    db.execute(insert(models.UserProgress), [
+        {
+            "user_id": BENCH_USER_ID, "verb_id": i, "srs_date": now + timedelta(minutes=i),
+            "mistakes": i % 3, "streak": i % 5,
+        }
+        for i in range(1, n + 1)
+    ])
+    db.commit()
+    db.close()
+
+
+def time_get(client: TestClient, url: str, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List response serialization benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    create_tables()
+    client = TestClient(build_app())
+    encoder = "orjson" if orjson is not None else "json (orjson not installed)"
+    print(f"📦 Serialization benchmark, fast path encoder: {encoder}")
+    print(f"{'payload':>18} {'rows':>7} {'validated ms':>13} {'fast ms':>9} {'speedup':>8} {'same':>5}")
+
+    for n in args.sizes:
+        seed(n)
+        for name, suffix in (("verbs", f"verbs?limit={n}"), ("progress", "progress")):
+            slow = client.get(f"/validated/{suffix}").json()
+            fast = client.get(f"/fast/{suffix}").json()
+            validated_ms = statistics.median(time_get(client, f"/validated/{suffix}", args.repeat))
+            fast_ms = statistics.median(time_get(client, f"/fast/{suffix}", args.repeat))
+            print(
+                f"{name:>18} {n:>7} {validated_ms:>13.1f} {fast_ms:>9.1f} "
+                f"{validated_ms / fast_ms:>7.1f}x {'yes' if slow == fast else 'NO':>5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+backend/scripts/bench_srs_simulation.py
+
+Offline spaced-repetition simulation and throughput benchmark.
+
+N synthetic learners practise every simulated day for D days through the
+real crud functions: ``select_verbs_for_practice`` picks each session, and
+``update_user_progress`` (or ``apply_progress_batch`` with --batch) records
+the answers. Each call gets its own session, as a request would, and the
+simulated clock is passed as ``now``, so a month runs in seconds.
+
+Learners answer from a hidden memory model. A verb seen before is recalled
+with probability ``(1 + t / (9 S)) ** -1``, where t is the days since the
+learner last saw it and S its memory strength; a correct answer multiplies
+S by 2.5, a wrong one halves it. Learners differ in skill (first-try
+accuracy and initial strength) and in sessions per day (1 to 3).
+
+Reported for each scheduler (--schedulers, see app.srs):
+
+  latency      p50 / p95 / p99 / max ms per call, and SQL statements per call
+  queue        due cards per learner at the start of each day
+  load         reviews per learner per day, and the share of new verbs
+  accuracy     share of correct answers, i.e. what the scheduler buys
+
+The script drops and recreates every table of the database it runs on, so
+it never uses DATABASE_URL: by default it runs on a throwaway SQLite file
+in a temporary directory. Absolute latencies there are lower than against
+Postgres over a network; statements per call and the queue and load
+figures carry over. To measure a scratch Postgres, pass --database-url
+together with --drop-tables, which confirms that its data may be wiped.
+
+Usage:
+    # From backend/
+    python -m scripts.bench_srs_simulation
+    python -m scripts.bench_srs_simulation --users 200 --days 60 --schedulers doubling sm2 fsrs
+    python -m scripts.bench_srs_simulation --batch --verbs 1000
+    python -m scripts.bench_srs_simulation --database-url postgresql+psycopg2://bench@localhost/scratch --drop-tables
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+# Overridden, not defaulted: the app's engine must never point at a deployment's database here
+SCRATCH_DATABASE_URL = f"sqlite:///{tempfile.mkdtemp()}/bench_srs_simulation.db"
+os.environ["DATABASE_URL"] = SCRATCH_DATABASE_URL
+os.environ.setdefault("SECRET_KEY", "bench-srs-simulation")
+
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.crud import apply_progress_batch, select_verbs_for_practice, update_user_progress
+from app.database import Base
+from app.schemas import ProgressUpdateIn
+from app.settings import get_settings
+from app.srs import SCHEDULERS, get_scheduler
+
+SIM_START = datetime(2030, 1, 6, 7, 0)
+
+# Configured like app.database.SessionLocal; bound in main() to the scratch database
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+
+
+class Recorder:
+    """Latency and SQL statement count per operation."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.statements: Dict[str, List[int]] = defaultdict(list)
+        self._count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self._count += 1
+
+    def close(self) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+    def call(self, name: str, fn, *args, **kwargs):
+        before = self._count
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            result = fn(db, *args, **kwargs)
+        self.timings[name].append((time.perf_counter() - started) * 1000)
+        self.statements[name].append(self._count - before)
+        return result
+
+
+class Learner:
+    """Hidden memory model of one synthetic learner."""
+
+    def __init__(self, user_id: int, rng: random.Random) -> None:
+        self.user_id = user_id
+        self.rng = rng
+        self.skill = rng.uniform(0.3, 0.8)
+        self.sessions_per_day = rng.choice((1, 1, 2, 3))
+        self.memory: Dict[int, Tuple[float, datetime]] = {}  # verb_id -> (strength days, last seen)
+
+    def answer(self, verb_id: int, now: datetime) -> Tuple[bool, bool]:
+        """(correct, first time seen)."""
+        seen = self.memory.get(verb_id)
+        if seen is None:
+            recall = self.skill
+            strength = 0.5 + 1.5 * self.skill
+        else:
+            strength, last_seen = seen
+            elapsed = (now - last_seen).total_seconds() / 86_400
+            recall = (1 + elapsed / (9 * strength)) ** -1
+        correct = self.rng.random() < recall
+        self.memory[verb_id] = (strength * 2.5 if correct else max(0.3, strength * 0.5), now)
+        return correct, seen is None
+
+
+def reset_database(engine: Engine, verbs: int, users: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.execute(insert(models.Verb), [
+            {
+                "id": i, "infinitive": f"verb{i:05d}", "past": f"past{i}", "participle": f"part{i}",
+                "translation": f"traducción {i}", "example_b2": f"Example sentence number {i}.",
+            }
+            for i in range(1, verbs + 1)
+        ])
+        db.execute(insert(models.User), [
+            {"id": i, "username": f"learner{i}", "email": f"learner{i}@example.com", "total_xp": 0}
+            for i in range(1, users + 1)
+        ])
+        db.commit()
+
+
+def due_per_learner(now: datetime) -> Dict[int, int]:
+    P = models.UserProgress
+    with SessionLocal() as db:
+        return dict(db.execute(
+            select(P.user_id, func.count()).where(P.srs_date <= now).group_by(P.user_id)
+        ).all())
+
+
+def use_scheduler(name: str) -> None:
+    os.environ["SRS_SCHEDULER"] = name
+    get_settings.cache_clear()
+    get_scheduler.cache_clear()
+
+
+def pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def simulate(args, engine: Engine, scheduler: str) -> Dict[str, object]:
+    use_scheduler(scheduler)
+    reset_database(engine, args.verbs, args.users)
+    rng = random.Random(args.seed)
+    learners = [Learner(user_id, random.Random(rng.random())) for user_id in range(1, args.users + 1)]
+    recorder = Recorder(engine)
+    queue: List[Tuple[float, int]] = []
+    daily_reviews: List[int] = []
+    answered = correct_total = new_total = 0
+
+    started = time.perf_counter()
+    try:
+        for day in range(args.days):
+            day_start = SIM_START + timedelta(days=day)
+            due = due_per_learner(day_start)
+            queue.append((sum(due.values()) / len(learners), max(due.values(), default=0)))
+            rng.shuffle(learners)
+            for learner in learners:
+                reviews = 0
+                for session in range(learner.sessions_per_day):
+                    now = day_start + timedelta(hours=4 * session, minutes=learner.rng.uniform(0, 120))
+                    verbs = recorder.call("select_verbs_for_practice", select_verbs_for_practice,
+                                          learner.user_id, args.limit, now=now)
+                    answers = []
+                    for verb in verbs:
+                        ok, new = learner.answer(verb.id, now)
+                        answers.append((verb.id, ok))
+                        correct_total += ok
+                        new_total += new
+                    if args.batch and answers:
+                        recorder.call(
+                            "apply_progress_batch", apply_progress_batch, learner.user_id,
+                            [ProgressUpdateIn(verb_id=verb_id, is_correct=ok) for verb_id, ok in answers],
+                            create_missing=True, now=now,
+                        )
+                    else:
+                        for verb_id, ok in answers:
+                            recorder.call("update_user_progress", update_user_progress,
+                                          learner.user_id, verb_id, ok, now=now)
+                    reviews += len(answers)
+                answered += reviews
+                daily_reviews.append(reviews)
+    finally:
+        recorder.close()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scheduler": scheduler,
+        "elapsed": elapsed,
+        "timings": recorder.timings,
+        "statements": recorder.statements,
+        "queue": queue,
+        "daily_reviews": daily_reviews,
+        "answered": answered,
+        "accuracy": correct_total / answered if answered else 0.0,
+        "new_share": new_total / answered if answered else 0.0,
+        "sessions": len(recorder.timings["select_verbs_for_practice"]),
+    }
+
+
+def report(result: Dict[str, object], days: int) -> None:
+    print(f"\n🧪 Scheduler: {result['scheduler']}  ({result['elapsed']:.1f}s wall, {result['answered']} answers)")
+    print(f"{'call':>26} {'calls':>7} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'max ms':>7} {'stmts':>6} {'max':>4}")
+    busy_ms = 0.0
+    for name, timings in result["timings"].items():
+        statements = result["statements"][name]
+        busy_ms += sum(timings)
+        print(
+            f"{name:>26} {len(timings):>7} {pct(timings, 50):>7.2f} {pct(timings, 95):>7.2f} "
+            f"{pct(timings, 99):>7.2f} {max(timings):>7.2f} {sum(statements) / len(statements):>6.1f} "
+            f"{max(statements):>4}"
+        )
+    sessions = result["sessions"]
+    if sessions:
+        per_session_ms = busy_ms / sessions
+        print(f"  ≈ {per_session_ms:.1f} ms of database work per session "
+              f"→ {1000 / per_session_ms:.0f} sessions/s per worker thread")
+
+    print("  queue: due cards per learner at the start of the day (mean / max)")
+    step = max(1, days // 10)
+    marks = sorted(set(range(0, days, step)) | {days - 1})
+    print("   " + "  ".join(f"d{day + 1}:{result['queue'][day][0]:.1f}/{result['queue'][day][1]}" for day in marks))
+
+    load = result["daily_reviews"]
+    print(
+        f"  load: reviews per learner-day p50 {pct(load, 50):.0f}, p95 {pct(load, 95):.0f}, max {max(load)}; "
+        f"new verbs {result['new_share']:.0%}; accuracy {result['accuracy']:.1%}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline SRS simulation and throughput benchmark")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--verbs", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=10, help="Verbs per practice session")
+    parser.add_argument("--batch", action="store_true", help="Record answers with apply_progress_batch")
+    parser.add_argument("--schedulers", nargs="+", choices=sorted(SCHEDULERS), default=["doubling"])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-url", help="Run on this database instead of a throwaway SQLite file")
+    parser.add_argument("--drop-tables", action="store_true",
+                        help="Confirm that --database-url may have all its tables dropped")
+    args = parser.parse_args()
+    if args.database_url and not args.drop_tables:
+        parser.error("--database-url drops and recreates every table there; pass --drop-tables to confirm")
+
+    engine = create_engine(args.database_url or SCRATCH_DATABASE_URL)
+    SessionLocal.configure(bind=engine)
+
+    mode = "apply_progress_batch" if args.batch else "update_user_progress"
+    print(f"📈 SRS simulation: {args.users} learners × {args.days} days, {args.verbs} verbs, "
+          f"{args.limit} per session, answers via {mode}")
+    print(f"🗄️  Database: {engine.url.render_as_string(hide_password=True)}")
+    results = [simulate(args, engine, scheduler) for scheduler in args.schedulers]
+    for result in results:
+        report(result, args.days)
+
+    if len(results) > 1:
+        print(f"\n{'scheduler':>10} {'accuracy':>9} {'new':>5} {'due/learner end':>16} {'reviews p95':>12} {'select p95':>11}")
+        for result in results:
+            print(
+                f"{result['scheduler']:>10} {result['accuracy']:>9.1%} {result['new_share']:>5.0%} "
+                f"{result['queue'][-1][0]:>16.1f} {pct(result['daily_reviews'], 95):>12.0f} "
+                f"{pct(result['timings']['select_verbs_for_practice'], 95):>10.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+backend/scripts/reschedule_progress.py
+
+Recomputes every reviewed card's srs_date with the configured scheduler
+(SRS_SCHEDULER, SRS_MAX_INTERVAL_DAYS, SRS_DESIRED_RETENTION), or with the
+one named on the command line. Run it after changing the scheduler or its
+parameters; without it only cards answered afterwards follow the new rule.
+
+Cards are processed in committed chunks, each rescheduled in one NumPy pass
+and written with one bulk UPDATE, so it can be stopped and rerun safely.
+
+Usage:
+    # From backend/
+    python -m scripts.reschedule_progress
+    python -m scripts.reschedule_progress --scheduler sm2 --user-id 42
+"""
+import argparse
+import time
+
+from app.crud import reschedule_progress
+from app.database import SessionLocal
+from app.settings import get_settings
+from app.srs import SCHEDULERS, build_scheduler, get_scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute srs_date for reviewed cards")
+    parser.add_argument("--scheduler", choices=sorted(SCHEDULERS), help="Defaults to SRS_SCHEDULER")
+    parser.add_argument("--user-id", type=int, help="Only this user's cards")
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    scheduler = (
+        build_scheduler(args.scheduler, settings.SRS_MAX_INTERVAL_DAYS, settings.SRS_DESIRED_RETENTION)
+        if args.scheduler else get_scheduler()
+    )
+    print(f"🗓️  Rescheduling with {scheduler}...")
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        count = reschedule_progress(db, args.user_id, scheduler, args.chunk_size)
+    finally:
+        db.close()
+    print(f"✅ Rescheduled {count} cards in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+backend/tests/conftest.py
+
+Shared fixtures and the SQL query-budget helpers.
+
+Every test session runs the app in-process against a throwaway SQLite
+database seeded with the verb catalog; DATABASE_URL is overridden, never
+defaulted, so the suite cannot touch a configured database.
+
+Query budgets keep the hot endpoints from regressing into N+1 patterns::
+
+    def test_practice_select_budget(client, auth_headers, query_budget):
+        with query_budget(4):
+            client.get("/practice/select", headers=auth_headers)
+
+The budget counts every statement executed while the block runs, on the
+sync engine and, with DATABASE_ASYNC, the async one (the TestClient serves
+requests on another thread, so a listener is used rather than the
+per-request contextvar). Exceeding it fails the test and lists the
+statements, with repeats first, so N+1 regressions are easy to spot.
+The suite also runs with DATABASE_ASYNC=true (needs aiosqlite).
+
+Usage (requires requirements-dev.txt):
+    # From backend/
+    python -m pytest
+"""
+import itertools
+import os
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/tests.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["FEATURE_CONTENT_API_V1"] = "true"
+os.environ["FEATURE_CONTENT_ADMIN_WRITE_V1"] = "true"
+# Every request looks its user up, so budgets and stall checks see the worst case
+os.environ["PRINCIPAL_CACHE_SIZE"] = "0"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models
+from app.database import SessionLocal, async_engine, create_tables, engine as default_engine
+from app.main import app
+from app.seed import load_json_data, seed_verbs
+
+_usernames = itertools.count(1)
+
+
+class QueryLog:
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def summary(self, limit: int = 15) -> str:
+        lines = []
+        for sql, n in Counter(self.statements).most_common(limit):
+            lines.append(f"  {n:>4}x {' '.join(sql.split())[:160]}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, engine=None) -> Iterator[QueryLog]:
+    """Fail with ``AssertionError`` if the block runs more than ``max_queries`` statements."""
+    if engine is not None:
+        targets = [engine]
+    else:
+        targets = [default_engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    log = QueryLog()
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        log.statements.append(statement)
+
+    for target in targets:
+        event.listen(target, "before_cursor_execute", _record)
+    try:
+        yield log
+    finally:
+        for target in targets:
+            event.remove(target, "before_cursor_execute", _record)
+
+    if log.count > max_queries:
+        raise AssertionError(
+            f"Query budget exceeded: {log.count} statements (budget {max_queries})\n{log.summary()}"
+        )
+
+
+@pytest.fixture
+def query_budget():
+    """Factory fixture: ``with query_budget(n): ...`` asserts at most ``n`` statements."""
+    return assert_max_queries
+
+
+@pytest.fixture(scope="session")
+def seeded_db() -> None:
+    create_tables()
+    with SessionLocal() as db:
+        seed_verbs(db, load_json_data("irregular_verbs_b2.json"))
+
+
+@pytest.fixture(scope="session")
+def client(seeded_db) -> Iterator[TestClient]:
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def register_and_login(client: TestClient) -> Dict[str, str]:
+    """Authorization headers for a freshly registered user."""
+    username = f"learner{next(_usernames)}"
+    password = "password123"
+    response = client.post(
+        "/register", json={"username": username, "email": f"{username}@example.com", "password": password}
+    )
+    assert response.status_code == 200, response.text
+    response = client.post("/token", data={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def auth_headers(client) -> Dict[str, str]:
+    return register_and_login(client)
+
+
+@pytest.fixture
+def user_id(seeded_db) -> int:
+    """Id of a fresh user created straight in the database, for crud-level tests."""
+    username = f"learner{next(_usernames)}"
+    with SessionLocal() as db:
+        user = models.User(username=username, email=f"{username}@example.com", hashed_password="x", total_xp=0)
+        db.add(user)
+        db.commit()
+        return user.id
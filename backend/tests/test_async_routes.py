@@ -0,0 +1,22 @@
+"""
+The DATABASE_ASYNC routes must not fall back to the sync engine.
+
+Checked on the dependency tree, so it runs without the async driver: a sync
+``get_db`` anywhere under an async route (its auth dependency included)
+would tie up a threadpool thread and a sync pool connection per request.
+"""
+from app.database import get_async_db, get_db
+from app.routers.gameplay_async import router
+
+
+def _dependency_calls(dependant):
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from _dependency_calls(dependency)
+
+
+def test_async_routes_use_only_the_async_session():
+    for route in router.routes:
+        calls = set(_dependency_calls(route.dependant))
+        assert get_db not in calls, f"{route.path} depends on the sync session"
+        assert get_async_db in calls, route.path
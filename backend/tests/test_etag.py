@@ -0,0 +1,99 @@
+"""
+ETag / If-None-Match on the catalog endpoints.
+"""
+import json
+
+import pytest
+
+
+def verb(infinitive: str) -> dict:
+    return {
+        "infinitive": infinitive, "past": f"{infinitive}ed", "participle": f"{infinitive}ed",
+        "translation": "etiquetar", "example_b2": "ETag test.",
+    }
+
+
+@pytest.fixture
+def etag_of(client, auth_headers):
+    def fetch(path: str = "/verbs") -> str:
+        response = client.get(path, headers=auth_headers)
+        assert response.status_code == 200
+        return response.headers["ETag"]
+    return fetch
+
+
+def test_matching_if_none_match_is_304(client, auth_headers, etag_of):
+    etag = etag_of()
+
+    for header in (etag, f"W/{etag}", f'"stale", {etag}', f'W/"stale",W/{etag}', "*"):
+        response = client.get("/verbs", headers={**auth_headers, "If-None-Match": header})
+        assert response.status_code == 304, header
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+
+def test_non_matching_tag_gets_200_with_current_etag(client, auth_headers, etag_of):
+    etag = etag_of()
+
+    response = client.get("/verbs", headers={**auth_headers, "If-None-Match": '"stale", W/"older"'})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == etag
+    assert len(response.json()) > 0
+
+
+def test_etag_depends_on_query_string(etag_of):
+    assert etag_of("/verbs?limit=5") != etag_of("/verbs?limit=6")
+
+
+def test_verb_writes_change_the_etag(client, auth_headers, etag_of):
+    etag = etag_of()
+    created = client.post("/verbs", headers=auth_headers, json=verb("etagone")).json()
+    after_create = etag_of()
+    assert after_create != etag
+
+    response = client.post(
+        "/verbs/import", headers={**auth_headers, "Content-Type": "application/json"},
+        content=json.dumps([verb("etagtwo")]),
+    )
+    assert response.json()["inserted"] == 1
+    after_import = etag_of()
+    assert after_import != after_create
+
+    client.patch(f"/verbs/{created['id']}", headers=auth_headers, json={"translation": "marcar"})
+    after_edit = etag_of()
+    assert after_edit != after_import
+
+    # The client's old tag no longer matches
+    response = client.get("/verbs", headers={**auth_headers, "If-None-Match": after_import})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == after_edit
+
+
+def test_unchanged_import_keeps_the_etag(client, auth_headers, etag_of):
+    client.post("/verbs", headers=auth_headers, json=verb("etagthree"))
+    etag = etag_of()
+
+    response = client.post(
+        "/verbs/import", headers={**auth_headers, "Content-Type": "application/json"},
+        content=json.dumps([verb("etagthree")]),
+    )
+
+    assert response.json() == {"inserted": 0, "skipped": 1, "invalid": 0}
+    assert etag_of() == etag
+
+
+def test_tense_writes_change_their_listing_etag(client, auth_headers, etag_of):
+    tenses = etag_of("/tenses")
+    verbs = etag_of()
+
+    tense = client.post("/tenses", headers=auth_headers, json={"code": "etag_tense", "name": "ETag"}).json()
+    assert etag_of("/tenses") != tenses
+    assert etag_of() == verbs
+
+    examples = etag_of(f"/tenses/{tense['id']}/examples")
+    client.post(
+        f"/tenses/{tense['id']}/examples", headers=auth_headers,
+        json={"tense_id": tense["id"], "verb_id": 1, "sentence": "It was tagged."},
+    )
+    assert etag_of(f"/tenses/{tense['id']}/examples") != examples
@@ -0,0 +1,125 @@
+"""
+Regression test for event-loop blocking in the auth path.
+
+Runs the app in-process (httpx ASGI transport) with an artificial latency on
+every SQL statement to simulate a network round trip to Postgres, and fires
+concurrent admin content writes, public content reads, practice sessions and
+logins while a probe task measures how late the event loop wakes up.
+
+Two kinds of regressions fail it:
+
+* a synchronous query inside ``async def`` (e.g. an auth dependency):
+  every statement executed on the event-loop thread is counted;
+* a password hash verified on the loop thread instead of the password
+  pool: every in-process ``CryptContext.verify`` call is counted;
+* any other blocking call on the loop, which shows up as a stall beyond
+  ``MAX_STALL_MS``.
+
+Worker threads still compete with the loop for the GIL, and the password
+pool's processes for the CPU, so small stalls are expected; logins use the
+suite's cheap bcrypt cost so that a single-core runner is not saturated,
+and the garbage collector is frozen during the run so that a full
+collection of the test process heap does not add to them.
+"""
+import asyncio
+import gc
+import os
+import threading
+import time
+
+import httpx
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import event
+
+from app import models
+from app.auth import create_access_token
+from app.database import SessionLocal, engine
+from app.main import app
+from app.password_pool import build_crypt_context
+from app.settings import get_settings
+
+DB_LATENCY_MS = 25
+# On a single core every worker thread and pool process competes with the loop for it
+MAX_STALL_MS = 250 if (os.cpu_count() or 1) > 1 else 500
+PROBE_INTERVAL = 0.002
+
+
+@pytest.fixture(scope="module")
+def stall_users(seeded_db):
+    hashed_password = build_crypt_context(get_settings().BCRYPT_ROUNDS).hash("password123")
+    with SessionLocal() as db:
+        db.add_all(
+            models.User(
+                username=f"stall_{name}", email=f"stall_{name}@example.com",
+                hashed_password=hashed_password, total_xp=0,
+            )
+            for name in ("admin", "login")
+        )
+        db.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': 'stall_admin'})}"}
+
+
+async def probe_loop(lags: list, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(max(loop.time() - started - PROBE_INTERVAL, 0.0))
+
+
+async def run_load(headers: dict, monkeypatch, requests: int = 20) -> tuple:
+    loop_thread = threading.get_ident()
+    on_loop = []
+    verify = CryptContext.verify
+
+    def simulated_round_trip(conn, cursor, statement, *_):
+        if threading.get_ident() == loop_thread:
+            on_loop.append(statement.split(None, 1)[0])
+        time.sleep(DB_LATENCY_MS / 1000)
+
+    def recording_verify(self, *args, **kwargs):
+        if threading.get_ident() == loop_thread:
+            on_loop.append("bcrypt verify")
+        return verify(self, *args, **kwargs)
+
+    monkeypatch.setattr(CryptContext, "verify", recording_verify)
+    event.listen(engine, "before_cursor_execute", simulated_round_trip)
+    lags: list = []
+    stop = asyncio.Event()
+    gc.collect()
+    gc.freeze()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://stall") as client:
+            probe = asyncio.create_task(probe_loop(lags, stop))
+            run_id = time.monotonic_ns()
+            calls = [
+                client.post(
+                    "/admin/content",
+                    headers=headers,
+                    json={"slug": f"stall-{run_id}-{i}", "title": "Stall", "body": "Body"},
+                )
+                for i in range(requests)
+            ]
+            calls += [client.get("/content") for _ in range(requests)]
+            calls += [client.get("/practice/select", headers=headers) for _ in range(requests)]
+            calls += [
+                client.post("/token", data={"username": "stall_login", "password": "password123"})
+                for _ in range(4)
+            ]
+            responses = await asyncio.gather(*calls)
+            stop.set()
+            await probe
+    finally:
+        gc.unfreeze()
+        event.remove(engine, "before_cursor_execute", simulated_round_trip)
+    return responses, on_loop, max(lags, default=0.0) * 1000
+
+
+def test_requests_do_not_block_the_event_loop(stall_users, monkeypatch):
+    responses, on_loop, worst_stall_ms = asyncio.run(run_load(stall_users, monkeypatch))
+
+    assert [r.status_code for r in responses if r.status_code >= 400] == []
+    assert on_loop == [], f"blocking calls ran on the event-loop thread: {on_loop}"
+    assert worst_stall_ms < MAX_STALL_MS, f"event loop stalled {worst_stall_ms:.1f} ms"
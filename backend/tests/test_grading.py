@@ -0,0 +1,80 @@
+"""
+Free-text answer grading: result classes and recognised forms.
+"""
+import pytest
+
+from app.grading import FormIndex, edit_distance
+
+ROWS = [
+    {"id": 1, "infinitive": "go", "past": "went", "participle": "gone"},
+    {"id": 2, "infinitive": "learn", "past": "learnt/learned", "participle": "learnt/learned"},
+    {"id": 3, "infinitive": "bring", "past": "brought", "participle": "brought"},
+    {"id": 4, "infinitive": "sing", "past": "sang", "participle": "sung"},
+]
+
+
+@pytest.fixture(scope="module")
+def forms():
+    return FormIndex(ROWS)
+
+
+@pytest.mark.parametrize("verb_id, form, answer, result, suggestion", [
+    (1, "past", "went", "correct", None),
+    (1, "past", "  WENT ", "correct", None),
+    (2, "past", "learnt", "correct", None),
+    (2, "past", "learned", "alternative", None),
+    (3, "past", "brougth", "near_miss", "brought"),
+    (3, "past", "brough", "near_miss", "brought"),
+    (1, "participle", "gon", "near_miss", "gone"),
+    (1, "past", "goed", "incorrect", None),
+    (4, "participle", "zzzz", "incorrect", None),
+])
+def test_result_classes(forms, verb_id, form, answer, result, suggestion):
+    grade = forms.grade(verb_id, form, answer)
+
+    assert grade.result == result
+    assert grade.is_correct == (result in ("correct", "alternative"))
+    assert grade.suggestion == suggestion
+    assert grade.answer == answer
+
+
+def test_real_form_of_the_wrong_slot_is_recognized(forms):
+    # "went" is the past of go, not a typo of "gone"
+    grade = forms.grade(1, "participle", "went")
+
+    assert grade.result == "incorrect"
+    assert grade.expected == "gone"
+    assert grade.suggestion == "gone"
+    assert grade.recognized_as == {"verb_id": 1, "form": "past", "text": "went"}
+
+
+def test_other_verbs_form_is_recognized_with_a_typo(forms):
+    # "sang" is a real form (sing), so it is not a near miss of "sung"
+    assert forms.grade(4, "participle", "sang").recognized_as == {"verb_id": 4, "form": "past", "text": "sang"}
+    grade = forms.grade(1, "past", "brougt")
+    assert grade.result == "incorrect"
+    assert grade.recognized_as == {"verb_id": 3, "form": "past", "text": "brought"}
+
+
+def test_unknown_verb_is_none(forms):
+    assert forms.grade(99, "past", "went") is None
+
+
+def test_edit_distance_counts_transpositions_once():
+    assert edit_distance("brougth", "brought") == 1
+    assert edit_distance("went", "gone") == 3
+    assert edit_distance("a", "abcdef", limit=2) == 3
+
+
+def test_grade_endpoint(client, auth_headers):
+    verb = client.get("/verbs/search", params={"q": "go"}, headers=auth_headers).json()[0]
+    assert verb["infinitive"] == "go"
+
+    response = client.post(f"/verbs/{verb['id']}/grade", headers=auth_headers, json={"form": "participle", "answer": "went"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["result"] == "incorrect"
+    assert body["recognized_as"]["form"] == "past"
+
+    missing = client.post("/verbs/999999/grade", headers=auth_headers, json={"form": "past", "answer": "went"})
+    assert missing.status_code == 404
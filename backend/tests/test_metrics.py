@@ -0,0 +1,58 @@
+"""
+Prometheus exposition of the ``stats()`` collectors.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.metrics import DB_POOL_CHECKOUT_WAIT, InstrumentedAsyncQueuePool, collector_from_stats
+
+
+def test_stats_counters_gauges_and_info():
+    collect = collector_from_stats(
+        "demo_cache", "Demo cache", lambda: {"hits": 3, "size": 2, "maxsize": 10, "ttl_seconds": 60.5, "enabled": True},
+    )
+    lines = collect()
+
+    assert "# TYPE demo_cache_hits_total counter" in lines
+    assert "demo_cache_hits_total 3" in lines
+    assert "# TYPE demo_cache_size gauge" in lines
+    assert 'demo_cache_info{maxsize="10",ttl_seconds="60.5"} 1' in lines
+    assert not any(line.startswith(("demo_cache_maxsize", "demo_cache_enabled")) for line in lines)
+
+
+def test_metrics_endpoint_types_cache_counters(client):
+    body = client.get("/metrics").text
+
+    for name in ("principal_cache_hits_total", "principal_cache_evictions_total", "password_pool_rejected_total"):
+        assert f"# TYPE {name} counter" in body
+    assert "principal_cache_info{" in body
+    assert "\nprincipal_cache_maxsize " not in body
+
+
+def test_checkout_wait_is_labelled_by_engine(client, tmp_path):
+    client.get("/verbs")
+    pytest.importorskip("aiosqlite")
+
+    async def query_async_pool():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/wait.db", poolclass=InstrumentedAsyncQueuePool,
+        )
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    asyncio.run(query_async_pool())
+    samples = DB_POOL_CHECKOUT_WAIT.samples()
+
+    assert any(line.startswith('db_pool_checkout_wait_seconds_count{engine="sync"}') for line in samples)
+    assert any(line.startswith('db_pool_checkout_wait_seconds_count{engine="async"}') for line in samples)
+
+
+def test_dev_startup_reports_every_phase(client):
+    body = client.get("/metrics").text
+
+    for phase in ("imports", "first_query", "create_all", "verb_catalog"):
+        assert f'startup_phase_seconds{{phase="{phase}"}}' in body
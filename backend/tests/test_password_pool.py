@@ -0,0 +1,59 @@
+"""
+Password pool back-pressure and the in-process fallback.
+"""
+import asyncio
+
+from fastapi import HTTPException
+
+from app.password_pool import PasswordPool, password_pool
+
+from .conftest import register_and_login
+
+CREDENTIALS = {"username": "pool_learner", "password": "password123"}
+
+
+def test_login_rejected_with_retry_after_when_pool_is_full(client, monkeypatch):
+    client.post("/register", json={**CREDENTIALS, "email": "pool_learner@example.com"})
+    monkeypatch.setattr(password_pool, "max_pending", 0)
+    rejected = password_pool.rejected
+
+    response = client.post("/token", data=CREDENTIALS)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert password_pool.rejected == rejected + 1
+
+
+def test_pending_jobs_are_capped():
+    pool = PasswordPool(workers=0, max_pending=1, rounds=4)
+
+    async def two_hashes():
+        return await asyncio.gather(pool.hash("first"), pool.hash("second"), return_exceptions=True)
+
+    first, second = asyncio.run(two_hashes())
+    assert first.startswith("$2b$04$")
+    assert isinstance(second, HTTPException) and second.status_code == 503
+    assert pool.stats()["rejected"] == 1
+    assert pool.pending == 0
+
+
+def test_workers_zero_runs_in_process(client, monkeypatch):
+    monkeypatch.setattr(password_pool, "workers", 0)
+    monkeypatch.setattr(password_pool, "_executor", None)
+
+    verified = password_pool.stats()["verify"]["count"]
+
+    register_and_login(client)
+
+    assert password_pool._executor is None
+    assert password_pool.stats()["verify"]["count"] == verified + 1
+
+
+def test_in_process_pool_verifies():
+    pool = PasswordPool(workers=0, max_pending=8, rounds=4)
+    hashed = asyncio.run(pool.hash("password123"))
+
+    assert asyncio.run(pool.verify("password123", hashed)) is True
+    assert asyncio.run(pool.verify("wrong", hashed)) is False
+    assert pool._get_executor() is None
+    assert pool.stats()["verify"]["count"] == 2
@@ -0,0 +1,83 @@
+"""
+Practice session selection: bucket order and the wrapping "new" run.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.crud import progress as progress_crud
+from app.crud import select_verbs_for_practice
+from app.database import SessionLocal
+
+NOW = datetime(2030, 3, 1, 12, 0)
+
+
+@pytest.fixture
+def db(seeded_db):
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def pivot(monkeypatch):
+    """Fix the random pivot of the "new" bucket to a fraction of the id range."""
+    def set_fraction(fraction: float) -> None:
+        monkeypatch.setattr(progress_crud.random, "random", lambda: fraction)
+    return set_fraction
+
+
+def verb_ids(db):
+    return list(db.scalars(select(models.Verb.id).order_by(models.Verb.id)))
+
+
+def add_progress(db, user_id, verb_id, srs_date, streak=0):
+    db.add(models.UserProgress(user_id=user_id, verb_id=verb_id, srs_date=srs_date, streak=streak))
+
+
+def test_due_then_new_then_review(db, user_id, pivot):
+    ids = verb_ids(db)
+    due_old, due_recent, review_strong, review_weak = ids[10], ids[3], ids[20], ids[30]
+    add_progress(db, user_id, due_recent, NOW - timedelta(days=1))
+    add_progress(db, user_id, due_old, NOW - timedelta(days=5))
+    add_progress(db, user_id, review_strong, NOW + timedelta(days=9), streak=4)
+    add_progress(db, user_id, review_weak, NOW + timedelta(days=2), streak=1)
+    db.commit()
+    pivot(0.0)
+
+    session = [verb.id for verb in select_verbs_for_practice(db, user_id, limit=len(ids), now=NOW)]
+
+    seen = {due_old, due_recent, review_strong, review_weak}
+    assert session == [due_old, due_recent] + [i for i in ids if i not in seen] + [review_weak, review_strong]
+
+
+def test_new_bucket_is_a_run_from_the_pivot(db, user_id, pivot):
+    ids = verb_ids(db)
+    pivot(0.5)
+    start = int(ids[0] + (ids[-1] - ids[0]) * 0.5)
+
+    session = [verb.id for verb in select_verbs_for_practice(db, user_id, limit=5, now=NOW)]
+
+    assert session == [i for i in ids if i >= start][:5]
+
+
+def test_new_bucket_wraps_past_the_highest_id(db, user_id, pivot):
+    ids = verb_ids(db)
+    pivot(1.0)
+
+    session = [verb.id for verb in select_verbs_for_practice(db, user_id, limit=4, now=NOW)]
+
+    assert session == [ids[-1]] + ids[:3]
+
+
+def test_started_verbs_leave_the_new_bucket(db, user_id, pivot):
+    ids = verb_ids(db)
+    pivot(0.0)
+    select_verbs_for_practice(db, user_id, limit=3, now=NOW)
+
+    # Started verbs are due right away, so they come back first; the run of new verbs continues after them
+    session = [verb.id for verb in select_verbs_for_practice(db, user_id, limit=5, now=NOW)]
+    assert session == ids[:5]
+    session = [verb.id for verb in select_verbs_for_practice(db, user_id, limit=7, now=NOW - timedelta(hours=1))]
+    assert session == ids[5:12]
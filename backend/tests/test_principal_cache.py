@@ -0,0 +1,77 @@
+"""
+TTLCache eviction and expiry, and the principal cache staying fresh after
+XP writes (the rest of the suite runs with the cache off).
+"""
+import pytest
+
+from app import cache as cache_module
+from app.cache import TTLCache
+from app.crud import principal_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cached_principals(monkeypatch):
+    monkeypatch.setattr(principal_cache, "maxsize", 100)
+    principal_cache.clear()
+    yield principal_cache
+    principal_cache.clear()
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    clock[0] += 29
+    assert cache.get("a") == 1
+    clock[0] += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_disabled_with_zero_size():
+    cache = TTLCache(maxsize=0, ttl=30)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_me_shows_xp_after_update_user_xp(client, auth_headers, cached_principals):
+    me = client.get("/me", headers=auth_headers).json()
+    assert len(cached_principals) == 1
+
+    response = client.post(f"/users/{me['id']}/xp", params={"xp_gain": 25}, headers=auth_headers)
+    assert response.status_code == 200
+
+    assert client.get("/me", headers=auth_headers).json()["total_xp"] == me["total_xp"] + 25
+
+
+def test_me_shows_xp_after_progress_batch(client, auth_headers, cached_principals):
+    client.post("/progress/init", headers=auth_headers)
+    before = client.get("/me", headers=auth_headers).json()["total_xp"]
+    verb_id = client.get("/practice/select", params={"limit": 1}, headers=auth_headers).json()[0]["id"]
+
+    response = client.post(
+        "/progress/batch", headers=auth_headers, json={"answers": [{"verb_id": verb_id, "is_correct": True}]}
+    )
+    assert response.status_code == 200
+    xp_gained = response.json()["xp_gained"]
+    assert xp_gained > 0
+
+    assert client.get("/me", headers=auth_headers).json()["total_xp"] == before + xp_gained
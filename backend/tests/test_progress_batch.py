@@ -0,0 +1,86 @@
+"""
+/progress/batch: answers folded in order, XP, and all-or-nothing writes.
+"""
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app import models
+from app.crud import apply_progress_batch, initialize_user_progress
+from app.database import SessionLocal
+from app.schemas import ProgressUpdateIn
+from app.srs import ReviewState, review
+
+NOW = datetime(2030, 5, 1, 9, 0)
+
+
+def answers(*pairs):
+    return [ProgressUpdateIn(verb_id=verb_id, is_correct=correct) for verb_id, correct in pairs]
+
+
+def progress_of(db, user_id, verb_id) -> models.UserProgress:
+    P = models.UserProgress
+    return db.scalars(select(P).where(P.user_id == user_id, P.verb_id == verb_id)).one()
+
+
+def total_xp(db, user_id) -> int:
+    return db.scalar(select(models.User.total_xp).where(models.User.id == user_id))
+
+
+def verb_ids(db, n):
+    return list(db.scalars(select(models.Verb.id).order_by(models.Verb.id).limit(n)))
+
+
+def test_repeated_verb_is_folded_in_order(user_id):
+    with SessionLocal() as db:
+        initialize_user_progress(db, user_id)
+        a, b = verb_ids(db, 2)
+        row = progress_of(db, user_id, a)
+        state = ReviewState(row.streak, row.mistakes, row.srs_date, row.ease, row.last_reviewed_at)
+        expected_xp = 0
+        for correct in (True, True, False, True):
+            state, xp = review(state, correct, NOW)
+            expected_xp += xp
+
+        result = apply_progress_batch(db, user_id, answers((a, True), (b, True), (a, True), (a, False), (a, True)), now=NOW)
+
+        db.expire_all()
+        row = progress_of(db, user_id, a)
+        assert (row.streak, row.mistakes, row.srs_date, row.ease) == (state.streak, state.mistakes, state.srs_date, state.ease)
+        assert [p["verb_id"] for p in result["progress"]] == [a, b]
+        assert result["xp_gained"] == expected_xp + 20
+        assert total_xp(db, user_id) == result["xp_gained"]
+
+
+def test_xp_is_the_sum_of_per_answer_gains(client, auth_headers):
+    client.post("/progress/init", headers=auth_headers)
+    ids = [verb["id"] for verb in client.get("/verbs", params={"limit": 4}, headers=auth_headers).json()]
+    before = client.get("/me", headers=auth_headers).json()["total_xp"]
+
+    response = client.post("/progress/batch", headers=auth_headers, json={"answers": [
+        {"verb_id": verb_id, "is_correct": correct} for verb_id, correct in zip(ids, (True, True, True, False))
+    ]})
+
+    assert response.status_code == 200
+    # Three first correct answers (10 * (1 + 1) each) and one wrong answer (2)
+    assert response.json()["xp_gained"] == 62
+    assert client.get("/me", headers=auth_headers).json()["total_xp"] == before + 62
+
+
+def test_missing_verb_is_404_and_writes_nothing(client, auth_headers):
+    client.post("/progress/init", headers=auth_headers)
+    me = client.get("/me", headers=auth_headers).json()
+    verb_id = client.get("/verbs", params={"limit": 1}, headers=auth_headers).json()[0]["id"]
+    with SessionLocal() as db:
+        before = progress_of(db, me["id"], verb_id)
+
+    response = client.post("/progress/batch", headers=auth_headers, json={"answers": [
+        {"verb_id": verb_id, "is_correct": True}, {"verb_id": 999999, "is_correct": True},
+    ]})
+
+    assert response.status_code == 404
+    assert "999999" in response.json()["detail"]
+    with SessionLocal() as db:
+        after = progress_of(db, me["id"], verb_id)
+        assert (after.streak, after.srs_date, after.last_reviewed_at) == (before.streak, before.srs_date, before.last_reviewed_at)
+        assert total_xp(db, me["id"]) == me["total_xp"]
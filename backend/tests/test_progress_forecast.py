@@ -0,0 +1,65 @@
+"""
+/progress/forecast: due reviews bucketed per UTC day by the database.
+"""
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import select, update
+
+from app import models
+from app.crud import FORECAST_MAX_DAYS, get_progress_forecast, initialize_user_progress, progress_forecast_cache
+from app.database import SessionLocal
+
+# Days from today on which each scheduled verb falls due
+DUE_OFFSETS = [-3, -1, -1, 0, 0, 0, 1, 6, 6, FORECAST_MAX_DAYS - 1, FORECAST_MAX_DAYS]
+
+
+def schedule(db, user_id, offsets):
+    """Put the user's verbs on ``offsets`` (one verb each) and the rest beyond the window."""
+    P = models.UserProgress
+    today = datetime.utcnow().date()
+    verb_ids = list(db.scalars(select(P.verb_id).where(P.user_id == user_id).order_by(P.verb_id)))
+    far = datetime.combine(today + timedelta(days=FORECAST_MAX_DAYS + 10), time(12))
+    db.execute(update(P).where(P.user_id == user_id).values(srs_date=far))
+    for verb_id, offset in zip(verb_ids, offsets):
+        # Both ends of the day, so the bucketing truncates rather than rounds
+        at = time(0, 0, 1) if offset % 2 else time(23, 59, 59)
+        due = datetime.combine(today + timedelta(days=offset), at)
+        db.execute(update(P).where(P.user_id == user_id, P.verb_id == verb_id).values(srs_date=due))
+    db.commit()
+    return today
+
+
+def test_forecast_buckets_per_day_and_counts_overdue(user_id):
+    with SessionLocal() as db:
+        initialize_user_progress(db, user_id)
+        today = schedule(db, user_id, DUE_OFFSETS)
+        progress_forecast_cache.invalidate(user_id)
+
+        week = get_progress_forecast(db, user_id, days=7)
+        month = get_progress_forecast(db, user_id, days=FORECAST_MAX_DAYS)
+
+    assert week["overdue"] == 3
+    assert [day["date"] for day in week["forecast"]] == [today + timedelta(days=n) for n in range(7)]
+    # Today's bucket carries the overdue reviews as well as its own
+    assert [day["due"] for day in week["forecast"]] == [3 + 3, 1, 0, 0, 0, 0, 2]
+    assert week["total"] == 9
+
+    assert month["overdue"] == 3
+    assert len(month["forecast"]) == FORECAST_MAX_DAYS
+    assert month["forecast"][-1]["due"] == 1
+    # The verb due on day FORECAST_MAX_DAYS is past the horizon
+    assert month["total"] == len(DUE_OFFSETS) - 1
+
+
+def test_forecast_route(client, auth_headers):
+    client.post("/progress/init", headers=auth_headers)
+
+    response = client.get("/progress/forecast", params={"days": 3}, headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["days"] == 3 and len(body["forecast"]) == 3
+    # Rows created by /progress/init are due right away
+    assert body["forecast"][0]["due"] == body["total"] > 0
+    too_far = client.get("/progress/forecast", params={"days": FORECAST_MAX_DAYS + 1}, headers=auth_headers)
+    assert too_far.status_code == 422
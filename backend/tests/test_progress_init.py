@@ -0,0 +1,83 @@
+"""
+/progress/init idempotence and the user_progress de-duplication migration.
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.database import Base, SessionLocal
+from app.migrations import MIGRATIONS
+
+
+def progress_counts(user_id: int):
+    P = models.UserProgress
+    with SessionLocal() as db:
+        rows = db.scalar(select(func.count()).where(P.user_id == user_id))
+        distinct = db.scalar(select(func.count(func.distinct(P.verb_id))).where(P.user_id == user_id))
+        verbs = db.scalar(select(func.count()).select_from(models.Verb))
+    return rows, distinct, verbs
+
+
+def test_init_twice_inserts_nothing_the_second_time(client, auth_headers):
+    user_id = client.get("/me", headers=auth_headers).json()["id"]
+    first = client.post("/progress/init", headers=auth_headers).json()
+    rows, distinct, verbs = progress_counts(user_id)
+
+    assert first == {"initialized": verbs}
+    assert rows == distinct == verbs
+    assert client.post("/progress/init", headers=auth_headers).json() == {"initialized": 0}
+    assert progress_counts(user_id) == (rows, distinct, verbs)
+
+
+def test_init_counts_only_missing_verbs(client, auth_headers):
+    user_id = client.get("/me", headers=auth_headers).json()["id"]
+    started = len(client.get("/practice/select", params={"limit": 7}, headers=auth_headers).json())
+
+    response = client.post("/progress/init", headers=auth_headers).json()
+
+    rows, distinct, verbs = progress_counts(user_id)
+    assert started == 7
+    assert response == {"initialized": verbs - started}
+    assert rows == distinct == verbs
+
+
+def run_migration(engine, version: int) -> None:
+    with engine.begin() as conn:
+        for step in MIGRATIONS[version]:
+            if callable(step):
+                step(conn)
+            else:
+                conn.exec_driver_sql(step)
+
+
+def test_dedup_migration_keeps_the_oldest_row(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/dedup.db")
+    Base.metadata.create_all(engine)
+    P = models.UserProgress.__table__
+    with engine.begin() as conn:
+        # A database from before the unique index
+        conn.exec_driver_sql("DROP INDEX uq_user_progress_user_verb")
+        conn.exec_driver_sql("DROP INDEX ix_user_progress_user_srs_date")
+        day = datetime(2030, 1, 1)
+        conn.execute(insert(P), [
+            {"id": 1, "user_id": 1, "verb_id": 1, "srs_date": day, "streak": 3},
+            {"id": 2, "user_id": 1, "verb_id": 1, "srs_date": day, "streak": 0},
+            {"id": 3, "user_id": 1, "verb_id": 2, "srs_date": day, "streak": 1},
+            {"id": 4, "user_id": 1, "verb_id": 1, "srs_date": day, "streak": 0},
+            {"id": 5, "user_id": 2, "verb_id": 1, "srs_date": day, "streak": 2},
+            {"id": 6, "user_id": 2, "verb_id": 2, "srs_date": day, "streak": 0},
+            {"id": 7, "user_id": 2, "verb_id": 2, "srs_date": day, "streak": 0},
+        ])
+
+    run_migration(engine, 5)
+    run_migration(engine, 5)  # steps are idempotent
+
+    with engine.begin() as conn:
+        rows = conn.execute(select(P.c.id, P.c.user_id, P.c.verb_id, P.c.streak).order_by(P.c.id)).all()
+        assert [tuple(row) for row in rows] == [(1, 1, 1, 3), (3, 1, 2, 1), (5, 2, 1, 2), (6, 2, 2, 0)]
+    with pytest.raises(IntegrityError), engine.begin() as conn:
+        conn.execute(insert(P).values(user_id=1, verb_id=1, srs_date=day))
+    engine.dispose()
@@ -0,0 +1,46 @@
+"""
+SQL statement budgets for the gameplay hot paths.
+
+Each budget includes the users lookup behind the bearer token (the principal
+cache is off in tests) and must not grow with the number of verbs or the
+session size: a per-verb query shows up as a budget failure listing the
+repeated statement.
+"""
+
+
+def test_progress_init_budget(client, auth_headers, query_budget):
+    with query_budget(4):
+        response = client.post("/progress/init", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["initialized"] > 0
+
+    # Already initialized: nothing to insert, same budget
+    with query_budget(4):
+        response = client.post("/progress/init", headers=auth_headers)
+    assert response.json() == {"initialized": 0}
+
+
+def test_practice_select_budget(client, auth_headers, query_budget):
+    # A new user's first session also creates progress rows for the new verbs
+    # and seeds the user's user_stats row
+    with query_budget(5):
+        response = client.get("/practice/select", params={"limit": 50}, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 50
+
+    with query_budget(4):
+        response = client.get("/practice/select", params={"limit": 10}, headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_progress_update_budget(client, auth_headers, query_budget):
+    client.post("/progress/init", headers=auth_headers)
+    verb_ids = [verb["id"] for verb in client.get("/practice/select", headers=auth_headers).json()]
+
+    for verb_id, correct in zip(verb_ids, (True, False, True)):
+        with query_budget(6):
+            response = client.post(
+                "/progress/update", headers=auth_headers, json={"verb_id": verb_id, "is_correct": correct}
+            )
+        assert response.status_code == 200
+        assert response.json()["verb_id"] == verb_id
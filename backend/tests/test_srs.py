@@ -0,0 +1,92 @@
+"""
+app.srs: each scheduler's interval sequence, and batch rescheduling agreeing
+with review-by-review scheduling.
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import srs
+from app.srs import DEFAULT_EASE, SCHEDULERS, ReviewState, build_scheduler, reschedule, review
+
+NOW = datetime(2030, 5, 1, 9, 0)
+
+# Days to the next review after 1, 2, ... correct answers in a row, uncapped
+INTERVALS = {
+    "doubling": [2, 4, 8, 16, 32, 64],
+    "sm2": [1, 6, 15, 37.5, 93.75, 234.375],
+    "fsrs": [2, 4.48, 10.3968, 24.9743, 62.0409, 159.2525],
+}
+
+
+def intervals_after_correct_answers(scheduler, answers):
+    state, intervals = ReviewState(0, 0, NOW), []
+    for _ in range(answers):
+        state, _ = review(state, True, NOW, scheduler)
+        intervals.append((state.srs_date - NOW) / timedelta(days=1))
+    return intervals
+
+
+@pytest.mark.parametrize("name", sorted(SCHEDULERS))
+def test_interval_sequence(name):
+    scheduler = build_scheduler(name, max_interval_days=1000)
+
+    assert intervals_after_correct_answers(scheduler, 6) == pytest.approx(INTERVALS[name], abs=1e-4)
+
+
+@pytest.mark.parametrize("name", sorted(SCHEDULERS))
+def test_intervals_are_capped_and_reset_by_a_mistake(name):
+    scheduler = build_scheduler(name, max_interval_days=20)
+
+    capped = intervals_after_correct_answers(scheduler, 6)
+    assert capped == pytest.approx([min(days, 20) for days in INTERVALS[name]], abs=1e-4)
+
+    state, _ = review(ReviewState(6, 0, NOW), False, NOW, scheduler)
+    assert (state.streak, state.mistakes) == (0, 1)
+    assert state.srs_date == NOW + timedelta(days=1)
+
+
+def test_ease_moves_only_for_schedulers_that_use_it():
+    assert build_scheduler("doubling").next_ease(DEFAULT_EASE, False) == DEFAULT_EASE
+    assert build_scheduler("sm2").next_ease(DEFAULT_EASE, False) == pytest.approx(2.18)
+    assert build_scheduler("sm2").next_ease(DEFAULT_EASE, True) == DEFAULT_EASE
+    assert build_scheduler("fsrs").next_ease(DEFAULT_EASE, False) == pytest.approx(2.3)
+    assert build_scheduler("fsrs").next_ease(DEFAULT_EASE, True) == pytest.approx(2.55)
+
+
+def test_unknown_scheduler_is_rejected():
+    with pytest.raises(ValueError, match="choose one of"):
+        build_scheduler("leitner")
+
+
+def reviewed_cards(scheduler, count=200, seed=7):
+    """States of ``count`` cards after random answer histories at random times."""
+    rng = random.Random(seed)
+    cards = []
+    for _ in range(count):
+        state, now = ReviewState(0, 0, NOW), NOW
+        for _ in range(rng.randint(1, 12)):
+            now += timedelta(seconds=rng.randint(1, 40 * 86_400), microseconds=rng.randint(0, 999_999))
+            state, _ = review(state, rng.random() < 0.8, now, scheduler)
+        cards.append(state)
+    return cards
+
+
+@pytest.mark.parametrize("vectorized", [True, False], ids=["numpy", "python"])
+@pytest.mark.parametrize("name", sorted(SCHEDULERS))
+def test_reschedule_matches_review(name, vectorized, monkeypatch):
+    scheduler = build_scheduler(name, max_interval_days=45)
+    cards = reviewed_cards(scheduler)
+    if not vectorized:
+        monkeypatch.setattr(srs, "np", None)
+
+    dates = reschedule(
+        [card.streak for card in cards],
+        [card.mistakes for card in cards],
+        [card.ease for card in cards],
+        [card.last_reviewed_at for card in cards],
+        scheduler,
+    )
+
+    assert dates == [card.srs_date for card in cards]
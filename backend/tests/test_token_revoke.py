@@ -0,0 +1,35 @@
+"""
+Token revocation with ``JWT_STATELESS_CLAIMS``.
+"""
+import pytest
+
+from app.auth import _settings as auth_settings
+
+CREDENTIALS = {"username": "revoke_learner", "password": "password123"}
+
+
+@pytest.fixture
+def stateless_claims(client, monkeypatch):
+    monkeypatch.setattr(auth_settings, "JWT_STATELESS_CLAIMS", True)
+    client.post("/register", json={**CREDENTIALS, "email": "revoke_learner@example.com"})
+
+
+def login(client) -> dict:
+    response = client.post("/token", data=CREDENTIALS)
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_revoked_token_is_rejected_and_new_token_accepted(client, stateless_claims):
+    old = login(client)
+    assert client.get("/me", headers=old).status_code == 200
+
+    response = client.post("/token/revoke", headers=old)
+    assert response.status_code == 200
+    assert response.json()["scope"] == "worker"
+
+    assert client.get("/me", headers=old).status_code == 401
+    assert client.post("/token/revoke", headers=old).status_code == 401
+
+    fresh = login(client)
+    assert client.get("/me", headers=fresh).status_code == 200
@@ -0,0 +1,80 @@
+"""
+user_stats: the running totals stay equal to an aggregate over user_progress.
+"""
+from datetime import datetime
+
+from sqlalchemy import case, func, select
+
+from app import models
+from app.crud import (
+    apply_progress_batch, create_verb, delete_verb, get_user_stats, initialize_user_progress,
+    update_user_progress,
+)
+from app.database import SessionLocal
+from app.schemas import ProgressUpdateIn, VerbCreate
+from app.srs import MASTERED_STREAK
+
+NOW = datetime(2030, 5, 1, 9, 0)
+
+
+def stored_totals(db, user_id):
+    S = models.UserStats
+    row = db.execute(
+        select(S.verbs_learned, S.verbs_mastered, S.total_streak, S.total_mistakes).where(S.user_id == user_id)
+    ).one()
+    return tuple(row)
+
+
+def fresh_totals(db, user_id):
+    P = models.UserProgress
+    row = db.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(case((P.streak >= MASTERED_STREAK, 1), else_=0)), 0),
+            func.coalesce(func.sum(P.streak), 0),
+            func.coalesce(func.sum(P.mistakes), 0),
+        ).where(P.user_id == user_id)
+    ).one()
+    return tuple(row)
+
+
+def assert_totals_current(db, user_id):
+    db.expire_all()
+    assert stored_totals(db, user_id) == fresh_totals(db, user_id)
+
+
+def test_totals_match_progress_after_every_write(user_id):
+    with SessionLocal() as db:
+        doomed = create_verb(db, VerbCreate(
+            infinitive="statsdoom", past="statsdoomed", participle="statsdoomed",
+            translation="condenar", example_b2="They statsdoom it.",
+        ))
+        initialize_user_progress(db, user_id)
+        assert_totals_current(db, user_id)
+
+        for correct in (False,) + (True,) * MASTERED_STREAK:
+            update_user_progress(db, user_id, doomed.id, correct, now=NOW)
+        assert_totals_current(db, user_id)
+
+        other = db.scalar(select(models.Verb.id).where(models.Verb.id != doomed.id).order_by(models.Verb.id))
+        apply_progress_batch(db, user_id, [
+            ProgressUpdateIn(verb_id=verb_id, is_correct=correct)
+            for verb_id, correct in ((other, True), (doomed.id, True), (other, False), (other, True))
+        ], now=NOW)
+        assert_totals_current(db, user_id)
+        learned, mastered, _, _ = stored_totals(db, user_id)
+        assert mastered >= 1
+
+        assert delete_verb(db, doomed.id)
+        assert_totals_current(db, user_id)
+        assert stored_totals(db, user_id)[:2] == (learned - 1, mastered - 1)
+
+
+def test_total_verbs_counts_the_catalog(user_id):
+    with SessionLocal() as db:
+        initialize_user_progress(db, user_id)
+        stats = get_user_stats(db, user_id)
+        catalog_size = db.scalar(select(func.count()).select_from(models.Verb))
+
+    assert stats["total_verbs"] == catalog_size
+    assert stats["verbs_remaining"] == catalog_size - stats["verbs_learned"]
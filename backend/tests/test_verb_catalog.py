@@ -0,0 +1,78 @@
+"""
+The in-memory verb catalog: rebuilds after writes, ordering, staleness.
+"""
+import json
+
+import pytest
+
+from app import catalog as catalog_module
+from app.catalog import VerbCatalog, verb_catalog
+from app.crud import get_verbs
+from app.database import SessionLocal
+
+NEW_VERB = {
+    "infinitive": "zzcatalogtest", "past": "zzcatalogtested", "participle": "zzcatalogtested",
+    "translation": "probar", "example_b2": "We catalog-test the catalog.",
+}
+
+
+@pytest.fixture
+def db(seeded_db):
+    with SessionLocal() as session:
+        yield session
+
+
+def test_writes_rebuild_the_snapshot(client, auth_headers):
+    version = verb_catalog.stats()["version"]
+
+    verb = client.post("/verbs", headers=auth_headers, json=NEW_VERB).json()
+    assert verb_catalog.stats()["version"] > version
+    assert client.get(f"/verbs/{verb['id']}", headers=auth_headers).json()["infinitive"] == "zzcatalogtest"
+    assert [v["id"] for v in client.get("/verbs/search", params={"q": "zzcatalog"}, headers=auth_headers).json()] == [verb["id"]]
+
+    client.patch(f"/verbs/{verb['id']}", headers=auth_headers, json={"translation": "ensayar"})
+    assert client.get(f"/verbs/{verb['id']}", headers=auth_headers).json()["translation"] == "ensayar"
+
+    assert client.delete(f"/verbs/{verb['id']}", headers=auth_headers).status_code == 200
+    assert client.get(f"/verbs/{verb['id']}", headers=auth_headers).status_code == 404
+    assert client.get("/verbs/search", params={"q": "zzcatalog"}, headers=auth_headers).json() == []
+
+
+def test_missing_verb_is_404(client, auth_headers):
+    response = client.get("/verbs/999999", headers=auth_headers)
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Verb not found"
+
+
+@pytest.mark.parametrize("skip, limit", [(0, 100), (0, 10), (10, 25), (60, 100), (500, 10)])
+def test_page_matches_get_verbs_ordering(db, skip, limit):
+    body, _ = verb_catalog.page(db, skip=skip, limit=limit)
+
+    assert [verb["id"] for verb in json.loads(body)] == [verb.id for verb in get_verbs(db, skip, limit)]
+
+
+def test_snapshot_expires_after_ttl(db, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(catalog_module.time, "monotonic", lambda: now[0])
+    catalog = VerbCatalog(ttl=30)
+
+    first = catalog.snapshot(db)
+    now[0] += 30
+    assert catalog.snapshot(db) is first
+    now[0] += 1
+    second = catalog.snapshot(db)
+
+    assert second is not first
+    assert second.version == first.version + 1
+    assert catalog.rebuilds == 2
+
+
+def test_snapshot_rebuilds_for_newer_source_version(db):
+    catalog = VerbCatalog(ttl=0)
+    first = catalog.snapshot(db)
+
+    assert catalog.snapshot(db, source_version=first.source_version) is first
+    assert catalog.snapshot(db, source_version=first.source_version - 1) is first
+    assert catalog.snapshot(db, source_version=first.source_version + 1) is not first
+    assert catalog.rebuilds == 2
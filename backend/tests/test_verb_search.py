@@ -0,0 +1,56 @@
+"""
+/verbs/search ranking and accent folding, in memory and in SQL.
+"""
+import pytest
+
+from app import main
+from app.crud import search_verb_rows
+from app.database import SessionLocal
+
+from .conftest import register_and_login
+
+# Alphabetical order is the reverse of the expected rank order for "qqq"
+RANKED = [("qqq", "exact"), ("qqqz", "prefix"), ("aqqq", "substring")]
+
+
+@pytest.fixture(scope="module")
+def search_verbs(client):
+    headers = register_and_login(client)
+    created = [
+        client.post("/verbs", headers=headers, json={
+            "infinitive": infinitive, "past": f"{infinitive}ed", "participle": f"{infinitive}ed",
+            "translation": "tener razón" if infinitive == "qqq" else "buscar", "example_b2": "Search test.",
+        }).json()
+        for infinitive, _ in reversed(RANKED)
+    ]
+    yield headers
+    for verb in created:
+        client.delete(f"/verbs/{verb['id']}", headers=headers)
+
+
+@pytest.fixture(params=["memory", "trigram"])
+def search_mode(request, monkeypatch):
+    monkeypatch.setattr(main._settings, "VERB_SEARCH_MODE", request.param)
+    return request.param
+
+
+def test_rank_exact_then_prefix_then_substring(client, search_verbs, search_mode):
+    response = client.get("/verbs/search", params={"q": "QQQ"}, headers=search_verbs)
+
+    assert response.status_code == 200
+    assert [verb["infinitive"] for verb in response.json()] == [infinitive for infinitive, _ in RANKED]
+
+
+def test_accent_insensitive_translation(client, search_verbs):
+    # In-memory mode; the SQL path only unaccents on Postgres (f_unaccent)
+    response = client.get("/verbs/search", params={"q": "razon"}, headers=search_verbs)
+
+    assert [verb["infinitive"] for verb in response.json()] == ["qqq"]
+    accented = client.get("/verbs/search", params={"q": "RAZÓN"}, headers=search_verbs)
+    assert accented.json() == response.json()
+
+
+def test_sql_search_escapes_like_wildcards(search_verbs):
+    with SessionLocal() as db:
+        assert search_verb_rows(db, "q%q") == []
+        assert search_verb_rows(db, "   ") == []
@@ -0,0 +1,55 @@
+"""
+/verbs/stats: one GROUP BY, cached per verbs table version.
+"""
+from typing import Any, Dict
+
+from sqlalchemy import func
+
+from app import models
+from app.crud import get_verb_stats, verb_stats_cache
+from app.database import SessionLocal
+
+STABLE_KEYS = ("total_verbs", "average_infinitive_length", "verbs_by_letter")
+
+
+def baseline_verb_stats(db) -> Dict[str, Any]:
+    """The original implementation: every row loaded and counted in Python."""
+    total_verbs = db.query(func.count(models.Verb.id)).scalar() or 0
+    letter_counts = {}
+    for verb in db.query(models.Verb).all():
+        first_letter = verb.infinitive[0].upper() if verb.infinitive else "?"
+        letter_counts[first_letter] = letter_counts.get(first_letter, 0) + 1
+    avg_length = db.query(func.avg(func.length(models.Verb.infinitive))).scalar() or 0
+    return {
+        "total_verbs": total_verbs,
+        "average_infinitive_length": round(avg_length, 1),
+        "verbs_by_letter": dict(sorted(letter_counts.items())),
+    }
+
+
+def test_group_by_matches_baseline(seeded_db, query_budget):
+    verb_stats_cache.clear()
+    with SessionLocal() as db:
+        with query_budget(2):  # table version + one GROUP BY
+            stats = get_verb_stats(db)
+        assert {key: stats[key] for key in STABLE_KEYS} == baseline_verb_stats(db)
+
+
+def test_cached_until_the_verbs_table_changes(client, auth_headers, query_budget):
+    first = client.get("/verbs/stats", headers=auth_headers).json()
+    hits = verb_stats_cache.stats()["hits"]
+
+    with query_budget(2):  # the users lookup and the table version behind the ETag
+        assert client.get("/verbs/stats", headers=auth_headers).json() == first
+    assert verb_stats_cache.stats()["hits"] == hits + 1
+
+    client.post("/verbs", headers=auth_headers, json={
+        "infinitive": "xstatsverb", "past": "xstatsverbed", "participle": "xstatsverbed",
+        "translation": "contar", "example_b2": "Stats test.",
+    })
+    second = client.get("/verbs/stats", headers=auth_headers).json()
+
+    assert second["total_verbs"] == first["total_verbs"] + 1
+    assert second["verbs_by_letter"]["X"] == first["verbs_by_letter"].get("X", 0) + 1
+    with SessionLocal() as db:
+        assert {key: second[key] for key in STABLE_KEYS} == baseline_verb_stats(db)